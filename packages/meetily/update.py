@@ -3,10 +3,11 @@
 
 import json
 import re
-import subprocess
 from pathlib import Path
 from urllib.request import urlopen
 
+from updater import get_nix_hash
+
 GITHUB_API = (
     "https://api.github.com/repos/Zackriya-Solutions/meeting-minutes/releases/latest"
 )
@@ -28,30 +29,9 @@ def get_latest_release() -> tuple[str, str]:
     raise RuntimeError(f"DMG asset not found: {dmg_name}")
 
 
-def nix_prefetch_url(url: str) -> str:
-    """Get SRI hash for a URL."""
-    result = subprocess.run(
-        ["nix-prefetch-url", "--type", "sha256", url],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    result = subprocess.run(
-        [
-            "nix",
-            "hash",
-            "convert",
-            "--hash-algo",
-            "sha256",
-            "--to",
-            "sri",
-            result.stdout.strip(),
-        ],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    return result.stdout.strip()
+def latest_version(fetch_json) -> str:
+    """Probe hook for `updater --check`."""
+    return fetch_json(GITHUB_API)["tag_name"].lstrip("v")
 
 
 def update_nix_file(nix_file: Path, version: str, sri_hash: str) -> None:
@@ -78,7 +58,7 @@ def main():
     print(f"Updating {current_version} -> {version}")
     print(f"Fetching hash for {url}...")
 
-    sri_hash = nix_prefetch_url(url)
+    sri_hash = get_nix_hash(url)
     update_nix_file(nix_file, version, sri_hash)
     print(f"Updated default.nix")
 
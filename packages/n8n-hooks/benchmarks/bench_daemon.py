@@ -0,0 +1,140 @@
+"""Benchmark: cold CLI invocations vs calls forwarded to ``n8n-hooks serve``.
+
+Runs a local stand-in for n8n that charges a fixed delay per new connection
+(emulating TCP+TLS setup) and a token command that sleeps (emulating a
+password manager), starts the daemon on a scratch socket, and times N
+sequential ``n8n-hooks rss list-categories`` processes each way. The
+connections the stand-in accepted are counted per mode: the daemon keeps its
+connection pool across requests, so after the first call it pays no
+handshake at all.
+
+    python benchmarks/bench_daemon.py [-n 20] [--handshake-ms 20] [--token-ms 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CLI = "from n8n_hooks.cli import main; main()"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"status":200,"body":[{"id":1,"title":"News"}]}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _HandshakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handshake_delay = 0.0
+    connections = 0
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        request = super().get_request()
+        self.connections += 1
+        time.sleep(self.handshake_delay)
+        return request
+
+
+def _time_calls(n: int, env: dict[str, str]) -> list[float]:
+    samples: list[float] = []
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", CLI, "rss", "list-categories"],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=20, help="calls per mode")
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    server = _HandshakeServer(("127.0.0.1", 0), _Handler)
+    server.handshake_delay = args.handshake_ms / 1000
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = Path(tmp) / "n8n-hooks" / "config.json"
+        config.parent.mkdir()
+        config.write_text(
+            json.dumps(
+                {
+                    "token_command": f"sleep {args.token_ms / 1000}; echo token",
+                    "hooks": {
+                        "rss": {"url": f"http://127.0.0.1:{server.server_address[1]}/w"}
+                    },
+                }
+            )
+        )
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(ROOT),
+            "XDG_CONFIG_HOME": tmp,
+            "XDG_RUNTIME_DIR": tmp,
+        }
+        env.pop("N8N_HOOKS_TOKEN_CACHE_TTL", None)
+
+        cold = _time_calls(args.n, {**env, "N8N_HOOKS_NO_DAEMON": "1"})
+        cold_connections, server.connections = server.connections, 0
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-c", CLI, "serve"], env=env, stderr=subprocess.PIPE
+        )
+        try:
+            assert daemon.stderr is not None
+            daemon.stderr.readline()  # "serving on ..."
+            warm = _time_calls(args.n, env)
+            warm_connections = server.connections
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    server.shutdown()
+    server.server_close()
+
+    print(f"{'mode':<8} {'calls':>6} {'conns':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, samples, connections in (
+        ("cold", cold, cold_connections),
+        ("daemon", warm, warm_connections),
+    ):
+        p50 = statistics.median(samples)
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else p50
+        print(f"{name:<8} {len(samples):>6} {connections:>6} {p50:>8.1f} {p95:>8.1f}")
+    print(f"speedup: {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark: bytes on the wire and wall time with and without gzip.
+
+Runs a local stand-in for n8n behind a throttled link (the server sleeps in
+proportion to every byte it reads or writes) and times two workloads through
+``webhook.call``: a store-draft-like upload (HTML body plus a base64 text
+attachment) and a slack-search-like download (hundreds of KB of JSON).
+
+    python benchmarks/bench_gzip.py [-n 5] [--kib-per-s 1024] [--messages 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+from n8n_hooks.config import HookConfig
+from n8n_hooks.transport import ConnectionPool
+from n8n_hooks.webhook import call
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _ThrottledServer
+
+    def do_POST(self) -> None:
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.throttle(len(raw))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        payload = json.loads(raw)
+        body = self.server.responses[payload["operation"]]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.server.throttle(len(body))
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _ThrottledServer(ThreadingHTTPServer):
+    daemon_threads = True
+    bytes_per_s = 1024 * 1024.0
+    wire_bytes = 0
+    # Reply bodies by operation, set by main() before serving.
+    responses: dict[str, bytes]
+
+    def throttle(self, n: int) -> None:
+        self.wire_bytes += n
+        time.sleep(n / self.bytes_per_s)
+
+
+def _draft_payload() -> dict[str, Any]:
+    paragraph = "<p>Quarterly numbers attached; see the summary table below.</p>"
+    rows = "".join(f"{i},item-{i},{i * 37 % 1000},ok\n" for i in range(20000))
+    return {
+        "operation": "create",
+        "subject": "Report",
+        "body": "Quarterly numbers attached.\n" * 200,
+        "html_body": paragraph * 2000,
+        "attachments": [
+            {
+                "filename": "report.csv",
+                "content_base64": base64.b64encode(rows.encode()).decode(),
+            }
+        ],
+    }
+
+
+def _search_response(messages: int) -> bytes:
+    return json.dumps(
+        {
+            "ok": True,
+            "messages": [
+                {
+                    "channel": {"id": "C0123456", "name": "general"},
+                    "user": f"U{i % 40:07d}",
+                    "ts": f"{1700000000 + i}.000100",
+                    "text": f"deploy {i} finished, see the dashboard for details",
+                    "permalink": f"https://example.slack.com/archives/C0123456/p{i}",
+                }
+                for i in range(messages)
+            ],
+        }
+    ).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=5, help="calls per workload and mode")
+    parser.add_argument("--kib-per-s", type=float, default=1024.0)
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = _ThrottledServer(("127.0.0.1", 0), _Handler)
+    server.bytes_per_s = args.kib_per_s * 1024
+    server.responses = {
+        "create": b'{"ok": true, "id": "draft-1"}',
+        "search": _search_response(args.messages),
+    }
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/w"
+
+    workloads = {
+        "upload": _draft_payload(),
+        "download": {"operation": "search", "query": "deploy"},
+    }
+    modes = {
+        "plain": HookConfig(url=url, token=None, accept_gzip=False),
+        "gzip": HookConfig(url=url, token=None, gzip_min_bytes=1024),
+    }
+
+    print(f"{'workload':<10} {'mode':<6} {'KiB/call':>9} {'p50 ms':>8}")
+    for workload, payload in workloads.items():
+        for mode, hook in modes.items():
+            pool = ConnectionPool()
+            server.wire_bytes = 0
+            samples = []
+            for _ in range(args.n):
+                start = time.perf_counter()
+                call(hook, payload, pool=pool)
+                samples.append((time.perf_counter() - start) * 1000)
+            pool.close()
+            kib = server.wire_bytes / args.n / 1024
+            print(
+                f"{workload:<10} {mode:<6} {kib:>9.1f} {statistics.median(samples):>8.1f}"
+            )
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
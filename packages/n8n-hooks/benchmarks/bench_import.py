@@ -0,0 +1,80 @@
+"""Benchmark: cold-start import time of the n8n-hooks CLI.
+
+Runs ``python -X importtime`` in a fresh interpreter that builds the parser
+for one subcommand the way ``cli.main`` does, and reports the cumulative
+import time of ``n8n_hooks`` plus the slowest modules. With ``--max-ms``,
+exits non-zero when the median over ``--runs`` exceeds the threshold, so it
+can guard against regressions in CI.
+
+    python benchmarks/bench_import.py [--runs 5] [--max-ms 40] [rss list-categories]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SNIPPET = """
+import sys
+from n8n_hooks.cli import build_parser, selected_command
+argv = sys.argv[1:]
+command = selected_command(argv)
+build_parser([] if command is None else [command]).parse_args(argv)
+"""
+
+
+def _importtime(argv: list[str]) -> list[tuple[int, str]]:
+    """Return (cumulative µs, module) for every top-level import."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET, *argv],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    rows: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="fail above this median")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument("argv", nargs="*", default=["rss", "list-categories"])
+    args = parser.parse_args()
+
+    totals: list[float] = []
+    rows: list[tuple[int, str]] = []
+    for _ in range(args.runs):
+        rows = _importtime(args.argv)
+        # Top-level rows are not indented; sum those that belong to the CLI.
+        top = [(us, name) for us, name in rows if not name.startswith("  ")]
+        totals.append(sum(us for us, _ in top) / 1000)
+
+    median = statistics.median(totals)
+    print(f"argv: {' '.join(args.argv)}")
+    print(f"total import time: median {median:.1f} ms over {args.runs} runs")
+    print("slowest modules (cumulative, last run):")
+    for us, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name.strip()}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: {median:.1f} ms exceeds --max-ms {args.max_ms}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark: fresh urllib connections vs the pooled transport.
+
+Runs a local stand-in for n8n that charges a fixed delay for every new
+connection, emulating the TCP+TLS handshake round trips to a remote host, then
+times N sequential webhook calls each way.
+
+    python benchmarks/bench_pool.py [-n 50] [--handshake-ms 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+from n8n_hooks.config import HookConfig
+from n8n_hooks.transport import ConnectionPool
+from n8n_hooks.webhook import post
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle plus
+    # delayed ACK adds ~40 ms to every response on a reused connection.
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok":true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _HandshakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    handshake_delay = 0.0
+    connections = 0
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        request = super().get_request()
+        self.connections += 1
+        time.sleep(self.handshake_delay)
+        return request
+
+
+def _urlopen_call(url: str) -> None:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps({"operation": "list-categories"}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req) as resp:
+        json.loads(resp.read())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=50, help="calls per mode")
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    server = _HandshakeServer(("127.0.0.1", 0), _Handler)
+    server.handshake_delay = args.handshake_ms / 1000
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook/context-rss"
+
+    server.connections = 0
+    start = time.perf_counter()
+    for _ in range(args.n):
+        _urlopen_call(url)
+    fresh = time.perf_counter() - start
+    fresh_conns = server.connections
+
+    pool = ConnectionPool()
+    hook = HookConfig(url=url, token=None)
+    server.connections = 0
+    start = time.perf_counter()
+    for _ in range(args.n):
+        post(hook, {"operation": "list-categories"}, pool=pool)
+    pooled = time.perf_counter() - start
+    pooled_conns = server.connections
+    pool.close()
+
+    server.shutdown()
+    server.server_close()
+
+    print(f"{'mode':<10} {'calls':>6} {'conns':>6} {'total ms':>10} {'ms/call':>8}")
+    for name, total, conns in (
+        ("urlopen", fresh, fresh_conns),
+        ("pooled", pooled, pooled_conns),
+    ):
+        per_call = total * 1000 / args.n
+        print(
+            f"{name:<10} {args.n:>6} {conns:>6} {total * 1000:>10.1f} {per_call:>8.2f}"
+        )
+    print(f"speedup: {fresh / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: peak RSS of store-draft with in-memory vs streamed attachments.
+
+For each attachment size, a fresh interpreter posts one draft to a local
+stand-in server that discards the body, and reports its peak RSS. The
+in-memory path grows with the attachment; the streamed path stays flat.
+
+    python benchmarks/bench_store_draft_memory.py [--sizes-mb 8 32 128]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHILD = """
+import argparse, resource, sys
+from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks.store_draft import build_payload
+from n8n_hooks.webhook import post
+
+url, path, mode = sys.argv[1:]
+args = argparse.Namespace(
+    to="a@example.test", subject="bench", body_plain="hi", body_html=None,
+    from_addr=None, cc=None, bcc=None, in_reply_to=None, references=None,
+    attach=[path],
+)
+post(HookConfig(url=url), build_payload(args, stream_attachments=mode == "stream"))
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+class _DiscardHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while size := int(self.rfile.readline().strip(), 16):
+                _discard(self.rfile, size)
+                self.rfile.readline()
+            self.rfile.readline()
+        else:
+            _discard(self.rfile, int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"status":"ok"}')
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+def _discard(stream: Any, size: int) -> None:
+    while size > 0:
+        size -= len(stream.read(min(size, 1 << 20)))
+
+
+def _peak_rss_mb(url: str, path: Path, mode: str) -> float:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, url, str(path), mode],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    kib = int(out.strip().splitlines()[-1])
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return kib / 1024 if sys.platform != "darwin" else kib / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[8, 32, 128])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _DiscardHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook/mail-draft-store"
+
+    print(f"{'attachment':>10} {'in-memory':>12} {'streamed':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes_mb:
+            path = Path(tmp) / f"attachment-{size}.pdf"
+            with open(path, "wb") as f:
+                f.writelines(os.urandom(1 << 20) for _ in range(size))
+            memory = _peak_rss_mb(url, path, "memory")
+            streamed = _peak_rss_mb(url, path, "stream")
+            print(f"{size:>7} MB {memory:>9.1f} MB {streamed:>9.1f} MB")
+            path.unlink()
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
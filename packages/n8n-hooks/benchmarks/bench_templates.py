@@ -0,0 +1,124 @@
+"""Benchmark: template loading and compiled context validation.
+
+Writes a large generated template (many properties, nested ``$defs`` and a
+recursive reference) to a scratch directory, then reports:
+
+  - a cold load (YAML parse, shape checks, disk cache write),
+  - a warm load from the disk cache with the in-memory cache cleared,
+  - a load served from the in-memory cache,
+  - validation throughput over ``--contexts`` generated contexts, half of
+    them invalid.
+
+    python benchmarks/bench_templates.py [--properties 200] [--contexts 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import yaml
+
+from n8n_hooks import templates
+
+
+def _schema(properties: int) -> dict[str, Any]:
+    props: dict[str, Any] = {}
+    for i in range(properties):
+        kind = i % 3
+        if kind == 0:
+            props[f"text{i}"] = {"type": "string", "minLength": 1}
+        elif kind == 1:
+            props[f"list{i}"] = {
+                "type": "array",
+                "items": {"$ref": "#/$defs/Item"},
+                "maxItems": 20,
+            }
+        else:
+            props[f"choice{i}"] = {"$ref": "#/$defs/Choice"}
+    return {
+        "type": "object",
+        "additionalProperties": False,
+        "required": [name for name in props if name.startswith("text")][:20],
+        "properties": props,
+        "$defs": {
+            "Choice": {"type": "string", "enum": [f"c{n}" for n in range(30)]},
+            "Item": {
+                "type": "object",
+                "required": ["label"],
+                "properties": {
+                    "label": {"type": "string", "minLength": 1},
+                    "choice": {"$ref": "#/$defs/Choice"},
+                    "children": {"type": "array", "items": {"$ref": "#/$defs/Item"}},
+                },
+            },
+        },
+    }
+
+
+def _context(schema: dict[str, Any], n: int) -> dict[str, Any]:
+    bad = n % 2 == 1
+    context: dict[str, Any] = {}
+    for name in schema["properties"]:
+        if name.startswith("text"):
+            context[name] = "" if bad and name == "text0" else f"value {n}"
+        elif name.startswith("list"):
+            child = {"label": "leaf", "choice": "nope" if bad else "c1"}
+            context[name] = [{"label": f"item {n}", "children": [child]}] * 3
+        else:
+            context[name] = f"c{n % 30}"
+    return context
+
+
+def _timed(label: str, fn: Any) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--properties", type=int, default=200)
+    parser.add_argument("--contexts", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CACHE_HOME"] = str(Path(tmp) / "cache")
+        template_dir = Path(tmp) / "templates"
+        template_dir.mkdir()
+        schema = _schema(args.properties)
+        data = {
+            "name": "large",
+            "description": "Generated benchmark template.",
+            "defaults": {"priority": 3, "labels": ["bench"]},
+            "schema": schema,
+        }
+        (template_dir / "large.md").write_text("---\n" + yaml.safe_dump(data) + "---\n")
+
+        load = lambda: templates.load_template("large", str(template_dir))
+        _timed("cold load (YAML)", load)
+        templates._loaded.clear()
+        _timed("warm load (disk cache)", load)
+        spec = _timed("warm load (memory cache)", load)
+        _timed("compile validator", lambda: spec.validator)
+
+        contexts = [_context(schema, n) for n in range(args.contexts)]
+        start = time.perf_counter()
+        failed = sum(1 for c in contexts if templates.validate_context(spec, c))
+        elapsed = time.perf_counter() - start
+        print(
+            f"validated {len(contexts)} contexts ({failed} invalid) in "
+            f"{elapsed * 1000:.1f} ms, {len(contexts) / elapsed:,.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
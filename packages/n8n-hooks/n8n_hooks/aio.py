@@ -0,0 +1,203 @@
+"""asyncio counterpart of the webhook transport, standard library only.
+
+:func:`call` behaves like :func:`n8n_hooks.webhook.call` — same headers,
+response cache, retries and :class:`~n8n_hooks.webhook.WebhookError`
+semantics — but
+speaks HTTP/1.1 over ``asyncio.open_connection`` so several webhooks can be
+awaited concurrently from one thread. Each request uses its own connection;
+fan-out is the point here, not reuse.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import ssl
+import urllib.parse
+import zlib
+from typing import Any
+
+from n8n_hooks import trace
+from n8n_hooks.config import HookConfig, TokenError
+from n8n_hooks.retry import (
+    DOWN_STATUSES,
+    RETRY_AFTER_STATUSES,
+    RETRY_STATUSES,
+    endpoint_key,
+    parse_retry_after,
+)
+from n8n_hooks.streaming import GZIP_WBITS, gzip_bytes
+from n8n_hooks.webhook import WebhookError, trace_labels
+
+_ssl_context: ssl.SSLContext | None = None
+
+
+def _context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+async def request(
+    method: str,
+    url: str,
+    body: bytes = b"",
+    headers: dict[str, str] | None = None,
+) -> tuple[int, dict[str, str], bytes]:
+    """Send one request and return (status, lowercased headers, body)."""
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in {"http", "https"}:
+        raise ValueError(f"unsupported URL scheme: {url}")
+    host = parts.hostname or ""
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+
+    with trace.span("connect"):
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=_context() if scheme == "https" else None,
+            server_hostname=host if scheme == "https" else None,
+        )
+    try:
+        default_port = port == (443 if scheme == "https" else 80)
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host if default_port else f'{host}:{port}'}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+            *(f"{name}: {value}" for name, value in (headers or {}).items()),
+        ]
+        with trace.span("send"):
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+        with trace.span("ttfb"):
+            status, headers_in = await _read_head(reader)
+        with trace.span("download"):
+            return status, headers_in, await _read_body(reader, headers_in)
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (OSError, ssl.SSLError):
+            pass
+
+
+async def _read_head(reader: asyncio.StreamReader) -> tuple[int, dict[str, str]]:
+    status_line = await reader.readline()
+    try:
+        _, code, *_ = status_line.decode("latin-1").split(" ", 2)
+        status = int(code)
+    except ValueError:
+        raise OSError(f"malformed status line: {status_line!r}") from None
+
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in {b"\r\n", b"\n", b""}:
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict[str, str]) -> bytes:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks: list[bytes] = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        # Skip trailers up to the terminating blank line.
+        while (await reader.readline()) not in {b"\r\n", b"\n", b""}:
+            pass
+        return b"".join(chunks)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def call(hook: HookConfig, payload: dict[str, Any]) -> dict[str, Any]:
+    """POST *payload* as JSON to the webhook, return parsed response.
+
+    Raises WebhookError on connection failures and HTTP error statuses.
+    """
+    with trace.labels(**trace_labels(hook, payload)):
+        return await _call(hook, payload)
+
+
+async def _call(hook: HookConfig, payload: dict[str, Any]) -> dict[str, Any]:
+    if hook.cache is not None:
+        with trace.span("cache"):
+            cached = hook.cache.get(hook.name, hook.url, payload)
+        if cached is not None:
+            return cached
+
+    headers = {"Content-Type": "application/json"}
+    if hook.accept_gzip:
+        headers["Accept-Encoding"] = "gzip"
+    data = json.dumps(payload).encode()
+    if hook.gzip_min_bytes is not None and len(data) >= hook.gzip_min_bytes:
+        data = gzip_bytes(data)
+        headers["Content-Encoding"] = "gzip"
+    try:
+        # Token commands may shell out to a password manager; keep the loop free.
+        with trace.span("token"):
+            token = await asyncio.to_thread(hook.bearer_token)
+    except TokenError as exc:
+        raise WebhookError(str(exc)) from exc
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    endpoint = endpoint_key(hook.url)
+    for attempt in itertools.count(1):
+        if hook.breaker is not None:
+            wait = hook.breaker.remaining(endpoint)
+            if wait > 0:
+                raise WebhookError(
+                    f"{endpoint} is failing; not retrying for another {wait:.0f}s"
+                )
+        retry_after = None
+        try:
+            status, headers_in, raw = await request(
+                "POST", hook.url, body=data, headers=headers
+            )
+            if headers_in.get("content-encoding", "").lower() == "gzip":
+                raw = zlib.decompress(raw, wbits=GZIP_WBITS)
+        except (OSError, ValueError, asyncio.IncompleteReadError, zlib.error) as exc:
+            error = WebhookError(f"connection error: {exc}")
+            error.__cause__ = exc
+            down = retryable = True
+        else:
+            body = raw.decode(errors="replace")
+            if status < 400:
+                if hook.breaker is not None:
+                    hook.breaker.success(endpoint)
+                break
+            error = WebhookError(f"HTTP {status} from {hook.url}: {body}")
+            down = status in DOWN_STATUSES
+            retryable = status in RETRY_STATUSES
+            if status in RETRY_AFTER_STATUSES:
+                retry_after = parse_retry_after(headers_in.get("retry-after"))
+        if down and hook.breaker is not None:
+            hook.breaker.failure(endpoint)
+        delay = None
+        if hook.retry is not None and retryable:
+            delay = hook.retry.delay(attempt, retry_after)
+        if delay is None:
+            raise error
+        with trace.span("retry", attempt=attempt):
+            await asyncio.sleep(delay)
+    try:
+        with trace.span("decode"):
+            result: dict[str, Any] = json.loads(body)
+    except json.JSONDecodeError:
+        return {"status": status, "body": body}
+    if hook.cache is not None and isinstance(result, dict):
+        hook.cache.put(hook.name, hook.url, payload, result)
+    return result
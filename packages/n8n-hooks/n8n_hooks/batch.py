@@ -0,0 +1,206 @@
+"""batch subcommand — run many hook invocations in one process.
+
+Reads JSONL records from stdin, one per invocation:
+
+    {"hook": "rss", "args": ["show-entry", "1234"]}
+    {"hook": "slack", "args": ["search", "in:#dev deploy", "-n", "5"]}
+
+``args`` is the argv that would follow ``n8n-hooks <hook>`` on the command
+line. Every record is parsed and validated with the hook's own parser and
+``build_payload`` on the main thread, then posted, with Slack names resolved
+to IDs, on a bounded thread pool sharing one config, one set of resolved
+tokens, and one connection pool.
+Results are written as JSONL in completion order, tagged with the input index:
+
+    {"index": 1, "hook": "slack", "ok": true, "result": {...}}
+    {"index": 0, "hook": "rss", "ok": false, "error": "..."}
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import functools
+import io
+import json
+import shlex
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TextIO
+
+from n8n_hooks import streams
+from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks import HOOKS
+from n8n_hooks.webhook import WebhookError, call
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "batch",
+        help="Run JSONL-described hook invocations from stdin concurrently",
+        description="Read {hook, args} JSONL records on stdin and stream JSONL results.",
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="Maximum concurrent webhook requests (default: 4)",
+    )
+    p.set_defaults(func=run)
+
+
+class _Writer:
+    """Serialise result lines from worker threads onto one stream."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.failed = False
+        self._lock = threading.Lock()
+
+    def emit(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if not record["ok"]:
+                self.failed = True
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def _prepare(index: int, line: str) -> tuple[str, dict[str, Any]]:
+    """Parse one record into (hook name, payload).
+
+    Raises TypeError if the record is not a JSON object and ValueError if it
+    is otherwise invalid.
+    """
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"record {index} is not valid JSON: {exc}") from None
+    if not isinstance(record, dict):
+        raise TypeError(f"record {index} must be a JSON object")
+
+    hook = record.get("hook")
+    argv = record.get("args", [])
+    if not isinstance(hook, str) or hook not in HOOKS:
+        raise ValueError(f"record {index}: unknown hook {hook!r}")
+    if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+        raise ValueError(f"record {index}: args must be a list of strings")
+    if "-" in argv:
+        raise ValueError(f"record {index}: stdin ('-') is reserved for batch input")
+    return hook, build_invocation(hook, argv)
+
+
+def build_invocation(hook: str, argv: list[str]) -> dict[str, Any]:
+    """Parse *argv* with *hook*'s parser and return its webhook payload.
+
+    Raises ValueError with the hook's own message if the arguments are
+    invalid, or for ``--async`` and arguments the hook's optional
+    ``supports_batch(args)`` rejects (e.g. ``github discover``), which do not
+    map to a single webhook call.
+    """
+    # Hooks report invalid input on stderr and exit; capture that message so
+    # it lands in the result record instead of interleaving with other output.
+    captured = io.StringIO()
+    try:
+        with streams.redirect(stderr=captured):
+            args = _parser(hook).parse_args([hook, *argv])
+            if getattr(args, "spool", False):
+                raise ValueError("--async is not supported here")
+            module = HOOKS[hook].load()
+            supports_batch = getattr(module, "supports_batch", None)
+            if supports_batch is not None and not supports_batch(args):
+                command = shlex.join([hook, *argv])
+                raise ValueError(f"{command} is not supported here")
+            payload: dict[str, Any] = module.build_payload(args)
+    except SystemExit:
+        message = captured.getvalue().strip().splitlines()
+        raise ValueError(message[-1] if message else "invalid arguments") from None
+    return payload
+
+
+def resolve_payload(
+    hook: str, payload: dict[str, Any], config: dict[str, HookConfig]
+) -> dict[str, Any]:
+    """Apply *hook*'s ``resolve_names`` (e.g. Slack ``#channel``), if it has one.
+
+    Raises ValueError as the hook's resolver does.
+    """
+    resolver = getattr(HOOKS[hook].load(), "resolve_names", None)
+    if resolver is None:
+        return payload
+    resolved: dict[str, Any] = resolver(config[hook], payload)
+    return resolved
+
+
+@functools.cache
+def _parser(hook: str) -> argparse.ArgumentParser:
+    from n8n_hooks.cli import build_parser
+
+    return build_parser([hook])
+
+
+def _dispatch(
+    index: int, hook: str, payload: dict[str, Any], config: dict[str, HookConfig]
+) -> dict[str, Any]:
+    if hook not in config:
+        return {
+            "index": index,
+            "hook": hook,
+            "ok": False,
+            "error": f"no '{hook}' section in config",
+        }
+    try:
+        result = call(config[hook], resolve_payload(hook, payload, config))
+    except (WebhookError, ValueError) as exc:
+        return {"index": index, "hook": hook, "ok": False, "error": str(exc)}
+    except Exception as exc:  # noqa: BLE001 - every record gets a result line
+        error = f"{type(exc).__name__}: {exc}"
+        return {"index": index, "hook": hook, "ok": False, "error": error}
+
+    status = result.get("status")
+    ok = not (isinstance(status, int) and status >= 400)
+    return {"index": index, "hook": hook, "ok": ok, "result": result}
+
+
+def run_batch(
+    stream: TextIO,
+    out: TextIO,
+    config: dict[str, HookConfig],
+    jobs: int = 4,
+) -> bool:
+    """Process every record in *stream*; return True if all succeeded."""
+    writer = _Writer(out)
+    # Bound in-flight work so a long input stream is not read ahead unboundedly.
+    slots = threading.BoundedSemaphore(jobs * 2)
+
+    def _done(future: Future[dict[str, Any]]) -> None:
+        try:
+            writer.emit(future.result())
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for index, line in enumerate(stream):
+            if not line.strip():
+                continue
+            try:
+                hook, payload = _prepare(index, line)
+            except (TypeError, ValueError) as exc:
+                writer.emit({"index": index, "ok": False, "error": str(exc)})
+                continue
+            slots.acquire()
+            context = contextvars.copy_context()
+            future = pool.submit(context.run, _dispatch, index, hook, payload, config)
+            future.add_done_callback(_done)
+    return not writer.failed
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    if args.jobs < 1:
+        print("n8n-hooks: --jobs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    stdin, stdout = streams.unwrap(sys.stdin), streams.unwrap(sys.stdout)
+    if not run_batch(stdin, stdout, config, jobs=args.jobs):
+        sys.exit(1)
@@ -0,0 +1,216 @@
+"""Opt-in on-disk cache for read-only hook responses.
+
+Enabled with a ``cache`` section in the config file (or ``N8N_HOOKS_CACHE=1``):
+
+    {
+      "cache": {
+        "enabled": true,
+        "max_mb": 64,
+        "ttl": {"rss.list-entries": 60, "github": 600}
+      },
+      "hooks": {...}
+    }
+
+Entries are keyed by hook name, webhook URL and the canonical JSON payload
+(so hooks pointed at different n8n instances never share entries) and stored in
+``$XDG_CACHE_HOME/n8n-hooks/responses.sqlite``. Each ``hook.operation`` has
+its own TTL (``ttl`` overrides :data:`DEFAULT_TTLS`; a bare hook name sets the
+fallback for its operations); a TTL of 0 disables caching for it. When the
+total size exceeds ``max_mb``, least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+# Hooks whose n8n workflows never mutate anything; nothing else is cached.
+CACHEABLE_HOOKS = frozenset({"github", "linkwarden", "rss", "slack"})
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+DEFAULT_TTLS: dict[str, float] = {
+    "github": 5 * MINUTE,
+    "linkwarden": 10 * MINUTE,
+    "linkwarden.list-collections": HOUR,
+    "linkwarden.list-tags": HOUR,
+    "linkwarden.search-links": 5 * MINUTE,
+    "rss": 10 * MINUTE,
+    "rss.list-categories": DAY,
+    "rss.list-entries": 5 * MINUTE,
+    "slack": 2 * MINUTE,
+    "slack.list-channels": DAY,
+    "slack.list-users": DAY,
+    "slack.file-info": HOUR,
+    "slack.file-content": HOUR,
+    "slack.history": MINUTE,
+    "slack.replies": MINUTE,
+    # Downloads stream to disk and are never cached.
+    "slack.file-download": 0,
+}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_path() -> Path:
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache / "n8n-hooks" / "responses.sqlite"
+
+
+def cache_key(hook: str, url: str, payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{hook}\0{url}\0{canonical}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU cache of webhook responses."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: dict[str, float] | None = None,
+        refresh: bool = False,
+    ) -> None:
+        self.path = path or default_path()
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        # Skip lookups but still store fresh responses (--refresh).
+        self.refresh = refresh
+
+    def ttl(self, hook: str, payload: dict[str, Any]) -> float:
+        if hook not in CACHEABLE_HOOKS:
+            return 0
+        operation = payload.get("operation")
+        if isinstance(operation, str) and f"{hook}.{operation}" in self.ttls:
+            return self.ttls[f"{hook}.{operation}"]
+        return self.ttls.get(hook, 0)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, hook TEXT, operation TEXT, body BLOB,"
+                " size INTEGER, expires REAL, accessed REAL)"
+            )
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(
+        self, hook: str, url: str, payload: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        if self.refresh or self.ttl(hook, payload) <= 0:
+            return None
+        key = cache_key(hook, url, payload)
+        now = time.time()
+        try:
+            with self._connect() as db:
+                row = db.execute(
+                    "SELECT body FROM responses WHERE key = ? AND expires > ?",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                db.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+        except sqlite3.Error:
+            return None
+        result = json.loads(row[0])
+        return result if isinstance(result, dict) else None
+
+    def put(
+        self, hook: str, url: str, payload: dict[str, Any], result: dict[str, Any]
+    ) -> None:
+        ttl = self.ttl(hook, payload)
+        if ttl <= 0 or not _is_success(result):
+            return
+        body = json.dumps(result).encode()
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        operation = payload.get("operation")
+        try:
+            with self._connect() as db:
+                db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cache_key(hook, url, payload),
+                        hook,
+                        operation if isinstance(operation, str) else None,
+                        body,
+                        len(body),
+                        now + ttl,
+                        now,
+                    ),
+                )
+                self._evict(db)
+        except sqlite3.Error:
+            return
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        doomed: list[tuple[str]] = []
+        for key, size in db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self) -> None:
+        with self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+
+def _is_success(result: dict[str, Any]) -> bool:
+    status = result.get("status")
+    if isinstance(status, int) and status >= 400:
+        return False
+    return result.get("ok") is not False
+
+
+def from_config(raw: object) -> ResponseCache | None:
+    """Build the cache described by the config's ``cache`` section, if enabled."""
+    section = raw if isinstance(raw, dict) else {}
+    env = os.environ.get("N8N_HOOKS_CACHE")
+    enabled = env not in {"", "0"} if env is not None else section.get("enabled")
+    if not enabled:
+        return None
+    ttls_raw = section.get("ttl", {})
+    try:
+        ttls = (
+            {str(k): float(v) for k, v in ttls_raw.items()}
+            if isinstance(ttls_raw, dict)
+            else {}
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"n8n-hooks: invalid cache ttl: {exc}", file=sys.stderr)
+        sys.exit(1)
+    max_mb = section.get("max_mb")
+    max_bytes = (
+        int(max_mb * 1024 * 1024)
+        if isinstance(max_mb, (int, float))
+        else DEFAULT_MAX_BYTES
+    )
+    return ResponseCache(max_bytes=max_bytes, ttls=ttls)
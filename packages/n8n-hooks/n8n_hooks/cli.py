@@ -2,28 +2,63 @@
 
 Each subcommand is a module in n8n_hooks.hooks that exposes:
   - register(subparsers)   — adds its argparse subcommand
+  - build_payload(args)    — builds the webhook JSON body
   - run(args, config)      — executes the hook
+
+and is listed in n8n_hooks.hooks.HOOKS. Only the chosen subcommand's module is
+imported; the others are represented in ``--help`` by their registry entry.
 """
 
 from __future__ import annotations
 
 import argparse
+import copy
+import os
 import sys
+import time
+from collections.abc import Callable, Iterable, Sequence
+
+from n8n_hooks import trace
+from n8n_hooks.config import HookConfig, load_config
+from n8n_hooks.hooks import HOOKS, HookEntry
+from n8n_hooks.output import FORMATS, parse_fields
+
+COMMANDS: dict[str, HookEntry] = {
+    **HOOKS,
+    "batch": HookEntry(
+        "n8n_hooks.batch",
+        "Run JSONL-described hook invocations from stdin concurrently",
+    ),
+    "context": HookEntry(
+        "n8n_hooks.context",
+        "Query several read-only hooks concurrently and merge the results",
+    ),
+    "flush": HookEntry(
+        "n8n_hooks.flush",
+        "Send write requests spooled with --async",
+    ),
+    "spool": HookEntry(
+        "n8n_hooks.spool",
+        "Inspect the spool of --async write requests",
+    ),
+    "serve": HookEntry(
+        "n8n_hooks.daemon",
+        "Run a warm daemon that other n8n-hooks invocations forward to",
+    ),
+    "list-templates": HookEntry(
+        "n8n_hooks.list_templates",
+        "List Vikunja task templates available to vikunja-task-create",
+    ),
+}
 
-from n8n_hooks.config import load_config
-from n8n_hooks.hooks import (
-    github,
-    linkwarden,
-    linkwarden_link_create,
-    rss,
-    slack,
-    store_draft,
-    vikunja,
-    vikunja_task_create,
-)
 
+def build_parser(commands: Iterable[str] | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
 
-def build_parser() -> argparse.ArgumentParser:
+    Subcommands named in *commands* (default: all) are fully registered by
+    importing their module; the rest get a help-only placeholder.
+    """
+    selected = set(COMMANDS) if commands is None else set(commands)
     parser = argparse.ArgumentParser(
         prog="n8n-hooks",
         description="Invoke n8n webhooks from the command line.",
@@ -33,25 +68,148 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="FILE",
         help="Path to JSON config file (default: $XDG_CONFIG_HOME/n8n-hooks/config.json)",
     )
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the response cache for this invocation",
+    )
+    cache.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Skip cached responses but store fresh ones",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Print per-phase timings as one JSON line on stderr "
+        "(or set N8N_HOOKS_TRACE=FILE)",
+    )
+    parser.add_argument(
+        "--output",
+        dest="format",
+        choices=FORMATS,
+        default="json",
+        help="Hook response format: pretty JSON (default) or one record per line",
+    )
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        metavar="KEYS",
+        help="Keep only these comma-separated (dotted) keys of each record",
+    )
     sub = parser.add_subparsers(dest="command")
-    store_draft.register(sub)
-    github.register(sub)
-    rss.register(sub)
-    slack.register(sub)
-    vikunja.register(sub)
-    vikunja_task_create.register(sub)
-    linkwarden.register(sub)
-    linkwarden_link_create.register(sub)
+    for name, entry in COMMANDS.items():
+        if name in selected:
+            entry.load().register(sub)
+        else:
+            sub.add_parser(name, help=entry.help)
     return parser
 
 
+# Top-level options whose value is a separate argument.
+_VALUE_OPTIONS = {"--config", "--output", "--fields"}
+
+
+def selected_command(argv: Sequence[str]) -> str | None:
+    """Return the subcommand named in *argv*, if any, without full parsing."""
+    args = iter(argv)
+    for arg in args:
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg if arg in COMMANDS else None
+    return None
+
+
 def main(argv: list[str] | None = None) -> None:
-    parser = build_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+    command = selected_command(argv)
+    if command != "serve":
+        from n8n_hooks.client import forward
+
+        code = forward(argv, stdin=command == "batch" or "-" in argv)
+        if code is not None:
+            sys.exit(code)
+    try:
+        execute(argv)
+    finally:
+        _refresh_directory_detached()
+
+
+def _refresh_directory_detached() -> None:
+    """Refresh queued Slack directory tables without holding up the caller.
+
+    A forked child does the refresh after this process has exited and closed
+    its end of the caller's pipes.
+    """
+    directory = sys.modules.get("n8n_hooks.directory")
+    if directory is None or not directory.pending():
+        return
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if os.fork():
+        return
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        directory.refresh_pending()
+    finally:
+        os._exit(0)
+
+
+def execute(
+    argv: list[str],
+    load: Callable[[str | None], dict[str, HookConfig]] = load_config,
+) -> None:
+    """Parse *argv* and run the chosen subcommand in this process."""
+    start = time.monotonic()
+    command = selected_command(argv)
+    parser = build_parser([] if command is None else [command])
     args = parser.parse_args(argv)
 
     if args.command is None:
         parser.print_help()
         sys.exit(1)
 
-    config = load_config(args.config)
-    args.func(args, config)
+    dest = trace.destination(args.trace)
+    if dest is None:
+        _run(args, load)
+        return
+    trace.begin(dest, start).add("parse", start, time.monotonic())
+    status: object = 0
+    try:
+        _run(args, load)
+    except SystemExit as exc:
+        status = exc.code
+        raise
+    except BaseException:
+        status = 1
+        raise
+    finally:
+        finished = trace.end()
+        if finished is not None:
+            finished.write(
+                command=args.command,
+                operation=getattr(args, "op", None),
+                exit=0 if status is None else status,
+            )
+
+
+def _run(
+    args: argparse.Namespace, load: Callable[[str | None], dict[str, HookConfig]]
+) -> None:
+    with trace.span("config"):
+        config = load(args.config)
+    for hook in config.values():
+        if args.no_cache:
+            hook.cache = None
+        elif args.refresh and hook.cache is not None:
+            # Copied: the cache object is shared by every hook (and request).
+            hook.cache = copy.copy(hook.cache)
+            hook.cache.refresh = True
+    with trace.span("run"):
+        args.func(args, config)
@@ -0,0 +1,94 @@
+"""Thin client for the ``n8n-hooks serve`` daemon.
+
+``cli.main`` calls :func:`forward` first. When a daemon is listening on
+:func:`socket_path`, the argv (and stdin, for commands that read it) is sent
+over the Unix socket and the daemon's stdout, stderr and exit status are
+replayed locally; otherwise :func:`forward` returns None and the command runs
+in-process. This module stays small so that forwarding costs little more
+than interpreter start.
+
+Wire format: the client sends one JSON header line
+``{"argv": [...], "cwd": "...", "env": {...}, "stdin": bool}`` followed by raw
+stdin bytes until it shuts down its write side. The daemon answers with frames
+of a one-byte tag, a 4-byte big-endian length and the data: ``o`` for stdout,
+``e`` for stderr, and a final ``x`` carrying the exit status as ASCII.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+from pathlib import Path
+
+FRAME_HEADER = struct.Struct(">cI")
+STDOUT = b"o"
+STDERR = b"e"
+EXIT = b"x"
+
+
+def socket_path() -> Path | None:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime:
+        return None
+    return Path(runtime) / "n8n-hooks" / "daemon.sock"
+
+
+def forward(argv: list[str], stdin: bool = False) -> int | None:
+    """Run *argv* on the daemon and return its exit status.
+
+    With *stdin*, the local stdin is streamed to the command. Returns None,
+    having sent nothing, if no daemon is reachable or ``N8N_HOOKS_NO_DAEMON``
+    is set.
+    """
+    path = socket_path()
+    if os.environ.get("N8N_HOOKS_NO_DAEMON") or path is None or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+
+    with sock:
+        header = {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+            "stdin": stdin,
+        }
+        sock.sendall(json.dumps(header).encode() + b"\n")
+        if stdin:
+            threading.Thread(target=_pump_stdin, args=(sock,), daemon=True).start()
+        else:
+            sock.shutdown(socket.SHUT_WR)
+        return _replay(sock)
+
+
+def _pump_stdin(sock: socket.socket) -> None:
+    try:
+        while chunk := os.read(sys.stdin.fileno(), 65536):
+            sock.sendall(chunk)
+        sock.shutdown(socket.SHUT_WR)
+    except OSError:
+        return
+
+
+def _replay(sock: socket.socket) -> int:
+    reader = sock.makefile("rb")
+    while True:
+        header = reader.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            print("n8n-hooks: lost connection to daemon", file=sys.stderr)
+            return 1
+        tag, length = FRAME_HEADER.unpack(header)
+        data = reader.read(length)
+        if tag == EXIT:
+            return int(data)
+        stream = sys.stdout if tag == STDOUT else sys.stderr
+        stream.buffer.write(data)
+        stream.flush()
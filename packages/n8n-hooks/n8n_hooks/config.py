@@ -4,6 +4,7 @@ Expected format:
 
     {
       "token_command": "rbw get n8n-hooks-token",
+      "token_cache_ttl": 300,
       "hooks": {
         "store-draft": {
           "url": "https://n8n.example.test/webhook/mail-draft-store",
@@ -13,42 +14,232 @@ Expected format:
     }
 
 Hook entries can override the top-level ``token_command`` or literal ``token``.
+
+``gzip_min_bytes`` (top-level or per hook) gzips request bodies of at least
+that many bytes, and always those streaming attachments; by default requests
+go out uncompressed. Responses are requested with ``Accept-Encoding: gzip``
+unless ``accept_gzip`` is false.
+
+Token commands run lazily, the first time a hook actually posts, and at most
+once per distinct command string per process. With ``token_cache_ttl`` (or
+``$N8N_HOOKS_TOKEN_CACHE_TTL``) set to a number of seconds, resolved tokens are
+also kept in ``$XDG_RUNTIME_DIR/n8n-hooks/tokens.json`` (mode 0600) so
+back-to-back invocations skip the password manager.
+
+A top-level ``cache`` section enables the read-only response cache; see
+:mod:`n8n_hooks.cache`. ``retry`` (top-level or per hook) and
+``circuit_breaker`` tune retries of read-only hooks and failing fast while
+n8n is down; see :mod:`n8n_hooks.retry`.
 """
 
 from __future__ import annotations
 
 import json
 import os
-import subprocess
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from n8n_hooks.cache import ResponseCache
+    from n8n_hooks.retry import CircuitBreaker, RetryPolicy
+
+
+class TokenError(RuntimeError):
+    """A token command failed."""
 
 
 @dataclass
 class HookConfig:
     url: str
-    token: str | None
+    token: str | None = None
+    token_command: str | None = None
+    token_cache_ttl: float = 0.0
+    name: str = ""
+    cache: ResponseCache | None = None
+    # Gzip request bodies of at least this many bytes (None: never).
+    gzip_min_bytes: int | None = None
+    accept_gzip: bool = True
+    # Retries of failed requests (None: a single try) and the shared breaker.
+    retry: RetryPolicy | None = None
+    breaker: CircuitBreaker | None = None
+
+    def bearer_token(self) -> str | None:
+        """Return the bearer token, running ``token_command`` on first use."""
+        if self.token is None and self.token_command is not None:
+            self.token = resolve_token_command(self.token_command, self.token_cache_ttl)
+        return self.token
+
+
+_memo: dict[str, str] = {}
+_memo_lock = threading.Lock()
 
 
 def _xdg_config_home() -> Path:
     return Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
 
 
-def _resolve_token(raw: dict[str, object]) -> str | None:
-    """Return the bearer token, running a command if needed."""
+def _token_cache_path() -> Path | None:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime:
+        # Never fall back to a shared location like /tmp for secrets.
+        return None
+    return Path(runtime) / "n8n-hooks" / "tokens.json"
+
+
+def _cache_key(command: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(command.encode()).hexdigest()
+
+
+def _read_cached_token(command: str) -> str | None:
+    path = _token_cache_path()
+    if path is None:
+        return None
+    try:
+        entries = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    entry = entries.get(_cache_key(command)) if isinstance(entries, dict) else None
+    if not isinstance(entry, dict):
+        return None
+    expires = entry.get("expires")
+    token = entry.get("token")
+    if not isinstance(expires, (int, float)) or expires <= time.time():
+        return None
+    return token if isinstance(token, str) else None
+
+
+def _write_cached_token(command: str, token: str, ttl: float) -> None:
+    import tempfile
+
+    path = _token_cache_path()
+    if path is None:
+        return
+    now = time.time()
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        try:
+            entries = json.loads(path.read_text())
+        except (OSError, ValueError):
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+        entries = {
+            key: value
+            for key, value in entries.items()
+            if isinstance(value, dict) and value.get("expires", 0) > now
+        }
+        entries[_cache_key(command)] = {"token": token, "expires": now + ttl}
+        # mkstemp creates the file with mode 0600; rename keeps it atomic.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tokens-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, path)
+    except OSError:
+        return
+
+
+def resolve_token_command(command: str, cache_ttl: float = 0.0) -> str:
+    """Run *command* and return its stripped stdout, memoized per command."""
+    with _memo_lock:
+        if command in _memo:
+            return _memo[command]
+        token = _read_cached_token(command) if cache_ttl > 0 else None
+        if token is None:
+            # Imported here, like tempfile/hashlib for the cache file: a literal
+            # or cached token should not pay for them on every CLI start.
+            import subprocess
+
+            try:
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+            except subprocess.CalledProcessError as exc:
+                detail = exc.stderr.strip() if exc.stderr else ""
+                raise TokenError(
+                    f"token command failed with exit code {exc.returncode}"
+                    + (f": {detail}" if detail else "")
+                ) from None
+            token = result.stdout.strip()
+            if cache_ttl > 0:
+                _write_cached_token(command, token, cache_ttl)
+        _memo[command] = token
+        return token
+
+
+def _token_source(raw: dict[str, object]) -> tuple[str | None, str | None]:
+    """Return the (literal token, token command) declared in *raw*."""
     if "token" in raw:
-        return str(raw["token"])
+        return str(raw["token"]), None
     if "token_command" in raw:
-        result = subprocess.run(
-            str(raw["token_command"]),
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return result.stdout.strip()
-    return None
+        return None, str(raw["token_command"])
+    return None, None
+
+
+def _cache_ttl(raw: dict[str, object]) -> float:
+    value = os.environ.get("N8N_HOOKS_TOKEN_CACHE_TTL", raw.get("token_cache_ttl", 0))
+    try:
+        return max(float(str(value)), 0.0)
+    except ValueError:
+        print(f"n8n-hooks: invalid token cache TTL: {value}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _response_cache(raw: dict[str, object]) -> ResponseCache | None:
+    if "cache" not in raw and "N8N_HOOKS_CACHE" not in os.environ:
+        # Skip importing sqlite3 for the common uncached setup.
+        return None
+    from n8n_hooks.cache import from_config
+
+    return from_config(raw.get("cache"))
+
+
+def _compression(
+    raw: dict[str, object], entry: dict[str, object]
+) -> tuple[int | None, bool]:
+    min_bytes = entry.get("gzip_min_bytes", raw.get("gzip_min_bytes"))
+    accept = entry.get("accept_gzip", raw.get("accept_gzip", True))
+    if min_bytes is not None and (
+        not isinstance(min_bytes, int) or isinstance(min_bytes, bool) or min_bytes < 0
+    ):
+        print(f"n8n-hooks: invalid gzip_min_bytes: {min_bytes}", file=sys.stderr)
+        sys.exit(1)
+    return min_bytes, bool(accept)
+
+
+def _retry_policy(
+    raw: dict[str, object], entry: dict[str, object], name: str
+) -> RetryPolicy | None:
+    from n8n_hooks.hooks import HOOKS
+    from n8n_hooks.retry import policy_from_config
+
+    if name not in HOOKS or not HOOKS[name].read_only:
+        # Repeating a write could apply it twice.
+        return None
+    try:
+        return policy_from_config(entry.get("retry", raw.get("retry")))
+    except ValueError as exc:
+        print(f"n8n-hooks: invalid retry config for {name}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _breaker(raw: dict[str, object]) -> CircuitBreaker | None:
+    from n8n_hooks.retry import breaker_from_config
+
+    try:
+        return breaker_from_config(raw.get("circuit_breaker"))
+    except ValueError as exc:
+        print(f"n8n-hooks: invalid circuit_breaker config: {exc}", file=sys.stderr)
+        sys.exit(1)
 
 
 def load_config(path: str | None = None) -> dict[str, HookConfig]:
@@ -65,7 +256,10 @@ def load_config(path: str | None = None) -> dict[str, HookConfig]:
     with open(path_obj) as f:
         raw: dict[str, object] = json.load(f)
 
-    token = _resolve_token(raw)
+    default_source = _token_source(raw)
+    ttl = _cache_ttl(raw)
+    cache = _response_cache(raw)
+    breaker = _breaker(raw)
 
     hooks_raw = raw.get("hooks", {})
     if not isinstance(hooks_raw, dict):
@@ -76,8 +270,20 @@ def load_config(path: str | None = None) -> dict[str, HookConfig]:
     for name, entry in hooks_raw.items():
         if not isinstance(entry, dict):
             continue
+        token, token_command = _token_source(entry)
+        if token is None and token_command is None:
+            token, token_command = default_source
+        gzip_min_bytes, accept_gzip = _compression(raw, entry)
         configs[name] = HookConfig(
             url=str(entry["url"]),
-            token=_resolve_token(entry) or token,
+            token=token,
+            token_command=token_command,
+            token_cache_ttl=ttl,
+            name=name,
+            cache=cache,
+            gzip_min_bytes=gzip_min_bytes,
+            accept_gzip=accept_gzip,
+            retry=_retry_policy(raw, entry, name),
+            breaker=breaker,
         )
     return configs
@@ -0,0 +1,150 @@
+"""context subcommand — query several read-only hooks concurrently.
+
+Each ``--source`` is a read-only hook invocation written as it would follow
+``n8n-hooks`` on the command line (split with shell quoting rules). Given only
+a query, the command searches Slack messages and Linkwarden links for it:
+
+    n8n-hooks context "nix flakes"
+    n8n-hooks context --source 'slack search "in:#dev deploy" -n 5' \\
+                      --source 'rss list-entries --starred --limit 10'
+
+Every source is posted through :mod:`n8n_hooks.aio` on one event loop, so the
+whole command takes about as long as the slowest source. The merged document
+lists each source's arguments, outcome and elapsed time in input order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shlex
+import sys
+import time
+from typing import Any
+
+from n8n_hooks.batch import build_invocation, resolve_payload
+from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks import HOOKS
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "context",
+        help="Query several read-only hooks concurrently and merge the results",
+        description="Fan out to read-only hooks concurrently and print one JSON document.",
+    )
+    p.add_argument(
+        "query",
+        nargs="?",
+        help="Search Slack messages and Linkwarden links for this text",
+    )
+    p.add_argument(
+        "--source",
+        dest="sources",
+        action="append",
+        default=[],
+        metavar="'HOOK ARGS...'",
+        help="Read-only hook invocation, e.g. 'rss list-entries --starred'",
+    )
+    p.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=20,
+        help="Result limit for the default query sources",
+    )
+    p.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for each source",
+    )
+    p.set_defaults(func=run)
+
+
+def default_sources(query: str, limit: int) -> list[list[str]]:
+    return [
+        ["slack", "search", query, "-n", str(limit)],
+        ["linkwarden", "search-links", "--query", query],
+    ]
+
+
+def prepare(argv: list[str]) -> tuple[str, dict[str, Any]]:
+    """Turn one source argv into (hook name, payload); raise ValueError."""
+    if not argv:
+        raise ValueError("empty source")
+    hook, *rest = argv
+    entry = HOOKS.get(hook)
+    if entry is None or not entry.read_only:
+        raise ValueError(f"{hook!r} is not a read-only hook")
+    if hook == "slack" and rest[:1] == ["file-download"]:
+        raise ValueError("slack file-download is not supported here")
+    return hook, build_invocation(hook, rest)
+
+
+async def _fetch(
+    argv: list[str], config: dict[str, HookConfig], timeout: float
+) -> dict[str, Any]:
+    import asyncio
+
+    from n8n_hooks import aio
+    from n8n_hooks.webhook import WebhookError
+
+    record: dict[str, Any] = {"source": shlex.join(argv)}
+    start = time.monotonic()
+    try:
+        hook, payload = prepare(argv)
+        record["hook"] = hook
+        if hook not in config:
+            raise ValueError(f"no '{hook}' section in config")
+        payload = resolve_payload(hook, payload, config)
+        async with asyncio.timeout(timeout):
+            result = await aio.call(config[hook], payload)
+    except (ValueError, WebhookError) as exc:
+        record.update(ok=False, error=str(exc))
+    except TimeoutError:
+        record.update(ok=False, error=f"timed out after {timeout:g}s")
+    else:
+        status = result.get("status")
+        record.update(
+            ok=not (isinstance(status, int) and status >= 400),
+            result=result.get("body", result),
+        )
+    record["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return record
+
+
+async def gather_context(
+    sources: list[list[str]], config: dict[str, HookConfig], timeout: float = 30.0
+) -> dict[str, Any]:
+    """Run every source concurrently and merge the results."""
+    import asyncio
+
+    start = time.monotonic()
+    records = await asyncio.gather(*(_fetch(s, config, timeout) for s in sources))
+    return {
+        "elapsed_ms": round((time.monotonic() - start) * 1000, 1),
+        "sources": records,
+    }
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    import asyncio
+
+    try:
+        sources = [shlex.split(source) for source in args.sources]
+    except ValueError as exc:
+        print(f"n8n-hooks: invalid --source: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if args.query:
+        sources = default_sources(args.query, args.limit) + sources
+    if not sources:
+        print("n8n-hooks: context needs a query or --source", file=sys.stderr)
+        sys.exit(1)
+
+    merged = asyncio.run(gather_context(sources, config, args.timeout))
+    if args.query:
+        merged = {"query": args.query, **merged}
+    print(json.dumps(merged, indent=2, ensure_ascii=False))
+    if not all(record["ok"] for record in merged["sources"]):
+        sys.exit(1)
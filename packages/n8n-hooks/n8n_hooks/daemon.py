@@ -0,0 +1,344 @@
+"""serve subcommand — keep imports, config, tokens and connections warm.
+
+``n8n-hooks serve`` listens on a Unix socket in ``$XDG_RUNTIME_DIR/n8n-hooks``
+(see :mod:`n8n_hooks.client` for the wire format) and runs each forwarded
+invocation in a thread of its own, so it skips interpreter start, imports,
+config parsing and token commands, and the connections in
+:mod:`n8n_hooks.transport`'s pool stay open from one request to the next. The
+config the daemon was started with is parsed, and its token commands run, at
+start; configs are reloaded when the file's mtime changes, and each request
+gets its own copies of the hook configs, so per-invocation flags like
+``--no-cache`` do not leak.
+
+Each request runs in the client's working directory and environment and sends
+its stdio over the socket (:mod:`n8n_hooks.streams`), so a forwarded command
+reads and writes the same caches, templates and spool as it would run
+directly. The working directory and environment belong to the whole process:
+requests that share them run side by side, a request with others waits for
+those to finish.
+
+A request that spooled an ``--async`` request (:mod:`n8n_hooks.spool`) or found
+Slack directory tables out of date (:mod:`n8n_hooks.directory`) sends or
+refreshes them once its client has its answer. The spool is also flushed
+every :data:`FLUSH_INTERVAL` seconds by a flusher thread with the daemon's own
+working directory, environment, config and stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from n8n_hooks import cli, spool, streams
+from n8n_hooks.client import EXIT, FRAME_HEADER, STDERR, STDOUT, socket_path
+from n8n_hooks.config import HookConfig, TokenError, _xdg_config_home, load_config
+
+# Seconds between spool flushes by the flusher thread.
+FLUSH_INTERVAL = 60
+
+# Environment variables that change what load_config returns for a path.
+_CONFIG_ENV = (
+    "N8N_HOOKS_CACHE",
+    "N8N_HOOKS_TOKEN_CACHE_TTL",
+    "XDG_CACHE_HOME",
+    "XDG_RUNTIME_DIR",
+)
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "serve",
+        help="Run a warm daemon that other n8n-hooks invocations forward to",
+        description="Serve n8n-hooks invocations over a Unix socket in $XDG_RUNTIME_DIR.",
+    )
+    p.add_argument(
+        "--socket",
+        help="Socket path (default: $XDG_RUNTIME_DIR/n8n-hooks/daemon.sock)",
+    )
+    p.set_defaults(func=run)
+
+
+class _FrameWriter(io.RawIOBase):
+    """Writes everything as frames of one tag; safe to share across threads."""
+
+    def __init__(self, sock: socket.socket, tag: bytes, lock: threading.Lock) -> None:
+        self._sock = sock
+        self._tag = tag
+        self._lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        with self._lock:
+            self._sock.sendall(FRAME_HEADER.pack(self._tag, len(chunk)) + chunk)
+        return len(chunk)
+
+
+def _text_stream(
+    sock: socket.socket, tag: bytes, lock: threading.Lock
+) -> io.TextIOWrapper:
+    return io.TextIOWrapper(
+        io.BufferedWriter(_FrameWriter(sock, tag, lock)),
+        encoding="utf-8",
+        line_buffering=True,
+    )
+
+
+def _send_exit(sock: socket.socket, code: int) -> None:
+    data = str(code).encode()
+    sock.sendall(FRAME_HEADER.pack(EXIT, len(data)) + data)
+
+
+class ConfigCache:
+    """Parsed configs keyed by path, mtime and environment; hands out copies."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, tuple[str | None, ...]], tuple[int, Any]] = {}
+        self._warmed: tuple[str, int] | None = None
+
+    def load(self, path: str | None = None) -> dict[str, HookConfig]:
+        resolved = _resolve(path)
+        try:
+            mtime = os.stat(resolved).st_mtime_ns
+        except OSError:
+            # Let load_config report the missing file the usual way.
+            return load_config(path)
+        key = (resolved, tuple(os.environ.get(name) for name in _CONFIG_ENV))
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, load_config(resolved))
+            self._entries[key] = entry
+        hooks: dict[str, HookConfig] = entry[1]
+        return {name: dataclasses.replace(hook) for name, hook in hooks.items()}
+
+    def warm(self, path: str | None = None) -> None:
+        """Parse *path* and run its token commands once per change of the file.
+
+        Errors are left for the requests that load the config to report.
+        """
+        resolved = _resolve(path)
+        try:
+            mtime = os.stat(resolved).st_mtime_ns
+        except OSError:
+            return
+        if self._warmed == (resolved, mtime):
+            return
+        self._warmed = (resolved, mtime)
+        with contextlib.suppress(SystemExit):
+            for hook in self.load(resolved).values():
+                with contextlib.suppress(TokenError):
+                    # Memoized process-wide, so requests reuse it.
+                    hook.bearer_token()
+
+
+def _resolve(path: str | None) -> str:
+    if path is None:
+        return str(_xdg_config_home() / "n8n-hooks" / "config.json")
+    return os.path.abspath(path)
+
+
+class _Scope:
+    """The working directory and environment that requests share.
+
+    Requests with the same pair hold the scope together; one with another
+    pair waits until they are done, then switches the process over.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._key: tuple[str, tuple[tuple[str, str], ...]] | None = None
+        self._users = 0
+
+    @contextlib.contextmanager
+    def enter(self, cwd: str, env: dict[str, str]) -> Iterator[None]:
+        """Hold the scope as *cwd* and *env*; OSError if *cwd* is unusable."""
+        key = (cwd, tuple(sorted(env.items())))
+        with self._cond:
+            while self._users and self._key != key:
+                self._cond.wait()
+            if self._key != key:
+                os.chdir(cwd)
+                os.environ.clear()
+                os.environ.update(env)
+                self._key = key
+            self._users += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._users -= 1
+                self._cond.notify_all()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serves one forwarded invocation, in a thread of the daemon."""
+
+    server: Server
+    rfile: io.BufferedReader
+
+    def handle(self) -> None:
+        try:
+            header = json.loads(self.rfile.readline())
+            argv = [str(arg) for arg in header["argv"]]
+            cwd = str(header["cwd"])
+            env = {str(k): str(v) for k, v in header.get("env", {}).items()}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        self._lock = threading.Lock()
+        stdin = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        self._stdout = _text_stream(self.request, STDOUT, self._lock)
+        self._stderr = _text_stream(self.request, STDERR, self._lock)
+        spooled = threading.Event()
+        spool.WAKEUP.set(spooled)
+        with contextlib.ExitStack() as scope:
+            with streams.redirect(
+                stdin=stdin, stdout=self._stdout, stderr=self._stderr
+            ):
+                try:
+                    scope.enter_context(
+                        self.server.scope.enter(cwd, env or self.server.home[1])
+                    )
+                except OSError as exc:
+                    print(f"n8n-hooks: {exc}", file=sys.stderr)
+                    self._answer(1)
+                    return
+                self._answer(self.server.execute(argv))
+            if spooled.is_set():
+                # This invocation spooled a request: send it now that the
+                # client has its answer, from the spool in its environment.
+                self.server.flush_spool()
+            directory = sys.modules.get("n8n_hooks.directory")
+            if directory is not None and directory.pending():
+                # Likewise for Slack directory tables a lookup found out of date.
+                directory.refresh_pending()
+
+    def _answer(self, code: int) -> None:
+        try:
+            self._stdout.flush()
+            self._stderr.flush()
+            with self._lock:
+                _send_exit(self.request, code)
+        except OSError:
+            # The client went away; nothing left to report to.
+            pass
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs forwarded invocations in threads that share warm state."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, config_path: str | None = None) -> None:
+        self.config_path = config_path
+        self.configs = ConfigCache()
+        self.configs.warm(config_path)
+        self.scope = _Scope()
+        self.home = (os.getcwd(), dict(os.environ))
+        self._next_flush = time.monotonic()
+        self._flusher: threading.Thread | None = None
+        streams.install()
+        super().__init__(str(path), _Handler)
+
+    def server_bind(self) -> None:
+        # Create the socket owner-only from the start, not chmod it after.
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def execute(self, argv: list[str]) -> int:
+        """Run *argv* as the client would have, in the client's scope."""
+        if cli.selected_command(argv) == "serve":
+            print("n8n-hooks: already running as a daemon", file=sys.stderr)
+            return 1
+        try:
+            cli.execute(argv, load=self.configs.load)
+        except SystemExit as exc:
+            return _exit_code(exc.code)
+        return 0
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # An invocation crashed in its thread: report it to the client the
+        # way an uncaught exception would have been.
+        text = traceback.format_exc().encode()
+        with contextlib.suppress(OSError):
+            request.sendall(FRAME_HEADER.pack(STDERR, len(text)) + text)
+            _send_exit(request, 1)
+
+    def service_actions(self) -> None:
+        """Start a periodic flush unless the last one is still running."""
+        super().service_actions()
+        busy = self._flusher is not None and self._flusher.is_alive()
+        if time.monotonic() >= self._next_flush and not busy:
+            self._next_flush = time.monotonic() + FLUSH_INTERVAL
+            self._flusher = threading.Thread(target=self._flush_at_home, daemon=True)
+            self._flusher.start()
+
+    def flush_spool(self) -> None:
+        """Send due spooled jobs with the current scope's environment."""
+        spool.flush(spool.Spool(), self.configs.load(self.config_path))
+
+    def _flush_at_home(self) -> None:
+        with self.scope.enter(*self.home):
+            self.flush_spool()
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _claim(path: Path) -> None:
+    """Prepare *path* for binding; exit if another daemon is listening on it."""
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    print(f"n8n-hooks: daemon already listening on {path}", file=sys.stderr)
+    sys.exit(1)
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    path = Path(args.socket) if args.socket else socket_path()
+    if path is None:
+        print("n8n-hooks: serve needs $XDG_RUNTIME_DIR or --socket", file=sys.stderr)
+        sys.exit(1)
+    _claim(path)
+    server = Server(path, args.config)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"n8n-hooks: serving on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
@@ -0,0 +1,258 @@
+"""Local SQLite directory of Slack channels and users.
+
+Maps ``#channel`` and ``@user`` names to Slack IDs for the slack hook without
+fetching the workspace listing through n8n on every call. The directory lives
+in ``$XDG_CACHE_HOME/n8n-hooks/slack-directory.sqlite``; channels and users
+are refreshed independently from the ``list-channels`` and ``list-users``
+operations once their TTL (a day, or ``N8N_HOOKS_SLACK_DIRECTORY_TTL``
+seconds) has passed, or early when a name is not found. A refresh only
+rewrites rows whose data changed and drops the ones that disappeared.
+
+Lookups rarely wait for a refresh: a table that is expired or missing the
+name is queued, and :func:`refresh_pending` fetches it once the invocation
+has answered (in a detached child of the CLI, or in the daemon's request
+child). Until then names are resolved from what the table holds, or passed
+through unchanged. A lookup with ``wait`` (a channel argument, which Slack
+cannot interpret as a name) fetches a table that was never filled before
+answering, as ``--refresh`` does for any table.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from n8n_hooks.config import HookConfig
+
+DEFAULT_TTL = 24 * 60 * 60
+# A lookup miss refetches a table at most this often, in seconds.
+MISS_REFRESH_INTERVAL = 5 * 60
+
+# operation, keys that may hold the listing in the response
+_LISTINGS = {
+    "channels": ("list-channels", ("channels", "conversations")),
+    "users": ("list-users", ("members", "users")),
+}
+
+
+def default_path() -> Path:
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache / "n8n-hooks" / "slack-directory.sqlite"
+
+
+def _ttl() -> float:
+    try:
+        return float(os.environ["N8N_HOOKS_SLACK_DIRECTORY_TTL"])
+    except (KeyError, ValueError):
+        return DEFAULT_TTL
+
+
+def _listing(result: Any, keys: tuple[str, ...]) -> list[dict[str, Any]] | None:
+    """Find the list of objects in a listing response, unwrapping n8n's envelope."""
+    if isinstance(result, list):
+        return [item for item in result if isinstance(item, dict)]
+    if not isinstance(result, dict):
+        return None
+    if "body" in result:
+        return _listing(result["body"], keys)
+    for key in keys:
+        if isinstance(result.get(key), list):
+            return _listing(result[key], keys)
+    return None
+
+
+def _names(kind: str, item: dict[str, Any]) -> set[str]:
+    """Lowercased names *item* may be referred to by."""
+    profile = item.get("profile")
+    profile = profile if isinstance(profile, dict) else {}
+    if kind == "channels":
+        candidates = [item.get("name"), item.get("name_normalized")]
+    else:
+        candidates = [
+            item.get("name"),
+            item.get("real_name"),
+            profile.get("display_name"),
+            profile.get("real_name"),
+        ]
+    return {c.lower() for c in candidates if isinstance(c, str) and c}
+
+
+class DirectoryError(Exception):
+    """The directory could not be refreshed and holds no data to fall back on."""
+
+
+# Tables a lookup found empty, expired or missing a name, by (path, kind).
+_pending: dict[tuple[Path, str], SlackDirectory] = {}
+_pending_lock = threading.Lock()
+
+
+def pending() -> bool:
+    """Whether a lookup queued a table for :func:`refresh_pending`."""
+    with _pending_lock:
+        return bool(_pending)
+
+
+def refresh_pending() -> None:
+    """Refetch every queued table; failures leave it to the next lookup."""
+    from n8n_hooks.webhook import WebhookError
+
+    with _pending_lock:
+        queued = list(_pending.items())
+        _pending.clear()
+    for (_, kind), directory in queued:
+        with contextlib.suppress(WebhookError, ValueError):
+            directory.refresh(kind)
+
+
+class SlackDirectory:
+    """Channels and users of one Slack workspace, keyed by ID and name."""
+
+    def __init__(
+        self,
+        hook: HookConfig,
+        path: Path | None = None,
+        ttl: float | None = None,
+        refresh: bool = False,
+    ) -> None:
+        # Listings bypass the response cache; the directory is their cache.
+        self.hook = dataclasses.replace(hook, cache=None)
+        self.path = path or default_path()
+        self.ttl = _ttl() if ttl is None else ttl
+        # Tables to refetch on first use (--refresh).
+        self.force = set(_LISTINGS) if refresh else set()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " kind TEXT, id TEXT, data TEXT, seen REAL, PRIMARY KEY (kind, id));"
+                "CREATE TABLE IF NOT EXISTS names ("
+                " kind TEXT, name TEXT, id TEXT, PRIMARY KEY (kind, name, id));"
+                "CREATE TABLE IF NOT EXISTS refreshed (kind TEXT PRIMARY KEY, at REAL);"
+            )
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _refreshed_at(self, db: sqlite3.Connection, kind: str) -> float | None:
+        row = db.execute("SELECT at FROM refreshed WHERE kind = ?", (kind,)).fetchone()
+        return None if row is None else float(row[0])
+
+    def refresh(self, kind: str) -> int:
+        """Refetch one table; return the number of rows added or changed."""
+        from n8n_hooks.webhook import call
+
+        operation, keys = _LISTINGS[kind]
+        items = _listing(call(self.hook, {"operation": operation}), keys)
+        if items is None:
+            raise ValueError(f"unexpected {operation} response")
+        now = time.time()
+        changed = 0
+        with self._connect() as db:
+            for item in items:
+                entry_id = item.get("id")
+                if not isinstance(entry_id, str):
+                    continue
+                data = json.dumps(item, sort_keys=True)
+                cursor = db.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (kind, id) DO UPDATE SET data = excluded.data"
+                    " WHERE data != excluded.data",
+                    (kind, entry_id, data, now),
+                )
+                if cursor.rowcount:
+                    changed += 1
+                    db.execute(
+                        "DELETE FROM names WHERE kind = ? AND id = ?", (kind, entry_id)
+                    )
+                    db.executemany(
+                        "INSERT OR IGNORE INTO names VALUES (?, ?, ?)",
+                        [(kind, name, entry_id) for name in _names(kind, item)],
+                    )
+                db.execute(
+                    "UPDATE entries SET seen = ? WHERE kind = ? AND id = ?",
+                    (now, kind, entry_id),
+                )
+            db.execute(
+                "DELETE FROM names WHERE kind = ? AND id IN"
+                " (SELECT id FROM entries WHERE kind = ? AND seen < ?)",
+                (kind, kind, now),
+            )
+            db.execute("DELETE FROM entries WHERE kind = ? AND seen < ?", (kind, now))
+            db.execute("INSERT OR REPLACE INTO refreshed VALUES (?, ?)", (kind, now))
+        return changed
+
+    def _ensure(self, kind: str, max_age: float, wait: bool = False) -> None:
+        """Queue *kind* for refresh if it was last refreshed over *max_age* ago.
+
+        With ``refresh``, or with *wait* while the table is missing or empty,
+        refetch it now instead.
+        """
+        from n8n_hooks.webhook import WebhookError
+
+        with self._connect() as db:
+            at = self._refreshed_at(db, kind)
+            empty = (
+                db.execute(
+                    "SELECT 1 FROM entries WHERE kind = ? LIMIT 1", (kind,)
+                ).fetchone()
+                is None
+            )
+        if kind in self.force or (wait and empty):
+            self.force.discard(kind)
+            try:
+                self.refresh(kind)
+            except (WebhookError, ValueError) as exc:
+                if empty:
+                    raise DirectoryError(f"cannot list Slack {kind}: {exc}") from exc
+                # A stale directory still resolves most names.
+            return
+        if at is None or time.time() - at >= max_age:
+            with _pending_lock:
+                _pending.setdefault((self.path, kind), self)
+
+    def _lookup(self, kind: str, name: str) -> list[str]:
+        with self._connect() as db:
+            return [
+                row[0]
+                for row in db.execute(
+                    "SELECT id FROM names WHERE kind = ? AND name = ? ORDER BY id",
+                    (kind, name.lower()),
+                )
+            ]
+
+    def resolve(self, kind: str, name: str, wait: bool = False) -> list[str]:
+        """Return the IDs of the *kind* entries named *name* (usually one).
+
+        With *wait*, a missing or empty table is fetched before the lookup.
+        """
+        self._ensure(kind, self.ttl, wait)
+        ids = self._lookup(kind, name)
+        if not ids:
+            # Possibly created since the last refresh.
+            self._ensure(kind, MISS_REFRESH_INTERVAL)
+        return ids
+
+    def dm_channel(self, user_id: str, wait: bool = False) -> str | None:
+        """Return the direct message channel with *user_id*, if listed."""
+        self._ensure("channels", self.ttl, wait)
+        with self._connect() as db:
+            for (data,) in db.execute(
+                "SELECT data FROM entries WHERE kind = 'channels'"
+            ):
+                item = json.loads(data)
+                if item.get("is_im") and item.get("user") == user_id:
+                    return str(item["id"])
+        return None
@@ -0,0 +1,37 @@
+"""flush subcommand — send write requests spooled with ``--async``.
+
+Drains the spool (see :mod:`n8n_hooks.spool`) once and prints how many jobs
+were sent, rescheduled after a transient failure, or marked failed. Run it
+from a timer when the ``serve`` daemon, which flushes on its own, is not
+running.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from n8n_hooks.config import HookConfig
+from n8n_hooks.spool import Spool, flush
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "flush",
+        help="Send write requests spooled with --async",
+        description="Send due spooled write requests to n8n and report the outcome.",
+    )
+    p.add_argument(
+        "--now",
+        action="store_true",
+        help="Also send jobs still waiting out a retry backoff",
+    )
+    p.set_defaults(func=run)
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    counts = flush(Spool(), config, now=args.now)
+    print(json.dumps(counts))
+    if counts["failed"]:
+        sys.exit(1)
@@ -1,15 +1,65 @@
-"""n8n hook modules."""
-
-from . import (
-    github,
-    linkwarden,
-    linkwarden_link_create,
-    rss,
-    slack,
-    store_draft,
-    vikunja,
-    vikunja_task_create,
-)
+"""n8n hook modules.
+
+Hook modules are imported lazily: the registry below carries just enough to
+list every subcommand in ``--help``, and :func:`load` imports a hook's module
+only once that subcommand is chosen. Keeping this file free of hook imports
+keeps ``yaml``, ``mimetypes`` and friends out of unrelated invocations.
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+
+
+@dataclass(frozen=True)
+class HookEntry:
+    module: str
+    help: str
+    # The n8n workflow behind the hook never mutates anything.
+    read_only: bool = False
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(self.module)
+
+
+HOOKS: dict[str, HookEntry] = {
+    "store-draft": HookEntry(f"{__name__}.store_draft", "Store an email draft via n8n"),
+    "github": HookEntry(
+        f"{__name__}.github",
+        "Call the GitHub REST API via n8n (read-only)",
+        read_only=True,
+    ),
+    "rss": HookEntry(
+        f"{__name__}.rss",
+        "Read RSS context via n8n (read-only)",
+        read_only=True,
+    ),
+    "slack": HookEntry(
+        f"{__name__}.slack",
+        "Query Slack via n8n (read-only)",
+        read_only=True,
+    ),
+    "vikunja": HookEntry(
+        f"{__name__}.vikunja",
+        "Read Vikunja task context via n8n (read-only)",
+        read_only=True,
+    ),
+    "vikunja-task-create": HookEntry(
+        f"{__name__}.vikunja_task_create",
+        "Submit template-aware Vikunja task creation requests via n8n",
+    ),
+    "linkwarden": HookEntry(
+        f"{__name__}.linkwarden",
+        "Read Linkwarden context via n8n (read-only)",
+        read_only=True,
+    ),
+    "linkwarden-link-create": HookEntry(
+        f"{__name__}.linkwarden_link_create",
+        "Create a confirmed Linkwarden link via n8n",
+    ),
+}
 
 __all__ = [
     "github",
@@ -21,3 +71,15 @@ __all__ = [
     "vikunja",
     "vikunja_task_create",
 ]
+
+
+def load(name: str) -> ModuleType:
+    """Import and return the module implementing hook *name*."""
+    return HOOKS[name].load()
+
+
+def __getattr__(attr: str) -> ModuleType:
+    # Keep `from n8n_hooks.hooks import rss` working without eager imports.
+    if attr in __all__:
+        return importlib.import_module(f"{__name__}.{attr}")
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
@@ -8,21 +8,28 @@ use `gh` directly.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import http.client
 import json
 import os
+import shutil
+import sqlite3
 import sys
-import urllib.request
+import time
 from pathlib import Path
 from typing import Any
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response
+from n8n_hooks.transport import POOL, RedirectError
 
 HOOK_NAME = "github"
 SPEC_URL = (
     "https://raw.githubusercontent.com/github/rest-api-description/"
     "main/descriptions/api.github.com/api.github.com.json"
 )
+# Revalidate the cached spec (conditional GET) at most this often, in seconds.
+SPEC_MAX_AGE = 24 * 60 * 60
 
 
 def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
@@ -65,20 +72,79 @@ def build_payload(args: argparse.Namespace) -> dict[str, object]:
     return payload
 
 
-def _cache_path() -> Path:
+def _cache_dir() -> Path:
     cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
-    return cache / "n8n-hooks" / "github-api.json"
+    return cache / "n8n-hooks"
+
+
+def _cache_path() -> Path:
+    return _cache_dir() / "github-api.json"
+
+
+def _meta_path() -> Path:
+    return _cache_dir() / "github-api.meta.json"
+
+
+def _index_path() -> Path:
+    return _cache_dir() / "github-api.sqlite"
 
 
-def _load_spec() -> dict[str, Any]:
+def _read_meta() -> dict[str, Any]:
+    try:
+        meta = json.loads(_meta_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _write_meta(meta: dict[str, Any]) -> None:
+    _meta_path().write_text(json.dumps(meta))
+
+
+def _refresh_spec() -> None:
+    """Fetch the spec if missing or due for revalidation.
+
+    Revalidation is a conditional GET with the stored ETag, so an unchanged
+    spec costs one 304 instead of a 12 MB download. A stale cached copy is
+    kept if GitHub cannot be reached.
+    """
     p = _cache_path()
+    meta = _read_meta()
+    checked = meta.get("checked")
+    fresh = isinstance(checked, (int, float)) and time.time() - checked < SPEC_MAX_AGE
+    if p.exists() and fresh:
+        return
+
+    headers: dict[str, str] = {}
+    etag = meta.get("etag")
+    if p.exists() and isinstance(etag, str):
+        headers["If-None-Match"] = etag
+
+    p.parent.mkdir(parents=True, exist_ok=True)
     if not p.exists():
-        p.parent.mkdir(parents=True, exist_ok=True)
         print(f"n8n-hooks: fetching {SPEC_URL} (~12MB, cached)", file=sys.stderr)
-        with urllib.request.urlopen(SPEC_URL) as r, open(p, "wb") as f:
-            f.write(r.read())
-    with open(p) as f:
-        return json.load(f)  # type: ignore[no-any-return]
+    tmp = p.with_suffix(".json.part")
+    try:
+        with POOL.open("GET", SPEC_URL, headers=headers) as resp:
+            if resp.status == 304:
+                resp.read()
+            elif resp.status == 200:
+                with open(tmp, "wb") as f:
+                    shutil.copyfileobj(resp, f)
+                os.replace(tmp, p)
+                meta["etag"] = resp.getheader("ETag")
+            else:
+                resp.read()
+                raise OSError(f"HTTP {resp.status}")
+    except (OSError, http.client.HTTPException, RedirectError) as exc:
+        tmp.unlink(missing_ok=True)
+        if not p.exists():
+            print(f"n8n-hooks: could not fetch API spec: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"n8n-hooks: using cached API spec ({exc})", file=sys.stderr)
+        return
+    meta["checked"] = time.time()
+    _write_meta(meta)
 
 
 def _resolve_ref(spec: dict[str, Any], ref: str) -> dict[str, Any]:
@@ -88,9 +154,10 @@ def _resolve_ref(spec: dict[str, Any], ref: str) -> dict[str, Any]:
     return node if isinstance(node, dict) else {}
 
 
-def _fmt_schema(spec: dict[str, Any], schema: dict[str, Any], indent: str) -> None:
+def _fmt_schema(spec: dict[str, Any], schema: dict[str, Any], indent: str) -> list[str]:
     if "$ref" in schema:
         schema = _resolve_ref(spec, schema["$ref"])
+    lines: list[str] = []
     req = set(schema.get("required", []))
     for name, prop in schema.get("properties", {}).items():
         if "$ref" in prop:
@@ -103,50 +170,101 @@ def _fmt_schema(spec: dict[str, Any], schema: dict[str, Any], indent: str) -> No
             t = f"[{item.get('type', 'object')}]"
         mark = "*" if name in req else " "
         desc = str(prop.get("description", "")).split("\n")[0]
-        print(f"{indent}{mark} {name}: {t}  {desc}".rstrip())
+        lines.append(f"{indent}{mark} {name}: {t}  {desc}".rstrip())
+    return lines
 
 
-def _show_path(spec: dict[str, Any], path: str) -> None:
+def _render_path(spec: dict[str, Any], path: str) -> list[str]:
+    lines: list[str] = []
     for method, op in sorted(spec["paths"][path].items()):
         if not isinstance(op, dict):
             continue
         ro = "" if method == "get" else "  (write — not available via this hook)"
-        print(f"\n{method.upper()} {path}{ro}")
+        lines.append(f"\n{method.upper()} {path}{ro}")
         if s := op.get("summary"):
-            print(f"  {s}")
+            lines.append(f"  {s}")
         for p in op.get("parameters", []):
             if "$ref" in p:
                 p = _resolve_ref(spec, p["$ref"])
             mark = "*" if p.get("required") else " "
             t = p.get("schema", {}).get("type", "")
             desc = str(p.get("description", "")).split("\n")[0]
-            print(f"  {mark} {p.get('name')} ({p.get('in')}:{t})  {desc}".rstrip())
+            lines.append(
+                f"  {mark} {p.get('name')} ({p.get('in')}:{t})  {desc}".rstrip()
+            )
         body = op.get("requestBody", {}).get("content", {})
         if schema := body.get("application/json", {}).get("schema"):
-            print("  body:")
-            _fmt_schema(spec, schema, "    ")
+            lines.append("  body:")
+            lines.extend(_fmt_schema(spec, schema, "    "))
+    return lines
 
 
-def _discover(pattern: str) -> None:
-    """Grep endpoints, or show params if pattern is an exact path."""
-    spec = _load_spec()
-    paths = spec.get("paths", {})
+def _spec_signature() -> str:
+    st = _cache_path().stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
 
-    if pattern in paths:
-        _show_path(spec, pattern)
-        return
 
-    pat = pattern.lower()
-    for path, ops in sorted(paths.items()):
+def _build_index(db: sqlite3.Connection, signature: str) -> None:
+    """Precompute every discover line and path detail from the full spec."""
+    with open(_cache_path()) as f:
+        spec: dict[str, Any] = json.load(f)
+    rows = []
+    for path, ops in sorted(spec.get("paths", {}).items()):
         methods = ",".join(sorted(m for m in ops if isinstance(ops[m], dict)))
         summaries = " | ".join(
             o.get("summary", "") for o in ops.values() if isinstance(o, dict)
         )
         line = f"{path} [{methods}]  {summaries}"
-        if not pat or pat in line.lower():
+        detail = "\n".join(_render_path(spec, path))
+        rows.append((path, line, line.lower(), detail))
+    with db:
+        db.execute("DROP TABLE IF EXISTS paths")
+        db.execute(
+            "CREATE TABLE paths (path TEXT PRIMARY KEY, line TEXT,"
+            " line_lower TEXT, detail TEXT)"
+        )
+        db.executemany("INSERT INTO paths VALUES (?, ?, ?, ?)", rows)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        db.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (signature,))
+
+
+def _open_index() -> sqlite3.Connection:
+    """Open the discover index, rebuilding it if the cached spec changed."""
+    _refresh_spec()
+    signature = _spec_signature()
+    db = sqlite3.connect(_index_path())
+    try:
+        row = db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is None or row[0] != signature:
+        print("n8n-hooks: indexing API spec", file=sys.stderr)
+        _build_index(db, signature)
+    return db
+
+
+def _discover(pattern: str) -> None:
+    """Grep endpoints, or show params if pattern is an exact path."""
+    with contextlib.closing(_open_index()) as db:
+        row = db.execute(
+            "SELECT detail FROM paths WHERE path = ?", (pattern,)
+        ).fetchone()
+        if row is not None:
+            print(row[0])
+            return
+
+        for (line,) in db.execute(
+            "SELECT line FROM paths WHERE instr(line_lower, ?) > 0 ORDER BY path",
+            (pattern.lower(),),
+        ):
             print(line)
 
 
+def supports_batch(args: argparse.Namespace) -> bool:
+    """Whether *args* are one plain webhook call (see n8n_hooks.batch)."""
+    return str(args.path) != "discover"
+
+
 def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
     if args.path == "discover":
         _discover(args.term)
@@ -156,10 +274,4 @@ def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-
-    status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2))
-    if isinstance(status, int) and status >= 400:
-        sys.exit(1)
+    write_response(args, config[HOOK_NAME], build_payload(args))
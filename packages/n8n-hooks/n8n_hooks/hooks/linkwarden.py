@@ -3,6 +3,9 @@
 The n8n workflow holds the Linkwarden token. This CLI only exposes a fixed set
 of read operations so agents can inspect saved links without holding Linkwarden
 credentials or mutating bookmark state.
+
+``sync`` mirrors link metadata into a local full-text index
+(n8n_hooks.mirror) that ``search-links --local`` queries directly.
 """
 
 from __future__ import annotations
@@ -13,7 +16,7 @@ import sys
 from typing import Any
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response, write_value
 
 HOOK_NAME = "linkwarden"
 
@@ -33,6 +36,30 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
 
     search = sub.add_parser("search-links", help="Search links")
     search.add_argument("--query", required=True, help="Linkwarden search query")
+    search.add_argument(
+        "--local",
+        action="store_true",
+        help="Search the local mirror (see 'sync'); falls back to n8n when stale",
+    )
+    search.add_argument(
+        "--tag",
+        action="append",
+        dest="tags",
+        default=[],
+        metavar="TAG",
+        help="Only links with this tag (repeatable; with --local)",
+    )
+    search.add_argument("--collection", help="Only links in this collection (--local)")
+    search.add_argument(
+        "-n", "--limit", type=int, default=20, help="Maximum results (--local)"
+    )
+
+    sync = sub.add_parser("sync", help="Mirror links into the local search index")
+    sync.add_argument(
+        "--full",
+        action="store_true",
+        help="Refetch every link, picking up edits and deletions",
+    )
 
     get = sub.add_parser("get-link", help="Show one link")
     get.add_argument("link_id", help="Link id")
@@ -59,17 +86,73 @@ def build_payload(args: argparse.Namespace) -> dict[str, object]:
     return payload
 
 
+def supports_batch(args: argparse.Namespace) -> bool:
+    """Whether *args* are one plain webhook call (see n8n_hooks.batch)."""
+    return args.op != "sync" and not getattr(args, "local", False)
+
+
 def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
     if HOOK_NAME not in config:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-    status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2, ensure_ascii=False))
-    if isinstance(status, int) and status >= 400:
+    if args.op == "sync":
+        _sync(args, config[HOOK_NAME])
+        return
+    if args.op == "search-links" and getattr(args, "local", False):
+        _search_local(args, config[HOOK_NAME])
+        return
+
+    write_response(args, config[HOOK_NAME], build_payload(args), ensure_ascii=False)
+
+
+def _sync(args: argparse.Namespace, hook: HookConfig) -> None:
+    from n8n_hooks.mirror import LinkwardenMirror, UnsupportedError
+    from n8n_hooks.webhook import WebhookError
+
+    try:
+        summary = LinkwardenMirror(hook).sync(full=args.full)
+    except UnsupportedError as exc:
+        print(
+            f"n8n-hooks: the linkwarden workflow cannot be mirrored ({exc}); "
+            "search-links --local will keep searching via n8n",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    except (WebhookError, ValueError) as exc:
+        print(f"n8n-hooks: linkwarden sync failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(summary, indent=2))
+
+
+def _search_remote(args: argparse.Namespace, hook: HookConfig, query: str) -> None:
+    from n8n_hooks.mirror import filter_links
+    from n8n_hooks.webhook import post
+
+    payload: dict[str, object] = {"operation": "search-links", "query": query}
+    try:
+        links = filter_links(post(hook, payload), args.tags, args.collection)
+    except ValueError as exc:
+        print(f"n8n-hooks: cannot filter search results: {exc}", file=sys.stderr)
         sys.exit(1)
+    write_value(args, links[: args.limit], ensure_ascii=False)
+
+
+def _search_local(args: argparse.Namespace, hook: HookConfig) -> None:
+    from n8n_hooks.mirror import LinkwardenMirror, max_age
+
+    query = _required_text("query", args.query)
+    mirror = LinkwardenMirror(hook)
+    if not mirror.is_fresh(max_age()):
+        print(
+            "n8n-hooks: linkwarden mirror is stale; searching via n8n", file=sys.stderr
+        )
+        _search_remote(args, hook, query)
+        return
+    links = mirror.search(
+        query, tags=args.tags, collection=args.collection, limit=args.limit
+    )
+    write_value(args, links, ensure_ascii=False)
 
 
 def _positive_int(name: str, value: Any) -> int:
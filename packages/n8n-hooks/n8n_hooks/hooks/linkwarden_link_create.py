@@ -3,13 +3,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import NoReturn
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response
 
 HOOK_NAME = "linkwarden-link-create"
 ALLOWED_COLLECTIONS = {
@@ -49,6 +48,12 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         default=[],
         help="Tag to attach. Repeat for multiple tags.",
     )
+    p.add_argument(
+        "--async",
+        dest="spool",
+        action="store_true",
+        help="Spool the request and return at once; see 'n8n-hooks flush'",
+    )
     p.set_defaults(func=run)
 
 
@@ -70,12 +75,13 @@ def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-    status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2, ensure_ascii=False))
-    if isinstance(status, int) and status >= 400:
-        sys.exit(1)
+    payload = build_payload(args)
+    if getattr(args, "spool", False):
+        from n8n_hooks.spool import spool_request
+
+        spool_request(HOOK_NAME, payload)
+        return
+    write_response(args, config[HOOK_NAME], payload, ensure_ascii=False)
 
 
 def _description(inline: str | None, file_path: str | None) -> str:
@@ -3,6 +3,10 @@
 The n8n workflow holds the Miniflux token. This CLI only exposes a fixed set
 of read operations so agents can inspect RSS entries without holding Miniflux
 credentials or mutating read/starred state.
+
+``list-entries --all`` (or ``--max N``) walks the pages itself: the next page
+is fetched on a worker thread while the current one is written, and entries
+are printed as JSONL as they arrive, so memory stays bounded by two pages.
 """
 
 from __future__ import annotations
@@ -10,9 +14,15 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import project, write_response
+from n8n_hooks.webhook import WebhookError, call
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
 
 HOOK_NAME = "rss"
 
@@ -35,6 +45,18 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     entries.add_argument("--offset", type=int, default=0)
     entries.add_argument("--order", default="changed_at")
     entries.add_argument("--direction", choices=["asc", "desc"], default="desc")
+    paging = entries.add_mutually_exclusive_group()
+    paging.add_argument(
+        "--all",
+        action="store_true",
+        help="Page through every entry, printing one JSON object per line",
+    )
+    paging.add_argument(
+        "--max",
+        type=_positive_int,
+        metavar="N",
+        help="Like --all, but stop after N entries",
+    )
 
     show = sub.add_parser("show-entry", help="Show one entry")
     show.add_argument("entry_id", help="RSS entry id")
@@ -45,6 +67,16 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     p.set_defaults(func=run)
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
+
 def _entry_id(value: object) -> int:
     try:
         return int(str(value))
@@ -78,14 +110,82 @@ def build_payload(args: argparse.Namespace) -> dict[str, object]:
     return payload
 
 
+def _page_entries(result: dict[str, Any]) -> tuple[list[Any], int | None]:
+    """Return (entries, total) from one list-entries response."""
+    status = result.get("status")
+    body = result.get("body", result)
+    if isinstance(status, int) and status >= 400:
+        raise WebhookError(f"HTTP {status}: {json.dumps(body)}")
+    if isinstance(body, list):
+        return body, None
+    if isinstance(body, dict) and isinstance(body.get("entries"), list):
+        total = body.get("total")
+        return body["entries"], total if isinstance(total, int) else None
+    raise WebhookError(f"unexpected list-entries response: {json.dumps(body)}")
+
+
+def iter_entries(
+    hook: HookConfig, payload: dict[str, object], max_entries: int | None = None
+) -> Iterator[Any]:
+    """Yield entries across pages, prefetching the next page meanwhile.
+
+    Raises WebhookError if any page fails.
+    """
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    limit = payload.get("limit")
+    offset = payload.get("offset")
+    page_size = limit if isinstance(limit, int) and limit > 0 else 50
+    offset = offset if isinstance(offset, int) else 0
+    emitted = 0
+
+    def fetch(at: int) -> Future[dict[str, Any]]:
+        # Keep the page's trace spans in this invocation's trace.
+        context = contextvars.copy_context()
+        page = {**payload, "limit": page_size, "offset": at}
+        return pool.submit(context.run, call, hook, page)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = fetch(offset)
+        while True:
+            entries, total = _page_entries(pending.result())
+            offset += page_size
+            more = (
+                len(entries) >= page_size
+                and (total is None or offset < total)
+                and (max_entries is None or emitted + len(entries) < max_entries)
+            )
+            if more:
+                pending = fetch(offset)
+            for entry in entries:
+                if max_entries is not None and emitted >= max_entries:
+                    return
+                yield entry
+                emitted += 1
+            if not more:
+                return
+
+
+def _write_all(args: argparse.Namespace, hook: HookConfig) -> None:
+    try:
+        fields = getattr(args, "fields", None)
+        for entry in iter_entries(hook, build_payload(args), args.max):
+            print(json.dumps(project(entry, fields)), flush=True)
+    except WebhookError as exc:
+        print(f"n8n-hooks: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
 def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
     if HOOK_NAME not in config:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-    status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2))
-    if isinstance(status, int) and status >= 400:
-        sys.exit(1)
+    if args.op == "list-entries" and (
+        getattr(args, "all", False) or getattr(args, "max", None) is not None
+    ):
+        _write_all(args, config[HOOK_NAME])
+        return
+
+    write_response(args, config[HOOK_NAME], build_payload(args))
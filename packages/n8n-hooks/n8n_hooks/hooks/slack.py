@@ -4,19 +4,30 @@ The n8n workflow holds the Slack token. This CLI forwards one of a fixed
 set of operations to the webhook so the agent can search messages, list
 channels/users, read channel history/thread replies, read small text files, and
 download document attachments without holding credentials.
+
+``history``, ``replies`` and ``search`` accept ``#channel`` and ``@user``
+names, resolved to IDs through the local n8n_hooks.directory.
 """
 
 from __future__ import annotations
 
 import argparse
-import base64
+import http.client
 import json
+import os
 import re
 import sys
+import uuid
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response
+from n8n_hooks.streaming import Base64Sink, ByteSource, JsonReader
+from n8n_hooks.webhook import WebhookError, open_response
+
+if TYPE_CHECKING:
+    from n8n_hooks.directory import SlackDirectory
 
 HOOK_NAME = "slack"
 
@@ -30,15 +41,21 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
     sub = p.add_subparsers(dest="op", required=True)
 
     s = sub.add_parser("search", help="Search messages")
-    s.add_argument("query", help="Slack search query, e.g. 'in:#dev foo'")
+    s.add_argument(
+        "query",
+        help="Slack search query, e.g. 'in:#dev from:@alice foo' (names are "
+        "resolved to IDs)",
+    )
     s.add_argument("-n", "--limit", type=int, default=20)
 
     h = sub.add_parser("history", help="Channel history")
-    h.add_argument("channel", help="Channel ID, e.g. C0123456789")
+    h.add_argument(
+        "channel", help="Channel ID (C0123456789), #channel, or @user for a DM"
+    )
     h.add_argument("-n", "--limit", type=int, default=50)
 
     r = sub.add_parser("replies", help="Thread replies")
-    r.add_argument("channel", help="Channel ID")
+    r.add_argument("channel", help="Channel ID, #channel, or @user for a DM")
     r.add_argument("thread_ts", help="Parent message ts, e.g. 1712345678.123456")
     r.add_argument("-n", "--limit", type=int, default=50)
 
@@ -76,21 +93,107 @@ def build_payload(args: argparse.Namespace) -> dict[str, object]:
     return payload
 
 
+# Search modifiers whose #channel / @user operand is resolved to an ID.
+_QUERY_NAME = re.compile(r"(?<!\S)(in|from|to|with):([#@])([^\s<>]+)")
+
+
+def _resolve_one(
+    directory: SlackDirectory, kind: str, name: str, wait: bool = False
+) -> str | None:
+    ids = directory.resolve(kind, name, wait)
+    if len(ids) > 1:
+        raise ValueError(f"ambiguous Slack name {name!r}: {', '.join(ids)}")
+    return ids[0] if ids else None
+
+
+def _resolve_channel(directory: SlackDirectory, arg: str) -> str:
+    """Map ``#channel`` or ``@user`` (their DM) to a channel ID.
+
+    Slack does not take names here, so a directory table that was never
+    filled is fetched first; names it does not know are passed through.
+    """
+    if arg[:1] not in {"#", "@"}:
+        return arg
+    channel: str | None
+    if arg.startswith("#"):
+        channel = _resolve_one(directory, "channels", arg[1:], wait=True)
+    else:
+        user = _resolve_one(directory, "users", arg[1:], wait=True)
+        channel = directory.dm_channel(user, wait=True) if user is not None else None
+    return arg if channel is None else channel
+
+
+def _resolve_query(directory: SlackDirectory, query: str) -> str:
+    """Rewrite ``in:#name`` / ``from:@name`` modifiers to Slack ID mentions.
+
+    Unknown names are left for Slack to interpret.
+    """
+
+    def replace(match: re.Match[str]) -> str:
+        modifier, sigil, name = match.groups()
+        kind = "channels" if sigil == "#" else "users"
+        found = _resolve_one(directory, kind, name)
+        if found is None:
+            return match.group(0)
+        return f"{modifier}:<{sigil}{found}>"
+
+    return _QUERY_NAME.sub(replace, query)
+
+
+def resolve_names(
+    hook: HookConfig, payload: dict[str, object], refresh: bool = False
+) -> dict[str, object]:
+    """Return *payload* with known ``#channel`` / ``@user`` names replaced by IDs.
+
+    Raises ValueError for an ambiguous name, or if a table that has to be
+    fetched first (with *refresh*, or empty for a channel argument) cannot be
+    listed and nothing is cached. Also applied by ``batch`` and
+    ``context``.
+    """
+    channel = payload.get("channel")
+    query = payload.get("query")
+    needs_channel = isinstance(channel, str) and channel[:1] in {"#", "@"}
+    needs_query = isinstance(query, str) and _QUERY_NAME.search(query) is not None
+    if not needs_channel and not needs_query:
+        return payload
+
+    from n8n_hooks.directory import DirectoryError, SlackDirectory
+
+    directory = SlackDirectory(hook, refresh=refresh)
+    resolved = dict(payload)
+    try:
+        if needs_channel:
+            resolved["channel"] = _resolve_channel(directory, str(channel))
+        if needs_query:
+            resolved["query"] = _resolve_query(directory, str(query))
+    except DirectoryError as exc:
+        raise ValueError(str(exc)) from exc
+    return resolved
+
+
 def _safe_filename(raw: str) -> str:
     name = raw.strip() or "slack-file"
     name = re.sub(r"[/\\\x00-\x1f\x7f]+", "_", name)
     return name or "slack-file"
 
 
-def _write_download(result: dict[str, object], output: str) -> dict[str, object]:
-    if result.get("ok") is not True:
-        return result
+def _target_dir(output: str) -> Path:
+    output_path = Path(output)
+    if output_path.exists() and output_path.is_dir():
+        return output_path
+    return output_path.parent
+
+
+def _open_part_file(directory: Path) -> tuple[Path, BinaryIO]:
+    """Create a hidden partial file next to the final download location."""
+    directory.mkdir(parents=True, exist_ok=True)
+    part = directory / f".slack-download-{uuid.uuid4().hex}.part"
+    fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    return part, os.fdopen(fd, "wb")
 
-    content = result.get("content_base64")
-    if not isinstance(content, str):
-        return {"ok": False, "error": "missing_content_base64", "response": result}
 
-    file_info = result.get("file")
+def _place_download(part: Path, file_info: object, output: str) -> dict[str, object]:
+    """Atomically rename a completed partial file to its final name."""
     if not isinstance(file_info, dict):
         file_info = {}
 
@@ -106,8 +209,7 @@ def _write_download(result: dict[str, object], output: str) -> dict[str, object]
     output_path = Path(output)
     if output_path.exists() and output_path.is_dir():
         output_path = output_path / filename
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_bytes(base64.b64decode(content))
+    os.replace(part, output_path)
 
     return {
         "ok": True,
@@ -117,12 +219,63 @@ def _write_download(result: dict[str, object], output: str) -> dict[str, object]
     }
 
 
+def _stream_download(stream: ByteSource, output: str) -> dict[str, object]:
+    """Parse a file-download response incrementally, decoding to disk.
+
+    ``content_base64`` is decoded chunk by chunk into a partial file beside
+    the destination while every other response field is parsed normally, so
+    memory stays flat regardless of the file size.
+    """
+    result: dict[str, object] = {}
+    has_content = False
+    part, f = _open_part_file(_target_dir(output))
+    try:
+        with f:
+            reader = JsonReader(stream)
+            sink = Base64Sink(f)
+            for key in reader.object_keys():
+                if key == "content_base64" and reader.peek() == '"':
+                    for piece in reader.string_chunks():
+                        sink.write(piece)
+                    sink.close()
+                    has_content = True
+                else:
+                    result[key] = reader.value()
+        if result.get("ok") is not True:
+            return result
+        if not has_content:
+            return {"ok": False, "error": "missing_content_base64", "response": result}
+        return _place_download(part, result.get("file"), output)
+    except ValueError as exc:
+        return {"ok": False, "error": "invalid_response", "detail": str(exc)}
+    finally:
+        part.unlink(missing_ok=True)
+
+
 def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
     if HOOK_NAME not in config:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-    if args.op == "file-download":
-        result = _write_download(result, args.output)
+    if args.op != "file-download":
+        hook = config[HOOK_NAME]
+        try:
+            payload = resolve_names(
+                hook, build_payload(args), refresh=getattr(args, "refresh", False)
+            )
+        except ValueError as exc:
+            print(f"n8n-hooks: {exc}", file=sys.stderr)
+            sys.exit(1)
+        write_response(args, hook, payload, unwrap=False)
+        return
+
+    try:
+        with open_response(config[HOOK_NAME], build_payload(args)) as resp:
+            result = _stream_download(resp, args.output)
+    except WebhookError as exc:
+        print(f"n8n-hooks: {exc}", file=sys.stderr)
+        sys.exit(1)
+    except (OSError, http.client.HTTPException) as exc:
+        print(f"n8n-hooks: download failed: {exc}", file=sys.stderr)
+        sys.exit(1)
     print(json.dumps(result, indent=2))
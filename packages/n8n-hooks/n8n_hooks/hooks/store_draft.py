@@ -5,14 +5,14 @@ from __future__ import annotations
 import argparse
 import base64
 import html
-import json
 import mimetypes
 import sys
 from pathlib import Path
 from typing import Any
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response
+from n8n_hooks.streaming import Base64File
 
 HOOK_NAME = "store-draft"
 
@@ -49,6 +49,12 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         metavar="FILE",
         help="Attach a file (repeatable)",
     )
+    p.add_argument(
+        "--async",
+        dest="spool",
+        action="store_true",
+        help="Spool the request and return at once; see 'n8n-hooks flush'",
+    )
     p.set_defaults(func=run)
 
 
@@ -58,7 +64,7 @@ def _read_body(value: str) -> str:
     return value
 
 
-def _encode_attachment(path_str: str) -> dict[str, str]:
+def _encode_attachment(path_str: str, stream: bool = False) -> dict[str, Any]:
     path = Path(path_str)
     if not path.is_file():
         print(f"n8n-hooks: attachment not found: {path}", file=sys.stderr)
@@ -66,7 +72,11 @@ def _encode_attachment(path_str: str) -> dict[str, str]:
     mime, _ = mimetypes.guess_type(str(path))
     if mime is None:
         mime = "application/octet-stream"
-    content = base64.b64encode(path.read_bytes()).decode("ascii")
+    content: str | Base64File
+    if stream:
+        content = Base64File(path)
+    else:
+        content = base64.b64encode(path.read_bytes()).decode("ascii")
     return {
         "filename": path.name,
         "content_type": mime,
@@ -74,8 +84,14 @@ def _encode_attachment(path_str: str) -> dict[str, str]:
     }
 
 
-def build_payload(args: argparse.Namespace) -> dict[str, Any]:
-    """Build the JSON payload from parsed CLI args."""
+def build_payload(
+    args: argparse.Namespace, stream_attachments: bool = False
+) -> dict[str, Any]:
+    """Build the JSON payload from parsed CLI args.
+
+    With *stream_attachments*, attachment data is left as Base64File values
+    that webhook.post encodes while sending, keeping memory flat.
+    """
     body_plain = _read_body(args.body_plain)
 
     payload: dict[str, Any] = {
@@ -99,7 +115,9 @@ def build_payload(args: argparse.Namespace) -> dict[str, Any]:
             payload[key] = val
 
     if args.attach:
-        payload["attachments"] = [_encode_attachment(a) for a in args.attach]
+        payload["attachments"] = [
+            _encode_attachment(a, stream=stream_attachments) for a in args.attach
+        ]
 
     return payload
 
@@ -112,6 +130,11 @@ def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
         )
         sys.exit(1)
 
-    payload = build_payload(args)
-    result = post(config[HOOK_NAME], payload)
-    print(json.dumps(result, indent=2))
+    if getattr(args, "spool", False):
+        from n8n_hooks.spool import spool_request
+
+        # Spooled attachments are encoded now: the files may be gone by the flush.
+        spool_request(HOOK_NAME, build_payload(args))
+        return
+    payload = build_payload(args, stream_attachments=True)
+    write_response(args, config[HOOK_NAME], payload, unwrap=False)
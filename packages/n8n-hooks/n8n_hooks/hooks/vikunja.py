@@ -8,11 +8,10 @@ credentials.
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.webhook import post
+from n8n_hooks.output import write_response
 
 HOOK_NAME = "vikunja"
 
@@ -90,9 +89,4 @@ def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
-    status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2))
-    if isinstance(status, int) and status >= 400:
-        sys.exit(1)
+    write_response(args, config[HOOK_NAME], build_payload(args))
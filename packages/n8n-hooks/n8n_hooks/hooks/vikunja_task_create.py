@@ -1,4 +1,23 @@
-"""vikunja-task-create hook — template-aware Vikunja task creation requests."""
+"""vikunja-task-create hook — template-aware Vikunja task creation requests.
+
+``--bulk FILE`` reads one JSON task record per line instead of a single task:
+
+    {"title": "Reply to Ann", "context": {"summary": "...", "checklist": [...]}}
+    {"title": "Book room", "project": "Ops", "template": "errand", "due": "..."}
+
+Records take the option names as keys (``reminders`` and ``relations`` as
+lists) and fall back to the command-line options for keys they omit; a
+record's ``context`` is the context object itself. Every record is validated
+before anything is sent, and all errors are reported together. Valid tasks
+are posted ``--bulk-size`` at a time as ``create_tasks_from_template``
+requests, and the per-task results are printed as JSONL tagged with the
+record's line index:
+
+    {"index": 0, "ok": true, "result": {"id": 987, ...}}
+
+With ``--async``, single tasks and valid bulk records are spooled instead
+(see :mod:`n8n_hooks.spool`).
+"""
 
 from __future__ import annotations
 
@@ -10,15 +29,35 @@ from pathlib import Path
 from typing import Any, NoReturn, cast
 
 from n8n_hooks.config import HookConfig
+from n8n_hooks.output import write_response
 from n8n_hooks.templates import (
     TemplateError,
+    TemplateSpec,
     load_template,
     missing_required,
     validate_context,
 )
-from n8n_hooks.webhook import post
 
 HOOK_NAME = "vikunja-task-create"
+BULK_OPERATION = "create_tasks_from_template"
+
+# Options a --bulk record may set, each under its own name.
+_RECORD_KEYS = frozenset(
+    {
+        "project",
+        "title",
+        "template",
+        "context",
+        "due",
+        "start",
+        "end",
+        "priority",
+        "color",
+        "reminders",
+        "relations",
+        "allow_missing",
+    }
+)
 
 
 class RelationKind(StrEnum):
@@ -37,16 +76,16 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         help="Submit template-aware Vikunja task creation requests via n8n",
         description="Validate context against Markdown+YAML template schema and submit a typed create request to n8n.",
     )
-    p.add_argument("--project", required=True, help="Target Vikunja project name or id")
-    p.add_argument("--title", required=True, help="Task title")
-    p.add_argument("--template", required=True, help="Template name")
+    # Required unless --bulk records provide them.
+    p.add_argument("--project", help="Target Vikunja project name or id")
+    p.add_argument("--title", help="Task title")
+    p.add_argument("--template", help="Template name")
     p.add_argument(
         "--template-dir",
         help="Template directory (default: $VIKUNJA_TEMPLATE_DIR or XDG data paths)",
     )
     p.add_argument(
         "--context",
-        required=True,
         help="JSON description context file, or '-' for stdin",
     )
     p.add_argument("--due", help="Due timestamp/date")
@@ -74,41 +113,90 @@ def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) ->
         action="store_true",
         help="Allow creation request when required template context fields are missing",
     )
+    p.add_argument(
+        "--bulk",
+        metavar="FILE",
+        help="Create the tasks described by a JSONL file ('-' for stdin); "
+        "the options above become per-record defaults",
+    )
+    p.add_argument(
+        "--async",
+        dest="spool",
+        action="store_true",
+        help="Spool the request and return at once; see 'n8n-hooks flush'",
+    )
+    p.add_argument(
+        "--bulk-size",
+        type=int,
+        default=50,
+        help="Tasks per webhook request with --bulk (default: 50)",
+    )
     p.set_defaults(func=run)
 
 
 def build_payload(args: argparse.Namespace) -> dict[str, Any]:
+    if getattr(args, "bulk", None) is not None:
+        _die("--bulk sends several requests; run it on its own")
+    missing = [
+        f"--{name}"
+        for name in ("project", "title", "template", "context")
+        if getattr(args, name) is None
+    ]
+    if missing:
+        _die("missing required options: " + ", ".join(missing))
     context = _read_context(args.context)
     template = _load_template(args.template, args.template_dir)
+    options = {key: getattr(args, key, None) for key in _RECORD_KEYS}
+    try:
+        return _task_payload({**options, "context": context}, template)
+    except (TypeError, ValueError) as exc:
+        _die(str(exc))
+
+
+def _task_payload(options: dict[str, Any], template: TemplateSpec) -> dict[str, Any]:
+    """Validate one task's *options* against *template*.
+
+    Raises TypeError for values of the wrong JSON type, ValueError otherwise.
+    """
+    context = options["context"]
+    if not isinstance(context, dict):
+        raise TypeError("context must be a JSON object")
     missing = missing_required(template, context)
-    if missing and not args.allow_missing:
-        _die("template missing required fields: " + ", ".join(missing))
+    if missing and not options.get("allow_missing"):
+        raise ValueError("template missing required fields: " + ", ".join(missing))
     if not missing:
         errors = validate_context(template, context)
         if errors:
-            _die("template context failed validation: " + "; ".join(errors))
+            raise ValueError("template context failed validation: " + "; ".join(errors))
 
     payload: dict[str, Any] = {
         "operation": "create_task_from_template",
-        "project": _required_text("project", args.project),
-        "title": _required_text("title", args.title),
+        "project": _required_text("project", options["project"]),
+        "title": _required_text("title", options["title"]),
         "template": template.name,
         "template_defaults": template.defaults,
         "template_schema": template.schema,
         "attachment_expectations": template.attachment_expectations,
         "context": context,
-        "relations": [_parse_relation(value) for value in args.relations],
+        "relations": [
+            _parse_relation(value)
+            for value in _text_list("relations", options.get("relations"))
+        ],
     }
     for key in ("due", "start", "end", "color"):
-        value = getattr(args, key, None)
+        value = options.get(key)
         if value is not None:
             payload[key] = value
-    if args.priority is not None:
-        if args.priority < 0 or args.priority > 5:
-            _die("priority must be an integer from 0 to 5")
-        payload["priority"] = args.priority
-    if args.reminders:
-        payload["reminders"] = args.reminders
+    priority = options.get("priority")
+    if priority is not None:
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise ValueError("priority must be an integer from 0 to 5")
+        if priority < 0 or priority > 5:
+            raise ValueError("priority must be an integer from 0 to 5")
+        payload["priority"] = priority
+    reminders = _text_list("reminders", options.get("reminders"))
+    if reminders:
+        payload["reminders"] = reminders
     return payload
 
 
@@ -117,12 +205,143 @@ def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
         print(f"n8n-hooks: no '{HOOK_NAME}' section in config", file=sys.stderr)
         sys.exit(1)
 
-    result = post(config[HOOK_NAME], build_payload(args))
+    if getattr(args, "bulk", None) is not None:
+        _run_bulk(args, config[HOOK_NAME])
+        return
+    payload = build_payload(args)
+    if getattr(args, "spool", False):
+        from n8n_hooks.spool import spool_request
+
+        spool_request(HOOK_NAME, payload)
+        return
+    write_response(args, config[HOOK_NAME], payload, ensure_ascii=False)
+
+
+def _run_bulk(args: argparse.Namespace, hook: HookConfig) -> None:
+    if args.bulk_size < 1:
+        _die("--bulk-size must be at least 1")
+    if args.bulk == "-" and getattr(args, "context", None) == "-":
+        _die("--bulk - and --context - cannot both read stdin")
+    tasks = _bulk_tasks(args)
+    if getattr(args, "spool", False):
+        import sqlite3
+
+        from n8n_hooks.spool import Spool
+
+        try:
+            spool = Spool()
+            for index, task in tasks:
+                job_id, _ = spool.enqueue(HOOK_NAME, task)
+                print(json.dumps({"index": index, "ok": True, "spooled": job_id}))
+        except sqlite3.Error as exc:
+            _die(f"could not spool request: {exc}")
+        return
+    failed = False
+    for start in range(0, len(tasks), args.bulk_size):
+        for record in create_tasks(hook, tasks[start : start + args.bulk_size]):
+            failed = failed or not record["ok"]
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+    if failed:
+        sys.exit(1)
+
+
+def _bulk_tasks(args: argparse.Namespace) -> list[tuple[int, dict[str, Any]]]:
+    """Validate every --bulk record; exit listing all errors if any is invalid."""
+    try:
+        if args.bulk == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = Path(args.bulk).read_text().splitlines()
+    except OSError as exc:
+        _die(f"could not read --bulk file: {exc}")
+
+    defaults = {key: getattr(args, key, None) for key in _RECORD_KEYS}
+    if defaults["context"] is not None:
+        defaults["context"] = _read_context(defaults["context"])
+    templates: dict[str, TemplateSpec] = {}
+    tasks: list[tuple[int, dict[str, Any]]] = []
+    errors: list[str] = []
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            options = {**defaults, **_bulk_record(line)}
+            name = options["template"]
+            if not isinstance(name, str):
+                raise TypeError("missing template")
+            if name not in templates:
+                templates[name] = load_template(name, template_dir=args.template_dir)
+            tasks.append((index, _task_payload(options, templates[name])))
+        except (TypeError, ValueError) as exc:
+            errors.append(f"record {index}: {exc}")
+    if errors:
+        for error in errors:
+            print(f"n8n-hooks: {error}", file=sys.stderr)
+        sys.exit(1)
+    if not tasks:
+        _die("no task records in --bulk input")
+    return tasks
+
+
+def _bulk_record(line: str) -> dict[str, Any]:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"not valid JSON: {exc}") from None
+    if not isinstance(record, dict):
+        raise TypeError("must be a JSON object")
+    unknown = sorted(set(record) - _RECORD_KEYS)
+    if unknown:
+        raise ValueError("unknown keys: " + ", ".join(unknown))
+    return record
+
+
+def create_tasks(
+    hook: HookConfig, tasks: list[tuple[int, dict[str, Any]]]
+) -> list[dict[str, Any]]:
+    """Post *tasks* in one request; return a result record per task."""
+    from n8n_hooks.webhook import WebhookError, call
+
+    payload = {"operation": BULK_OPERATION, "tasks": [task for _, task in tasks]}
+    try:
+        result = call(hook, payload)
+    except WebhookError as exc:
+        return [{"index": index, "ok": False, "error": str(exc)} for index, _ in tasks]
+
     status = result.get("status")
-    body = result.get("body", result)
-    print(json.dumps(body, indent=2, ensure_ascii=False))
+    items = _bulk_results(result)
     if isinstance(status, int) and status >= 400:
-        sys.exit(1)
+        # The workflow rejected the whole request, like a single task's 4xx/5xx.
+        error = f"webhook answered with status {status}"
+        return [
+            {"index": index, "ok": False, "error": error, "result": result}
+            for index, _ in tasks
+        ]
+    if items is None or len(items) != len(tasks):
+        error = "unexpected response: expected one result per task"
+        return [{"index": index, "ok": False, "error": error} for index, _ in tasks]
+    return [
+        {"index": index, "ok": _item_ok(item), "result": item}
+        for (index, _), item in zip(tasks, items, strict=True)
+    ]
+
+
+def _bulk_results(result: Any) -> list[Any] | None:
+    """Find the per-task result list, unwrapping n8n's ``{"status", "body"}``."""
+    if isinstance(result, dict) and "body" in result:
+        result = result["body"]
+    if isinstance(result, dict):
+        result = result.get("results")
+    return result if isinstance(result, list) else None
+
+
+def _item_ok(item: Any) -> bool:
+    if not isinstance(item, dict):
+        return False
+    status = item.get("status")
+    if isinstance(status, int) and status >= 400:
+        return False
+    return item.get("ok") is not False and "error" not in item
 
 
 def _load_template(name: str, template_dir: str | None) -> Any:
@@ -151,24 +370,38 @@ def _read_context(path: str) -> dict[str, Any]:
 def _parse_relation(value: str) -> dict[str, str]:
     kind, sep, other = value.partition(":")
     if not sep or not kind or not other:
-        _die(f"invalid relation {value!r}; expected KIND:NUMERIC_TASK_ID")
+        raise ValueError(f"invalid relation {value!r}; expected KIND:NUMERIC_TASK_ID")
     try:
         relation_kind = RelationKind(kind)
     except ValueError:
         allowed = ", ".join(item.value for item in RelationKind)
-        _die(f"invalid relation kind {kind!r}; expected one of: {allowed}")
+        raise ValueError(
+            f"invalid relation kind {kind!r}; expected one of: {allowed}"
+        ) from None
     if not other.isdigit():
-        _die(f"invalid relation target {other!r}; expected numeric task id")
+        raise ValueError(f"invalid relation target {other!r}; expected numeric task id")
     return {"kind": relation_kind.value, "other": other}
 
 
-def _required_text(name: str, value: str) -> str:
+def _required_text(name: str, value: Any) -> str:
+    if value is None:
+        raise ValueError(f"missing {name}")
+    if not isinstance(value, str):
+        raise TypeError(f"{name} must be a string")
     text = value.strip()
     if not text:
-        _die(f"{name} must not be empty")
+        raise ValueError(f"{name} must not be empty")
     return text
 
 
+def _text_list(name: str, value: Any) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{name} must be a list of strings")
+    return value
+
+
 def _die(message: str) -> NoReturn:
     print(f"n8n-hooks: {message}", file=sys.stderr)
     sys.exit(1)
@@ -0,0 +1,36 @@
+"""list-templates subcommand — list Vikunja task templates.
+
+Prints the name, description and path of every valid template under
+``--template-dir`` or the default template directories, from the index
+maintained by :func:`n8n_hooks.templates.list_templates`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from n8n_hooks.config import HookConfig
+from n8n_hooks.templates import list_templates
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "list-templates",
+        help="List Vikunja task templates available to vikunja-task-create",
+        description="List valid Markdown+YAML task templates and their descriptions.",
+    )
+    p.add_argument(
+        "--template-dir",
+        help="Template directory (default: $VIKUNJA_TEMPLATE_DIR or XDG data paths)",
+    )
+    p.set_defaults(func=run)
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    templates = list_templates(args.template_dir)
+    body = [
+        {"name": t.name, "description": t.description, "path": str(t.path)}
+        for t in templates
+    ]
+    print(json.dumps(body, indent=2, ensure_ascii=False))
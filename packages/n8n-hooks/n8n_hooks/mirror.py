@@ -0,0 +1,326 @@
+"""Local full-text mirror of Linkwarden collections, tags and links.
+
+``n8n-hooks linkwarden sync`` copies link metadata into
+``$XDG_CACHE_HOME/n8n-hooks/linkwarden.sqlite`` with an FTS5 index over name,
+description, URL, tags and collection, so ``search-links --local`` answers
+without a round trip through n8n and Linkwarden.
+
+Links are paged newest first through the workflow's ``list-links`` operation,
+which wraps Linkwarden's cursor-paged link search::
+
+    request:  {"operation": "list-links", "cursor": <cursor>}  # no cursor: first page
+    response: {"links": [...], "nextCursor": <cursor> | null}  # null: last page
+
+A sync stops at the first page that contains the newest link mirrored so far,
+so only new links are fetched. Edits to older links and deletions are picked
+up by ``sync --full``, which walks every page and drops links no longer
+listed. Collections and tags are small and always refetched whole.
+
+A workflow without ``list-links`` fails the sync with UnsupportedError and the
+mirror is never filled, so ``search-links --local`` keeps searching via n8n.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from n8n_hooks.config import HookConfig
+
+# Local searches fall back to the webhook once the last sync is this old.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+# Safety stop for a misbehaving cursor.
+MAX_PAGES = 10_000
+
+# Column weights for bm25 ranking: name, description, url, tags, collection.
+_WEIGHTS = (10.0, 2.0, 4.0, 6.0, 3.0)
+
+_NO_CURSOR = object()
+
+
+class UnsupportedError(ValueError):
+    """The workflow does not implement the ``list-links`` contract."""
+
+
+def default_path() -> Path:
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache / "n8n-hooks" / "linkwarden.sqlite"
+
+
+def max_age() -> float:
+    try:
+        return float(os.environ["N8N_HOOKS_LINKWARDEN_MIRROR_MAX_AGE"])
+    except (KeyError, ValueError):
+        return DEFAULT_MAX_AGE
+
+
+def _unwrap(result: Any) -> Any:
+    """Strip n8n's ``{"status", "body"}`` and Linkwarden's ``data``/``response``."""
+    while isinstance(result, dict):
+        for key in ("body", "data", "response"):
+            if key in result:
+                result = result[key]
+                break
+        else:
+            return result
+    return result
+
+
+def _items(result: Any, key: str) -> list[dict[str, Any]]:
+    value = _unwrap(result)
+    if isinstance(value, dict):
+        value = value.get(key)
+    if not isinstance(value, list):
+        # A response of the wrong shape is bad data, not a caller's type error.
+        raise ValueError(f"unexpected response: no {key} list")  # noqa: TRY004
+    return [item for item in value if isinstance(item, dict)]
+
+
+def _next_cursor(result: Any) -> Any:
+    """Return the response's next-page cursor, or _NO_CURSOR if it has none."""
+    while isinstance(result, dict):
+        for key in ("nextCursor", "next_cursor"):
+            if key in result:
+                return result[key]
+        result = next(
+            (result[k] for k in ("body", "data", "response") if k in result), None
+        )
+    return _NO_CURSOR
+
+
+def _name(value: Any) -> str:
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value if isinstance(value, str) else ""
+
+
+def filter_links(
+    result: Any, tags: list[str], collection: str | None
+) -> list[dict[str, Any]]:
+    """Apply ``search-links --local`` filters to a webhook search response."""
+    wanted = {tag.lower() for tag in tags}
+    matches = []
+    for link in _items(result, "links"):
+        names = {_name(tag).lower() for tag in link.get("tags") or []}
+        if not wanted <= names:
+            continue
+        if collection is not None and (
+            _name(link.get("collection")).lower() != collection.lower()
+        ):
+            continue
+        matches.append(link)
+    return matches
+
+
+def fts_query(text: str) -> str:
+    """Quote every word of *text* so FTS5 syntax characters match literally."""
+    words = text.split()
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+class LinkwardenMirror:
+    """SQLite mirror of one Linkwarden instance, read through the webhook."""
+
+    def __init__(self, hook: HookConfig, path: Path | None = None) -> None:
+        # Sync pages must be live, never answers from the response cache.
+        self.hook = dataclasses.replace(hook, cache=None)
+        self.path = path or default_path()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            db.executescript(
+                "CREATE TABLE IF NOT EXISTS links ("
+                " id INTEGER PRIMARY KEY, data TEXT, collection TEXT, seen REAL);"
+                "CREATE TABLE IF NOT EXISTS link_tags ("
+                " link_id INTEGER, tag TEXT, PRIMARY KEY (link_id, tag));"
+                "CREATE INDEX IF NOT EXISTS link_tags_tag ON link_tags (tag);"
+                "CREATE VIRTUAL TABLE IF NOT EXISTS links_fts USING fts5("
+                " name, description, url, tags, collection, tokenize='unicode61');"
+                "CREATE TABLE IF NOT EXISTS collections (id INTEGER PRIMARY KEY, data TEXT);"
+                "CREATE TABLE IF NOT EXISTS tags (id INTEGER PRIMARY KEY, data TEXT);"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL);"
+            )
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def synced_at(self) -> float | None:
+        """When the last sync finished, or None if there never was one."""
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'synced'").fetchone()
+        return None if row is None else float(row[0])
+
+    def is_fresh(self, max_age: float) -> bool:
+        synced = self.synced_at()
+        return synced is not None and time.time() - synced < max_age
+
+    def _fetch(self, payload: dict[str, Any]) -> Any:
+        from n8n_hooks.webhook import call
+
+        result = call(self.hook, payload)
+        # n8n reports upstream failures as {"status": ..., "body": ...}.
+        status = result.get("status") if isinstance(result, dict) else None
+        if isinstance(status, int) and status >= 400:
+            raise ValueError(f"{payload['operation']} answered HTTP {status}")
+        return result
+
+    def sync(self, full: bool = False) -> dict[str, Any]:
+        """Mirror new links (every link with *full*); return counts.
+
+        Raises WebhookError or ValueError if the webhook fails or answers with
+        an unexpected shape, and UnsupportedError (a ValueError) if it has no
+        ``list-links`` operation; nothing is committed in any of these cases.
+        """
+        collections = _items(
+            self._fetch({"operation": "list-collections"}), "collections"
+        )
+        tags = _items(self._fetch({"operation": "list-tags"}), "tags")
+        with self._connect() as db:
+            newest = (
+                None if full else db.execute("SELECT MAX(id) FROM links").fetchone()[0]
+            )
+        links = list(self._new_links(newest))
+
+        now = time.time()
+        with self._connect() as db:
+            db.execute("DELETE FROM collections")
+            db.executemany(
+                "INSERT OR REPLACE INTO collections VALUES (?, ?)",
+                [(c.get("id"), json.dumps(c)) for c in collections],
+            )
+            db.execute("DELETE FROM tags")
+            db.executemany(
+                "INSERT OR REPLACE INTO tags VALUES (?, ?)",
+                [(t.get("id"), json.dumps(t)) for t in tags],
+            )
+            for link in links:
+                self._store(db, link, now)
+            removed = 0
+            if full:
+                stale = [
+                    row[0]
+                    for row in db.execute("SELECT id FROM links WHERE seen < ?", (now,))
+                ]
+                for link_id in stale:
+                    self._delete(db, link_id)
+                removed = len(stale)
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('synced', ?)", (now,))
+            (total,) = db.execute("SELECT COUNT(*) FROM links").fetchone()
+        return {
+            "collections": len(collections),
+            "tags": len(tags),
+            "links_fetched": len(links),
+            "links_removed": removed,
+            "links_total": total,
+            "full": full,
+        }
+
+    def _new_links(self, newest: int | None) -> Iterator[dict[str, Any]]:
+        """Yield links newest first, stopping after the page reaching *newest*.
+
+        Raises UnsupportedError if a page does not follow the ``list-links``
+        contract in the module docstring.
+        """
+        cursor: Any = None
+        for _ in range(MAX_PAGES):
+            payload: dict[str, Any] = {"operation": "list-links"}
+            if cursor is not None:
+                payload["cursor"] = cursor
+            try:
+                result = self._fetch(payload)
+                page = _items(result, "links")
+            except ValueError as exc:
+                raise UnsupportedError(f"list-links: {exc}") from exc
+            following = _next_cursor(result)
+            if following is _NO_CURSOR:
+                raise UnsupportedError("list-links: response has no nextCursor")
+            yield from page
+            ids = [link["id"] for link in page if isinstance(link.get("id"), int)]
+            if not ids or (newest is not None and min(ids) <= newest):
+                return
+            if following is None or following == cursor:
+                return
+            cursor = following
+
+    def _delete(self, db: sqlite3.Connection, link_id: int) -> None:
+        db.execute("DELETE FROM links WHERE id = ?", (link_id,))
+        db.execute("DELETE FROM link_tags WHERE link_id = ?", (link_id,))
+        db.execute("DELETE FROM links_fts WHERE rowid = ?", (link_id,))
+
+    def _store(self, db: sqlite3.Connection, link: dict[str, Any], now: float) -> None:
+        link_id = link.get("id")
+        if not isinstance(link_id, int):
+            return
+        self._delete(db, link_id)
+        tag_names = [_name(tag) for tag in link.get("tags") or []]
+        tag_names = [name for name in tag_names if name]
+        collection = _name(link.get("collection"))
+        db.execute(
+            "INSERT INTO links VALUES (?, ?, ?, ?)",
+            (link_id, json.dumps(link), collection.lower(), now),
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO link_tags VALUES (?, ?)",
+            [(link_id, name.lower()) for name in tag_names],
+        )
+        db.execute(
+            "INSERT INTO links_fts (rowid, name, description, url, tags, collection)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                link_id,
+                link.get("name") or "",
+                link.get("description") or "",
+                link.get("url") or "",
+                " ".join(tag_names),
+                collection,
+            ),
+        )
+
+    def search(
+        self,
+        query: str,
+        tags: list[str] | None = None,
+        collection: str | None = None,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Return mirrored links matching *query*, best ranked first.
+
+        Every word must match (in any indexed field); *tags* and *collection*
+        filter exactly, case-insensitively. An exact URL match ranks first.
+        """
+        sql = ["SELECT links.data FROM links"]
+        params: list[Any] = []
+        where: list[str] = []
+        order = "links.id DESC"
+        match = fts_query(query)
+        if match:
+            sql.append("JOIN links_fts ON links_fts.rowid = links.id")
+            where.append("links_fts MATCH ?")
+            params.append(match)
+            weights = ", ".join(str(w) for w in _WEIGHTS)
+            order = f"json_extract(links.data, '$.url') = ? DESC, bm25(links_fts, {weights})"
+        for tag in tags or []:
+            where.append("links.id IN (SELECT link_id FROM link_tags WHERE tag = ?)")
+            params.append(tag.lower())
+        if collection is not None:
+            where.append("links.collection = ?")
+            params.append(collection.lower())
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append(f"ORDER BY {order} LIMIT ?")
+        if match:
+            params.append(query.strip())
+        params.append(limit)
+        with self._connect() as db:
+            return [json.loads(row[0]) for row in db.execute(" ".join(sql), params)]
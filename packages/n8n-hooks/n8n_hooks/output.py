@@ -0,0 +1,249 @@
+"""How hooks print webhook responses: ``--output`` and ``--fields``.
+
+``json`` (the default) pretty-prints the response body. ``ndjson`` prints one
+*record* per line as the response streams in: the elements of the body when
+it is an array, else those of the body's first array member (``messages``,
+``entries`` ...). The body's other members are dropped; a body without an
+array is printed as a single line.
+
+``--fields id,title,channel.name`` keeps only the named keys of every record;
+dotted paths reach into nested objects and through arrays of them. Without
+either option the response is parsed and printed whole as before. With one,
+it is parsed incrementally with :class:`~n8n_hooks.streaming.JsonReader`:
+dropped keys are skipped without being materialised and records are printed
+(or collected, projected, for ``json``) one at a time. Such responses are
+served from the response cache but not stored in it.
+
+The CLI imports this module to build its parser, so the transport is only
+imported once a response is actually written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from n8n_hooks.config import HookConfig
+
+if TYPE_CHECKING:
+    from n8n_hooks.streaming import JsonReader
+
+FORMATS = ("json", "ndjson")
+
+# Nested key selection: None keeps a value whole.
+Fields = dict[str, Any]
+
+
+def parse_fields(spec: str) -> Fields:
+    """Parse ``a,b.c`` into ``{"a": None, "b": {"c": None}}``."""
+    tree: Fields = {}
+    for path in spec.split(","):
+        parts = [part.strip() for part in path.split(".")]
+        if not all(parts):
+            raise argparse.ArgumentTypeError(f"invalid field: {path.strip()!r}")
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                # A shorter path already keeps the whole value.
+                break
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(value: Any, fields: Fields | None) -> Any:
+    """Drop every key of *value* not selected by *fields*."""
+    if fields is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {k: project(v, fields[k]) for k, v in value.items() if k in fields}
+    return value
+
+
+def read_projected(reader: JsonReader, fields: Fields | None) -> Any:
+    """Parse the next value from *reader*, skipping keys *fields* drops."""
+    if fields is None:
+        return reader.value()
+    char = reader.peek()
+    if char == "[":
+        return [read_projected(reader, fields) for _ in reader.array_items()]
+    if char == "{":
+        out: dict[str, Any] = {}
+        for key in reader.object_keys():
+            if key in fields:
+                out[key] = read_projected(reader, fields[key])
+            else:
+                reader.skip()
+        return out
+    return reader.value()
+
+
+class _Walker:
+    """Passes the records of one response to *emit* as they are parsed."""
+
+    def __init__(
+        self,
+        reader: JsonReader,
+        fields: Fields | None,
+        emit: Callable[[Any], None],
+    ) -> None:
+        self.reader = reader
+        self.fields = fields
+        self.emit = emit
+        self.streamed = False
+
+    def _records(self) -> None:
+        self.streamed = True
+        for _ in self.reader.array_items():
+            self.emit(read_projected(self.reader, self.fields))
+
+    def body(self, envelope: bool) -> tuple[Any, str | None, Any]:
+        """Consume a body; return (what is left of it, record key, status).
+
+        With *envelope*, a ``body`` member is walked in place of the object
+        holding it, mirroring ``result.get("body", result)``.
+        """
+        reader = self.reader
+        char = reader.peek()
+        if char == "[" and not self.streamed:
+            self._records()
+            return None, None, None
+        if char != "{":
+            return reader.value(), None, None
+        rest: dict[str, Any] = {}
+        key = None
+        inner = None
+        for name in reader.object_keys():
+            if envelope and name == "body":
+                inner = self.body(envelope=False)
+            elif not self.streamed and reader.peek() == "[":
+                rest[name] = None
+                key = name
+                self._records()
+            else:
+                rest[name] = reader.value()
+        status = rest.get("status") if envelope else None
+        if inner is not None:
+            return inner[0], inner[1], status
+        return rest, key, status
+
+
+def _write(
+    reader: JsonReader,
+    fmt: str,
+    fields: Fields | None,
+    unwrap: bool,
+    ensure_ascii: bool,
+) -> Any:
+    """Print the response read from *reader*; return its status, if any."""
+    from n8n_hooks.streaming import JsonStreamError
+
+    records: list[Any] = []
+
+    def emit(record: Any) -> None:
+        if fmt == "ndjson":
+            print(json.dumps(record, ensure_ascii=ensure_ascii), flush=True)
+        else:
+            records.append(record)
+
+    walker = _Walker(reader, fields, emit)
+    rest, key, status = walker.body(envelope=unwrap)
+    if not reader.at_end():
+        raise JsonStreamError("unexpected data after JSON document")
+    if fmt == "ndjson":
+        if not walker.streamed:
+            print(json.dumps(project(rest, fields), ensure_ascii=ensure_ascii))
+        return status
+    if not walker.streamed:
+        body = project(rest, fields)
+    elif key is None:
+        body = records
+    else:
+        rest[key] = records
+        body = rest
+    print(json.dumps(body, indent=2, ensure_ascii=ensure_ascii))
+    return status
+
+
+def write_response(
+    args: argparse.Namespace,
+    hook: HookConfig,
+    payload: dict[str, Any],
+    *,
+    unwrap: bool = True,
+    ensure_ascii: bool = True,
+) -> None:
+    """POST *payload* and print the response as ``--output``/``--fields`` ask.
+
+    With *unwrap*, an n8n ``{"status", "body"}`` envelope is printed as its
+    body and a status of 400 or above exits 1 after printing.
+    """
+    from n8n_hooks.webhook import post
+
+    fmt = getattr(args, "format", "json")
+    fields = getattr(args, "fields", None)
+    if fmt == "json" and fields is None:
+        result = post(hook, payload)
+        status = result.get("status") if unwrap else None
+        body = result.get("body", result) if unwrap else result
+        print(json.dumps(body, indent=2, ensure_ascii=ensure_ascii))
+    else:
+        status = _stream(hook, payload, fmt, fields, unwrap, ensure_ascii)
+    if isinstance(status, int) and status >= 400:
+        sys.exit(1)
+
+
+def write_value(
+    args: argparse.Namespace, value: Any, *, ensure_ascii: bool = True
+) -> None:
+    """Print an already parsed body as ``--output``/``--fields`` ask."""
+    fmt = getattr(args, "format", "json")
+    fields = getattr(args, "fields", None)
+    if fmt == "json" and fields is None:
+        print(json.dumps(value, indent=2, ensure_ascii=ensure_ascii))
+        return
+    import io
+
+    from n8n_hooks.streaming import JsonReader
+
+    reader = JsonReader(io.BytesIO(json.dumps(value).encode()))
+    _write(reader, fmt, fields, False, ensure_ascii)
+
+
+def _stream(
+    hook: HookConfig,
+    payload: dict[str, Any],
+    fmt: str,
+    fields: Fields | None,
+    unwrap: bool,
+    ensure_ascii: bool,
+) -> Any:
+    import http.client
+    import io
+
+    from n8n_hooks.streaming import JsonReader, JsonStreamError
+    from n8n_hooks.webhook import WebhookError, open_response
+
+    cached = (
+        hook.cache.get(hook.name, hook.url, payload) if hook.cache is not None else None
+    )
+    try:
+        if cached is not None:
+            reader = JsonReader(io.BytesIO(json.dumps(cached).encode()))
+            return _write(reader, fmt, fields, unwrap, ensure_ascii)
+        with open_response(hook, payload) as resp:
+            return _write(JsonReader(resp), fmt, fields, unwrap, ensure_ascii)
+    except WebhookError as exc:
+        print(f"n8n-hooks: {exc}", file=sys.stderr)
+    except (OSError, http.client.HTTPException) as exc:
+        print(f"n8n-hooks: connection error: {exc}", file=sys.stderr)
+    except JsonStreamError as exc:
+        print(f"n8n-hooks: invalid JSON response: {exc}", file=sys.stderr)
+    sys.exit(1)
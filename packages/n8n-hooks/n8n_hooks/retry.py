@@ -0,0 +1,219 @@
+"""Retries with jittered backoff and a per-webhook circuit breaker.
+
+Configured in the config file, top-level or per hook:
+
+    {
+      "retry": {"attempts": 3, "base_delay": 0.5, "max_delay": 8},
+      "circuit_breaker": {"threshold": 5, "cooldown": 30},
+      "hooks": {...}
+    }
+
+Only read-only hooks are retried, since repeating a write could apply it
+twice. A request is retried after a connection error or an HTTP 429, 502, 503
+or 504, waiting a random time between zero and ``base_delay`` doubled per
+attempt, capped at ``max_delay`` ("full jitter", so clients recovering from the
+same outage do not retry in lockstep). A ``Retry-After`` header on a 429 or
+503 replaces that delay; if it asks for more than ``max_delay``, the request
+fails at once. ``"retry": false`` disables retries.
+
+The circuit breaker covers every hook, write hooks included, and tracks
+each webhook URL on its own. After ``threshold`` consecutive attempts against
+one webhook fail with a connection error or a 502/503/504, requests to that
+webhook fail at once for ``cooldown`` seconds. After that, one request goes
+through, and the outcome either closes the breaker or reopens it. Since hooks
+have webhooks of their own, a flaky read hook never makes a write hook fail
+fast. The state is kept in ``$XDG_RUNTIME_DIR/n8n-hooks/circuit.json`` and
+updated under ``flock``, so separate invocations share it (in memory only when
+``$XDG_RUNTIME_DIR`` is unset). ``"circuit_breaker": false`` disables it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Statuses worth retrying, and those meaning the host itself is down.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+DOWN_STATUSES = frozenset({502, 503, 504})
+# Statuses whose Retry-After header is honoured.
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+DEFAULT_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    # Tries per request, the first one included.
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Seconds to wait after failed try *attempt* (from 1), or None to give up."""
+        if attempt >= self.attempts:
+            return None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds asked for by a ``Retry-After`` header (delay or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # Imported here: most invocations never see a Retry-After date.
+    import email.utils
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def endpoint_key(url: str) -> str:
+    """The ``scheme://host:port/path`` a breaker tracks requests to *url* under."""
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path}"
+
+
+def default_path() -> Path | None:
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    return Path(runtime) / "n8n-hooks" / "circuit.json" if runtime else None
+
+
+class CircuitBreaker:
+    """Consecutive-failure counts per webhook, shared through a state file."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        threshold: int = DEFAULT_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+    ) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._state: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _update(self) -> Iterator[dict[str, Any]]:
+        """Yield the state to change in place; changes are saved on exit.
+
+        The state file stays locked in between, so concurrent invocations
+        never drop each other's counts.
+        """
+        with self._lock:
+            if self.path is None:
+                yield self._state
+                return
+            try:
+                self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+                f = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), "r+")
+            except OSError:
+                yield {}
+                return
+            with f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                if not isinstance(state, dict):
+                    state = {}
+                before = json.dumps(state)
+                yield state
+                after = json.dumps(state)
+                if after != before:
+                    with contextlib.suppress(OSError):
+                        f.seek(0)
+                        f.truncate()
+                        f.write(after)
+
+    def remaining(self, endpoint: str) -> float:
+        """Seconds requests to *endpoint* should still fail fast (0: go ahead).
+
+        Once the cooldown is over, the first caller is let through as a probe
+        and the breaker stays open for everyone else until it reports back.
+        """
+        with self._update() as state:
+            entry = state.get(endpoint)
+            if not isinstance(entry, dict):
+                return 0.0
+            until = entry.get("open_until")
+            if not isinstance(until, (int, float)):
+                return 0.0
+            now = time.time()
+            if until > now:
+                return until - now
+            entry["open_until"] = now + self.cooldown
+            return 0.0
+
+    def success(self, endpoint: str) -> None:
+        with self._update() as state:
+            state.pop(endpoint, None)
+
+    def failure(self, endpoint: str) -> None:
+        with self._update() as state:
+            entry = state.get(endpoint)
+            failures = entry.get("failures", 0) if isinstance(entry, dict) else 0
+            failures = failures + 1 if isinstance(failures, int) else 1
+            state[endpoint] = {"failures": failures}
+            if failures >= self.threshold:
+                state[endpoint]["open_until"] = time.time() + self.cooldown
+
+
+def _number(section: dict[str, Any], key: str, default: float) -> float:
+    value = section.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ValueError(f"invalid {key}: {value!r}")
+    return float(value)
+
+
+def policy_from_config(raw: object) -> RetryPolicy | None:
+    """Build the policy described by a ``retry`` section (None: no retries)."""
+    if raw is False:
+        return None
+    section = raw if isinstance(raw, dict) else {}
+    attempts = section.get("attempts", RetryPolicy.attempts)
+    if isinstance(attempts, bool) or not isinstance(attempts, int) or attempts < 1:
+        raise ValueError(f"invalid attempts: {attempts!r}")
+    if attempts == 1:
+        return None
+    return RetryPolicy(
+        attempts=attempts,
+        base_delay=_number(section, "base_delay", RetryPolicy.base_delay),
+        max_delay=_number(section, "max_delay", RetryPolicy.max_delay),
+    )
+
+
+def breaker_from_config(raw: object) -> CircuitBreaker | None:
+    """Build the breaker described by a ``circuit_breaker`` section."""
+    if raw is False:
+        return None
+    section = raw if isinstance(raw, dict) else {}
+    threshold = section.get("threshold", DEFAULT_THRESHOLD)
+    if isinstance(threshold, bool) or not isinstance(threshold, int) or threshold < 1:
+        raise ValueError(f"invalid threshold: {threshold!r}")
+    return CircuitBreaker(
+        default_path(),
+        threshold=threshold,
+        cooldown=_number(section, "cooldown", DEFAULT_COOLDOWN),
+    )
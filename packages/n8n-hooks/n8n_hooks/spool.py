@@ -0,0 +1,293 @@
+"""Durable spool of write-hook requests, sent later by ``flush`` or the daemon.
+
+With ``--async``, ``store-draft``, ``vikunja-task-create`` and
+``linkwarden-link-create`` validate their request as usual, append the payload
+to ``$XDG_STATE_HOME/n8n-hooks/spool.sqlite`` and return at once. Each job's
+payload carries an ``idempotency_key`` that stays the same across retries, so
+the workflow can drop a request it already handled when only the response was
+lost.
+
+:func:`flush` sends due jobs over the shared connection pool, with
+``vikunja-task-create`` jobs grouped into bulk requests. Requests that fail to
+reach n8n are retried with exponential backoff; jobs the workflow rejects, or
+that run out of attempts, are kept as failed for ``spool status`` and
+``spool retry``. Jobs are claimed for :data:`LEASE` seconds while being sent,
+so concurrent flushers never send the same job twice; a job claimed by a
+flusher that crashed is sent again once its lease runs out.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from n8n_hooks.config import HookConfig
+
+# Seconds a claimed job stays invisible to other flushers.
+LEASE = 5 * 60
+# Retry backoff: BACKOFF seconds after the first failure, doubling up to
+# MAX_BACKOFF, until MAX_ATTEMPTS attempts have failed.
+BACKOFF = 30
+MAX_BACKOFF = 60 * 60
+MAX_ATTEMPTS = 12
+# Jobs claimed per round, and vikunja-task-create tasks per bulk request.
+CLAIM_SIZE = 100
+BULK_SIZE = 50
+
+# Set whenever a job is spooled, so the daemon flushes right after the request.
+# The daemon gives each request an event of its own; worker threads share it
+# through their copied context.
+WAKEUP: ContextVar[threading.Event] = ContextVar("WAKEUP", default=threading.Event())  # noqa: B039
+
+
+def register(subparsers: argparse._SubParsersAction[argparse.ArgumentParser]) -> None:
+    p = subparsers.add_parser(
+        "spool",
+        help="Inspect the spool of --async write requests",
+        description="Show or requeue write requests spooled with --async.",
+    )
+    ops = p.add_subparsers(dest="op", required=True)
+    ops.add_parser("status", help="Show queue depth and age per hook")
+    ops.add_parser("retry", help="Requeue failed jobs for the next flush")
+    p.set_defaults(func=run)
+
+
+def default_path() -> Path:
+    state = Path(os.environ.get("XDG_STATE_HOME", Path.home() / ".local" / "state"))
+    return state / "n8n-hooks" / "spool.sqlite"
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    hook: str
+    payload: dict[str, Any]
+    attempts: int
+
+
+class Spool:
+    """SQLite queue of webhook payloads awaiting delivery."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_path()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=FULL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, hook TEXT NOT NULL,"
+                " payload TEXT NOT NULL, created REAL NOT NULL, due REAL NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " failed INTEGER NOT NULL DEFAULT 0, error TEXT)"
+            )
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def enqueue(self, hook: str, payload: dict[str, Any]) -> tuple[int, str]:
+        """Spool *payload* for *hook*; return the job id and idempotency key."""
+        key = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (hook, payload, created, due) VALUES (?, ?, ?, ?)",
+                (hook, json.dumps({**payload, "idempotency_key": key}), now, now),
+            )
+        WAKEUP.get().set()
+        return int(cursor.lastrowid or 0), key
+
+    def claim(self, limit: int = CLAIM_SIZE) -> list[Job]:
+        """Lease up to *limit* due jobs, oldest first."""
+        now = time.time()
+        with self._connect() as db:
+            rows = db.execute(
+                "UPDATE jobs SET due = ? WHERE id IN (SELECT id FROM jobs"
+                " WHERE failed = 0 AND due <= ? ORDER BY id LIMIT ?)"
+                " RETURNING id, hook, payload, attempts",
+                (now + LEASE, now, limit),
+            ).fetchall()
+        return sorted(
+            (Job(row[0], row[1], json.loads(row[2]), row[3]) for row in rows),
+            key=lambda job: job.id,
+        )
+
+    def done(self, job: Job) -> None:
+        with self._connect() as db:
+            db.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+
+    def retry_later(self, job: Job, error: str) -> bool:
+        """Schedule *job* again after a transient failure.
+
+        Returns False, marking the job failed, once it is out of attempts.
+        """
+        attempts = job.attempts + 1
+        if attempts >= MAX_ATTEMPTS:
+            self.fail(job, error)
+            return False
+        delay = min(MAX_BACKOFF, BACKOFF * 2 ** (attempts - 1))
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET attempts = ?, due = ?, error = ? WHERE id = ?",
+                (attempts, time.time() + delay, error, job.id),
+            )
+        return True
+
+    def fail(self, job: Job, error: str) -> None:
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET attempts = ?, failed = 1, error = ? WHERE id = ?",
+                (job.attempts + 1, error, job.id),
+            )
+
+    def expedite(self) -> None:
+        """Make jobs waiting out a retry backoff due now."""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET due = ? WHERE failed = 0 AND attempts > 0",
+                (time.time(),),
+            )
+
+    def requeue_failed(self) -> int:
+        """Move failed jobs back to the queue with fresh attempts."""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET failed = 0, attempts = 0, due = ? WHERE failed = 1",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def status(self) -> dict[str, Any]:
+        """Queue depth and the age of the oldest pending job, overall and per hook."""
+        now = time.time()
+        hooks: dict[str, dict[str, Any]] = {}
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT hook, failed, COUNT(*), MIN(created) FROM jobs"
+                " GROUP BY hook, failed ORDER BY hook"
+            ).fetchall()
+            errors = db.execute(
+                "SELECT id, hook, attempts, error FROM jobs"
+                " WHERE failed = 1 ORDER BY id DESC LIMIT 10"
+            ).fetchall()
+        for hook, failed, count, oldest in rows:
+            entry = hooks.setdefault(
+                hook, {"pending": 0, "failed": 0, "oldest_age": None}
+            )
+            if failed:
+                entry["failed"] = count
+            else:
+                entry["pending"] = count
+                entry["oldest_age"] = round(now - oldest, 1)
+        ages = [h["oldest_age"] for h in hooks.values() if h["oldest_age"] is not None]
+        return {
+            "pending": sum(h["pending"] for h in hooks.values()),
+            "failed": sum(h["failed"] for h in hooks.values()),
+            "oldest_age": max(ages) if ages else None,
+            "hooks": hooks,
+            "recent_failures": [
+                {"id": job_id, "hook": hook, "attempts": attempts, "error": error}
+                for job_id, hook, attempts, error in errors
+            ],
+        }
+
+
+def spool_request(hook: str, payload: dict[str, Any]) -> None:
+    """Spool *payload* for *hook* and print the job reference (``--async``)."""
+    try:
+        job_id, key = Spool().enqueue(hook, payload)
+    except sqlite3.Error as exc:
+        print(f"n8n-hooks: could not spool request: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps({"spooled": True, "id": job_id, "idempotency_key": key}))
+
+
+def flush(
+    spool: Spool, config: dict[str, HookConfig], now: bool = False
+) -> dict[str, int]:
+    """Send every due job; with *now*, also those waiting out a backoff.
+
+    Returns how many jobs were sent, rescheduled and marked failed, and how
+    many remain queued.
+    """
+    if now:
+        spool.expedite()
+    counts = {"sent": 0, "retrying": 0, "failed": 0}
+    while jobs := spool.claim():
+        for job, outcome in _send(jobs, config, spool):
+            counts[outcome] += 1
+    counts["remaining"] = spool.status()["pending"]
+    return counts
+
+
+def _send(
+    jobs: list[Job], config: dict[str, HookConfig], spool: Spool
+) -> Iterator[tuple[Job, str]]:
+    """Deliver *jobs*, recording each outcome in *spool*."""
+    from n8n_hooks.hooks.vikunja_task_create import HOOK_NAME as VIKUNJA
+    from n8n_hooks.hooks.vikunja_task_create import create_tasks
+    from n8n_hooks.webhook import WebhookError, call
+
+    bulk = [job for job in jobs if job.hook == VIKUNJA and VIKUNJA in config]
+    for start in range(0, len(bulk), BULK_SIZE):
+        chunk = {job.id: job for job in bulk[start : start + BULK_SIZE]}
+        tasks = [(job.id, job.payload) for job in chunk.values()]
+        for record in create_tasks(config[VIKUNJA], tasks):
+            job = chunk[record["index"]]
+            if record["ok"]:
+                spool.done(job)
+                yield job, "sent"
+            elif "result" in record:
+                # The workflow handled and rejected this task.
+                spool.fail(job, json.dumps(record["result"]))
+                yield job, "failed"
+            else:
+                yield job, _retry(spool, job, record["error"])
+
+    for job in jobs:
+        if job.hook == VIKUNJA and VIKUNJA in config:
+            continue
+        if job.hook not in config:
+            yield job, _retry(spool, job, f"no '{job.hook}' section in config")
+            continue
+        try:
+            result = call(config[job.hook], job.payload)
+        except WebhookError as exc:
+            yield job, _retry(spool, job, str(exc))
+            continue
+        status = result.get("status")
+        if isinstance(status, int) and status >= 400:
+            spool.fail(job, json.dumps(result))
+            yield job, "failed"
+        else:
+            spool.done(job)
+            yield job, "sent"
+
+
+def _retry(spool: Spool, job: Job, error: str) -> str:
+    return "retrying" if spool.retry_later(job, error) else "failed"
+
+
+def run(args: argparse.Namespace, config: dict[str, HookConfig]) -> None:
+    spool = Spool()
+    if args.op == "retry":
+        print(json.dumps({"requeued": spool.requeue_failed()}))
+        return
+    print(json.dumps(spool.status(), indent=2, ensure_ascii=False))
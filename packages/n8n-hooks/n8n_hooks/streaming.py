@@ -0,0 +1,351 @@
+"""Streaming helpers for large request and response bodies."""
+
+from __future__ import annotations
+
+import base64
+import codecs
+import json
+import uuid
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
+
+# Multiple of 3 so every chunk base64-encodes without padding.
+CHUNK_SIZE = 3 * 64 * 1024
+
+# zlib wbits selecting the gzip container.
+GZIP_WBITS = 31
+# Level 6 costs several times more CPU than 1 for a few percent on JSON.
+GZIP_LEVEL = 1
+
+
+class Base64File:
+    """A JSON string value that is the base64 encoding of a file.
+
+    Placed in a payload in place of a pre-encoded string, the file is read and
+    encoded chunk by chunk while the request body is being sent.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        if chunk_size % 3:
+            raise ValueError("chunk_size must be a multiple of 3")
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def chunks(self) -> Iterator[bytes]:
+        with open(self.path, "rb") as f:
+            while block := f.read(self.chunk_size):
+                yield base64.b64encode(block)
+
+
+def has_streams(value: Any) -> bool:
+    """Return True if *value* contains any Base64File."""
+    if isinstance(value, Base64File):
+        return True
+    if isinstance(value, dict):
+        return any(has_streams(v) for v in value.values())
+    if isinstance(value, list):
+        return any(has_streams(v) for v in value)
+    return False
+
+
+def iter_json(payload: Any) -> Iterator[bytes]:
+    """Yield the JSON encoding of *payload*, streaming Base64File values.
+
+    Everything except the streamed values is serialised up front with
+    ``json.dumps``; each Base64File is swapped for a unique placeholder string
+    whose encoded form is then replaced by the file's chunks.
+    """
+    token = uuid.uuid4().hex
+    streams: list[Base64File] = []
+
+    def _placeholder(value: Any) -> str:
+        if not isinstance(value, Base64File):
+            raise TypeError(f"{type(value).__name__} is not JSON serializable")
+        streams.append(value)
+        return f"@@{token}:{len(streams) - 1}@@"
+
+    text = json.dumps(payload, default=_placeholder)
+    for index, stream in enumerate(streams):
+        before, _, text = text.partition(json.dumps(f"@@{token}:{index}@@"))
+        yield (before + '"').encode()
+        yield from stream.chunks()
+        text = '"' + text
+    yield text.encode()
+
+
+class ByteSource(Protocol):
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+class JsonStreamError(ValueError):
+    """The streamed document is not valid JSON."""
+
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class JsonReader:
+    """Pull parser over a byte stream for documents too large to buffer.
+
+    Containers are walked with :meth:`object_keys` and :meth:`array_items`,
+    which yield once per member and expect the caller to consume exactly one
+    value (with :meth:`value`, :meth:`string_chunks`, :meth:`skip`, or a
+    nested walk) before advancing. Only the value being consumed is held in
+    memory; :meth:`string_chunks` and :meth:`skip` hold not even that.
+    """
+
+    def __init__(self, stream: ByteSource, chunk_size: int = 64 * 1024) -> None:
+        # read1 returns whatever has arrived instead of waiting for a full chunk.
+        self._read = getattr(stream, "read1", stream.read)
+        self._chunk_size = chunk_size
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append more input to the buffer; return False at end of stream."""
+        if self._eof:
+            return False
+        data = self._read(self._chunk_size)
+        if not data:
+            self._eof = True
+            tail = self._utf8.decode(b"", final=True)
+        else:
+            tail = self._utf8.decode(data)
+        self._buf = self._buf[self._pos :] + tail
+        self._pos = 0
+        return bool(data) or bool(tail)
+
+    def _ensure(self, n: int) -> None:
+        while len(self._buf) - self._pos < n:
+            if not self._fill():
+                raise JsonStreamError("unexpected end of JSON input")
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at end of input."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise JsonStreamError(f"expected {char!r}, found {found or 'EOF'!r}")
+        self._pos += 1
+
+    def string_chunks(self) -> Iterator[str]:
+        """Yield the decoded contents of the next string value piecewise."""
+        self.expect('"')
+        while True:
+            if self._pos >= len(self._buf) and not self._fill():
+                raise JsonStreamError("unterminated string")
+            buf = self._buf
+            pos = self._pos
+            quote = buf.find('"', pos)
+            backslash = buf.find("\\", pos, quote if quote >= 0 else len(buf))
+            if backslash >= 0:
+                if backslash > pos:
+                    yield buf[pos:backslash]
+                self._pos = backslash
+                yield self._escape()
+            elif quote >= 0:
+                if quote > pos:
+                    yield buf[pos:quote]
+                self._pos = quote + 1
+                return
+            else:
+                if len(buf) > pos:
+                    yield buf[pos:]
+                self._pos = len(buf)
+
+    def _escape(self) -> str:
+        self._ensure(2)
+        if self._buf[self._pos + 1] != "u":
+            length = 2
+        else:
+            self._ensure(6)
+            length = 6
+            code = int(self._buf[self._pos + 2 : self._pos + 6], 16)
+            if 0xD800 <= code < 0xDC00:
+                # High surrogate: decode together with the following \uXXXX.
+                try:
+                    self._ensure(12)
+                    if self._buf[self._pos + 6 : self._pos + 8] == "\\u":
+                        length = 12
+                except JsonStreamError:
+                    pass
+        seq = self._buf[self._pos : self._pos + length]
+        self._pos += length
+        try:
+            return str(json.loads(f'"{seq}"'))
+        except json.JSONDecodeError as exc:
+            raise JsonStreamError(f"invalid escape {seq!r}") from exc
+
+    def value(self) -> Any:
+        """Parse and return the next complete value."""
+        if not self.peek():
+            raise JsonStreamError("unexpected end of JSON input")
+        while True:
+            try:
+                result, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                pass
+            else:
+                # A number at the very end of the buffer may still be growing.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return result
+            if self._eof:
+                raise JsonStreamError("invalid JSON value")
+            # Double the buffered span before retrying so parsing stays linear.
+            target = 2 * max(len(self._buf) - self._pos, 1)
+            while len(self._buf) - self._pos < target and self._fill():
+                pass
+
+    def skip(self) -> None:
+        """Consume the next value without materialising it."""
+        char = self.peek()
+        if char == '"':
+            for _ in self.string_chunks():
+                pass
+        elif char == "{":
+            for _ in self.object_keys():
+                self.skip()
+        elif char == "[":
+            for _ in self.array_items():
+                self.skip()
+        else:
+            self.value()
+
+    def object_keys(self) -> Iterator[str]:
+        """Walk an object, yielding each key before its value is consumed."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = "".join(self.string_chunks())
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise JsonStreamError(f"expected ',' or '}}', found {char or 'EOF'!r}")
+
+    def array_items(self) -> Iterator[int]:
+        """Walk an array, yielding each index before its item is consumed."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise JsonStreamError(f"expected ',' or ']', found {char or 'EOF'!r}")
+
+    def at_end(self) -> bool:
+        return self.peek() == ""
+
+
+class Base64Sink:
+    """Decode base64 text arriving in arbitrary pieces into a binary file."""
+
+    def __init__(self, out: BinaryIO) -> None:
+        self.out = out
+        self.written = 0
+        self._pending = ""
+
+    def write(self, text: str) -> None:
+        text = self._pending + "".join(text.split())
+        usable = len(text) - len(text) % 4
+        self._pending = text[usable:]
+        if usable:
+            self.written += self.out.write(base64.b64decode(text[:usable]))
+
+    def close(self) -> None:
+        if self._pending:
+            raise ValueError("truncated base64 data")
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """Gzip a whole request body."""
+    return zlib.compress(data, GZIP_LEVEL, wbits=GZIP_WBITS)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a streamed request body chunk by chunk."""
+    encoder = zlib.compressobj(GZIP_LEVEL, wbits=GZIP_WBITS)
+    for chunk in chunks:
+        if out := encoder.compress(chunk):
+            yield out
+    yield encoder.flush()
+
+
+class GzipReader:
+    """Decompress a gzip-encoded response body as it is read.
+
+    Wraps an ``http.client.HTTPResponse`` and forwards every other attribute
+    (``status``, ``getheader`` ...) to it. The raw response is always read to
+    its end so the connection can go back to the pool.
+    """
+
+    def __init__(self, raw: Any, chunk_size: int = 64 * 1024) -> None:
+        self.raw = raw
+        self.chunk_size = chunk_size
+        self._read_raw = getattr(raw, "read1", raw.read)
+        self._decoder = zlib.decompressobj(wbits=GZIP_WBITS)
+        self._buffer = b""
+        self._eof = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+    def _fill(self) -> None:
+        data = self._read_raw(self.chunk_size)
+        try:
+            if data:
+                self._buffer += self._decoder.decompress(data)
+        except zlib.error as exc:
+            raise OSError(f"invalid gzip response: {exc}") from exc
+        if self._decoder.eof:
+            # A plain read() drains the rest and lets http.client mark the
+            # response closed, which read1() never does at Content-Length.
+            self.raw.read()
+            self._eof = True
+        elif not data:
+            raise OSError("truncated gzip response")
+
+    def read1(self, size: int = -1, /) -> bytes:
+        while not self._buffer and not self._eof:
+            self._fill()
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    def read(self, size: int = -1, /) -> bytes:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            self._fill()
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
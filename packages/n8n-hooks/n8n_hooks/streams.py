@@ -0,0 +1,79 @@
+"""Standard streams per invocation, for running several in one process.
+
+The serve daemon (:mod:`n8n_hooks.daemon`) runs forwarded invocations side by
+side in threads. It :func:`install`\\ s proxies as ``sys.stdin``,
+``sys.stdout`` and ``sys.stderr`` that use the streams :func:`redirect` set
+for the current context, so ``print(..., file=sys.stderr)`` reaches the right
+client, also from worker threads started with a copied context; code that
+hands a stream to other threads passes it through :func:`unwrap`. Without the
+proxies, :func:`redirect` swaps the ``sys`` attributes like
+:func:`contextlib.redirect_stdout`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sys
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any, TextIO
+
+_NAMES = ("stdin", "stdout", "stderr")
+
+_streams: ContextVar[dict[str, TextIO]] = ContextVar("streams", default={})  # noqa: B039
+
+
+class _Proxy:
+    """Stands in for one ``sys`` stream and forwards to the context's own."""
+
+    def __init__(self, name: str, default: TextIO) -> None:
+        self._name = name
+        self._default = default
+
+    def _target(self) -> TextIO:
+        return _streams.get().get(self._name, self._default)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._target())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+def install() -> None:
+    """Replace the ``sys`` streams with context-aware proxies (idempotent)."""
+    for name in _NAMES:
+        current = getattr(sys, name)
+        if not isinstance(current, _Proxy):
+            setattr(sys, name, _Proxy(name, current))
+
+
+def unwrap(stream: TextIO) -> TextIO:
+    """The stream *stream* stands for now, to hand to threads of one's own."""
+    return stream._target() if isinstance(stream, _Proxy) else stream
+
+
+@contextlib.contextmanager
+def redirect(**streams: TextIO) -> Iterator[None]:
+    """Use *streams* (keyed ``stdin``, ``stdout``, ``stderr``) within the block."""
+    if all(isinstance(getattr(sys, name), _Proxy) for name in streams):
+        token = _streams.set({**_streams.get(), **streams})
+        try:
+            yield
+        finally:
+            _streams.reset(token)
+        return
+    saved = {name: getattr(sys, name) for name in streams}
+    for name, stream in streams.items():
+        setattr(sys, name, stream)
+    try:
+        yield
+    finally:
+        for name, stream in saved.items():
+            setattr(sys, name, stream)
@@ -1,17 +1,34 @@
-"""Markdown+YAML Vikunja task template support for n8n-hooks."""
+"""Markdown+YAML Vikunja task template support for n8n-hooks.
+
+Loaded templates are cached by path, modification time and size: in memory
+for the life of the process, and on disk in
+``$XDG_CACHE_HOME/n8n-hooks/templates.json`` so later invocations skip the
+YAML parse and schema-shape checks. Each template's schema is compiled once
+into a tree of validator closures (:func:`compile_schema`) with every
+``$ref`` resolved ahead of time. :func:`list_templates` answers from an index
+of the template directories that is rebuilt only when one of them changes.
+"""
 
 from __future__ import annotations
 
+import functools
+import json
 import os
 import re
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 FRONTMATTER_RE = re.compile(r"\A---\s*\n(.*?)\n---\s*\n?(.*)\Z", re.DOTALL)
 
+# Validates a value at a path, returning error messages.
+Validator = Callable[[Any, list[str | int]], list[str]]
+
+# Version of the on-disk cache layout; bump when TemplateSpec changes.
+CACHE_VERSION = 1
+
 
 class TemplateError(ValueError):
     """Template or context validation failed."""
@@ -26,17 +43,79 @@ class TemplateSpec:
     schema: dict[str, Any]
     attachment_expectations: list[str]
 
+    @functools.cached_property
+    def validator(self) -> Validator:
+        return compile_schema(self.schema)
+
+
+@dataclass(frozen=True)
+class TemplateSummary:
+    name: str
+    path: Path
+    description: str
+
+
+_loaded: dict[tuple[Path, int, int], TemplateSpec] = {}
+_loaded_lock = threading.Lock()
+
 
 def load_template(name: str, template_dir: str | None = None) -> TemplateSpec:
     safe_name = _safe_template_name(name)
     path = _resolve_template_path(safe_name, template_dir)
     if not path.exists():
         raise TemplateError(f"template not found: {safe_name}")
-    return _read_template(path, safe_name)
+    return _load_cached(path, safe_name)
 
 
 def validate_context(template: TemplateSpec, context: dict[str, Any]) -> list[str]:
-    return _validate_value(context, template.schema, template.schema, [])
+    return template.validator(context, [])
+
+
+def list_templates(template_dir: str | None = None) -> list[TemplateSummary]:
+    """List the valid templates visible from *template_dir* or the default dirs.
+
+    A name found in several directories resolves to the first, as in
+    :func:`load_template`.
+    """
+    bases = (
+        [Path(template_dir).expanduser()] if template_dir else default_template_dirs()
+    )
+    resolved = [base.expanduser().resolve() for base in bases]
+    disk = _read_disk_cache()
+    index_key = os.pathsep.join(str(base) for base in resolved)
+    index = disk.get("indexes", {}).get(index_key)
+    if isinstance(index, dict) and _index_is_fresh(index):
+        return [
+            TemplateSummary(e["name"], Path(e["path"]), e["description"])
+            for e in index["templates"]
+        ]
+
+    dirs: dict[str, int] = {}
+    found: dict[str, Path] = {}
+    for base in resolved:
+        for name, path in _scan_dir(base, dirs):
+            found.setdefault(name, path)
+    files: dict[str, list[int]] = {}
+    summaries: list[TemplateSummary] = []
+    for name, path in sorted(found.items()):
+        try:
+            stat = path.stat()
+            files[str(path)] = [stat.st_mtime_ns, stat.st_size]
+            spec = _load_cached(path, name, disk)
+        except (OSError, TemplateError):
+            continue
+        summaries.append(TemplateSummary(spec.name, spec.path, spec.description))
+
+    disk.setdefault("indexes", {})[index_key] = {
+        "dirs": dirs,
+        "files": files,
+        "templates": [
+            {"name": s.name, "path": str(s.path), "description": s.description}
+            for s in summaries
+        ],
+    }
+    _write_disk_cache(disk)
+    return summaries
 
 
 def missing_required(template: TemplateSpec, context: dict[str, Any]) -> list[str]:
@@ -99,7 +178,38 @@ def _resolve_template_path(name: str, template_dir: str | None) -> Path:
     )
 
 
+def _load_cached(
+    path: Path, expected_name: str, disk: dict[str, Any] | None = None
+) -> TemplateSpec:
+    """Load *path* through the memory and disk caches.
+
+    With *disk* (the parsed cache file), new entries are added to it and
+    left for the caller to write back.
+    """
+    stat = path.stat()
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _loaded_lock:
+        spec = _loaded.get(key)
+    if spec is None:
+        cache = _read_disk_cache() if disk is None else disk
+        spec = _disk_entry(cache, *key)
+        if spec is None:
+            spec = _read_template(path, expected_name)
+            if _store_disk_entry(cache, *key, spec) and disk is None:
+                _write_disk_cache(cache)
+    if spec.name != expected_name:
+        raise TemplateError(
+            f"template name '{spec.name}' does not match file name '{expected_name}'"
+        )
+    with _loaded_lock:
+        _loaded[key] = spec
+    return spec
+
+
 def _read_template(path: Path, expected_name: str) -> TemplateSpec:
+    # Imported here: a template served from the cache never needs PyYAML.
+    import yaml
+
     text = path.read_text()
     match = FRONTMATTER_RE.match(text)
     if not match:
@@ -118,6 +228,124 @@ def _read_template(path: Path, expected_name: str) -> TemplateSpec:
     return spec
 
 
+def _scan_dir(base: Path, dirs: dict[str, int]) -> list[tuple[str, Path]]:
+    """Return (name, path) of template candidates in *base*.
+
+    Records the mtime of every directory looked at in *dirs*, so the index
+    notices added, removed or renamed templates.
+    """
+    try:
+        dirs[str(base)] = base.stat().st_mtime_ns
+        entries = sorted(os.scandir(base), key=lambda e: e.name)
+    except OSError:
+        dirs[str(base)] = -1
+        return []
+    found: list[tuple[str, Path]] = []
+    for entry in entries:
+        if entry.is_file() and entry.name.endswith(".md"):
+            found.append((entry.name.removesuffix(".md"), Path(entry.path)))
+        elif entry.is_dir():
+            dirs[entry.path] = entry.stat().st_mtime_ns
+            candidate = Path(entry.path) / "template.md"
+            if candidate.is_file():
+                found.append((entry.name, candidate))
+    return [
+        (name, path.resolve())
+        for name, path in found
+        if re.fullmatch(r"[A-Za-z0-9_-]+", name)
+    ]
+
+
+def _index_is_fresh(index: dict[str, Any]) -> bool:
+    dirs = index.get("dirs")
+    files = index.get("files")
+    if not isinstance(dirs, dict) or not isinstance(files, dict):
+        return False
+    for path, mtime_ns in dirs.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            if mtime_ns != -1:
+                return False
+    for path, signature in files.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if [stat.st_mtime_ns, stat.st_size] != signature:
+            return False
+    return isinstance(index.get("templates"), list)
+
+
+def _cache_path() -> Path:
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache / "n8n-hooks" / "templates.json"
+
+
+def _read_disk_cache() -> dict[str, Any]:
+    try:
+        data = json.loads(_cache_path().read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data
+
+
+def _write_disk_cache(data: dict[str, Any]) -> None:
+    import tempfile
+
+    path = _cache_path()
+    data["version"] = CACHE_VERSION
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".templates-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        return
+
+
+def _disk_entry(
+    cache: dict[str, Any], path: Path, mtime_ns: int, size: int
+) -> TemplateSpec | None:
+    entry = cache.get("templates", {}).get(str(path))
+    if (
+        not isinstance(entry, dict)
+        or entry.get("mtime_ns") != mtime_ns
+        or entry.get("size") != size
+    ):
+        return None
+    try:
+        return TemplateSpec(path=path, **entry["spec"])
+    except (KeyError, TypeError):
+        return None
+
+
+def _store_disk_entry(
+    cache: dict[str, Any], path: Path, mtime_ns: int, size: int, spec: TemplateSpec
+) -> bool:
+    fields = {
+        "name": spec.name,
+        "description": spec.description,
+        "defaults": spec.defaults,
+        "schema": spec.schema,
+        "attachment_expectations": spec.attachment_expectations,
+    }
+    try:
+        # YAML can produce values JSON would alter (dates, non-string keys);
+        # such templates are only cached in memory.
+        if json.loads(json.dumps(fields)) != fields:
+            return False
+    except (TypeError, ValueError):
+        return False
+    templates = cache.setdefault("templates", {})
+    templates[str(path)] = {"mtime_ns": mtime_ns, "size": size, "spec": fields}
+    return True
+
+
 def _parse_template(path: Path, raw: dict[Any, Any]) -> TemplateSpec:
     errors: list[str] = []
     allowed = {"name", "description", "defaults", "schema", "attachment_expectations"}
@@ -255,74 +483,133 @@ def _validate_schema_node(
     return errors
 
 
-def _validate_value(
-    value: Any,
-    schema: dict[Any, Any],
-    root: dict[Any, Any],
-    path: list[str | int],
-) -> list[str]:
-    ref = schema.get("$ref")
-    if isinstance(ref, str):
-        resolved = _resolve_ref(root, ref)
-        if resolved is None:
-            return [_schema_path(path) + "unknown schema reference"]
-        return _validate_value(value, resolved, root, path)
-
-    errors: list[str] = []
-    node_type = schema.get("type")
-    if node_type == "object":
+def compile_schema(schema: dict[Any, Any]) -> Validator:
+    """Compile *schema* into a validator closure tree.
+
+    ``$ref`` targets are resolved and compiled once, up front; recursive
+    references go through a forwarding closure filled in when the target
+    finishes compiling.
+    """
+    compiled_refs: dict[str, Validator] = {}
+
+    def compile_ref(ref: str) -> Validator:
+        if ref in compiled_refs:
+            return compiled_refs[ref]
+        target = _resolve_ref(schema, ref)
+        if target is None:
+            return _reject("unknown schema reference")
+        slot: list[Validator] = []
+        compiled_refs[ref] = lambda value, path: slot[0](value, path)
+        slot.append(compile_node(target))
+        compiled_refs[ref] = slot[0]
+        return slot[0]
+
+    def compile_node(node: dict[Any, Any]) -> Validator:
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            return compile_ref(ref)
+        node_type = node.get("type")
+        if node_type == "object":
+            return _compile_object(node, compile_node)
+        if node_type == "array":
+            return _compile_array(node, compile_node)
+        if node_type == "string":
+            return _compile_string(node)
+        return _accept
+
+    return compile_node(schema)
+
+
+def _compile_object(
+    node: dict[Any, Any], compile_node: Callable[[dict[Any, Any]], Validator]
+) -> Validator:
+    properties = node.get("properties", {})
+    if not isinstance(properties, dict):
+        properties = {}
+    required = node.get("required", [])
+    required_fields: list[str] = required if _is_list_of_strings(required) else []
+    closed = node.get("additionalProperties") is False
+    known = set(properties)
+    children = {
+        field: compile_node(prop)
+        for field, prop in properties.items()
+        if isinstance(prop, dict)
+    }
+
+    def validate(value: Any, path: list[str | int]) -> list[str]:
         if not isinstance(value, dict):
             return [f"{_schema_path(path)}must be an object"]
-        properties = schema.get("properties", {})
-        if not isinstance(properties, dict):
-            properties = {}
-        required = schema.get("required", [])
-        if _is_list_of_strings(required):
-            for field in required:
-                if _is_missing_value(value.get(field)):
-                    errors.append(f"{_schema_path([*path, field])}is required")
-        if schema.get("additionalProperties") is False:
+        errors: list[str] = []
+        for field in required_fields:
+            if _is_missing_value(value.get(field)):
+                errors.append(f"{_schema_path([*path, field])}is required")
+        if closed:
             for field in value:
-                if field not in properties:
+                if field not in known:
                     errors.append(f"{_schema_path([*path, str(field)])}is not allowed")
         for field, item in value.items():
-            if field in properties and isinstance(properties[field], dict):
-                errors.extend(
-                    _validate_value(item, properties[field], root, [*path, str(field)])
-                )
+            child = children.get(field)
+            if child is not None:
+                errors.extend(child(item, [*path, str(field)]))
         return errors
 
-    if node_type == "array":
+    return validate
+
+
+def _compile_array(
+    node: dict[Any, Any], compile_node: Callable[[dict[Any, Any]], Validator]
+) -> Validator:
+    min_items = node.get("minItems")
+    max_items = node.get("maxItems")
+    items = node.get("items")
+    item_validator = compile_node(items) if isinstance(items, dict) else None
+
+    def validate(value: Any, path: list[str | int]) -> list[str]:
         if not isinstance(value, list):
             return [f"{_schema_path(path)}must be an array"]
-        min_items = schema.get("minItems")
-        max_items = schema.get("maxItems")
+        errors: list[str] = []
         if isinstance(min_items, int) and len(value) < min_items:
             errors.append(f"{_schema_path(path)}needs at least {min_items} items")
         if isinstance(max_items, int) and len(value) > max_items:
             errors.append(f"{_schema_path(path)}needs at most {max_items} items")
-        items = schema.get("items")
-        if isinstance(items, dict):
+        if item_validator is not None:
             for index, item in enumerate(value):
-                errors.extend(_validate_value(item, items, root, [*path, index]))
+                errors.extend(item_validator(item, [*path, index]))
         return errors
 
-    if node_type == "string":
+    return validate
+
+
+def _compile_string(node: dict[Any, Any]) -> Validator:
+    min_length = node.get("minLength")
+    enum = node.get("enum")
+    choices = enum if isinstance(enum, list) else None
+    choices_text = ", ".join(str(item) for item in choices or [])
+
+    def validate(value: Any, path: list[str | int]) -> list[str]:
         if not isinstance(value, str):
             return [f"{_schema_path(path)}must be a string"]
-        min_length = schema.get("minLength")
+        errors: list[str] = []
         if isinstance(min_length, int) and len(value) < min_length:
             errors.append(
                 f"{_schema_path(path)}must be at least {min_length} characters"
             )
-        enum = schema.get("enum")
-        if isinstance(enum, list) and value not in enum:
-            errors.append(
-                f"{_schema_path(path)}must be one of: {', '.join(str(item) for item in enum)}"
-            )
+        if choices is not None and value not in choices:
+            errors.append(f"{_schema_path(path)}must be one of: {choices_text}")
         return errors
 
-    return errors
+    return validate
+
+
+def _accept(value: Any, path: list[str | int]) -> list[str]:
+    return []
+
+
+def _reject(message: str) -> Validator:
+    def validate(value: Any, path: list[str | int]) -> list[str]:
+        return [_schema_path(path) + message]
+
+    return validate
 
 
 def _resolve_ref(root: dict[Any, Any], ref: str) -> dict[Any, Any] | None:
@@ -0,0 +1,206 @@
+"""Per-phase latency tracing for n8n-hooks invocations.
+
+Enabled with ``--trace`` (one JSON line on stderr) or ``N8N_HOOKS_TRACE``:
+``1``/``stderr`` for stderr, anything else is a file the line is appended to.
+Each line records the command, its exit status, the total time, and every
+phase with its offset and duration in milliseconds (monotonic clock):
+
+  - ``parse``, ``config``, ``run`` — the steps of ``cli.execute``
+  - ``cache`` — response cache lookup
+  - ``token`` — bearer token resolution (token command or cache)
+  - ``connect`` — DNS, TCP and TLS for a new pooled connection
+  - ``send`` — writing the request
+  - ``ttfb`` — waiting for the response status and headers (n8n workflow time)
+  - ``download`` — reading the response body
+  - ``decode`` — JSON parsing
+
+Webhook phases carry the ``hook`` and ``operation`` they belong to. Collected
+lines aggregate into p50/p95 tables per hook and operation with::
+
+    python -m n8n_hooks.trace traces.jsonl [...]
+
+When tracing is off, :func:`span` is a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+ENV = "N8N_HOOKS_TRACE"
+
+
+class Trace:
+    """Phases recorded for one invocation; safe to add to from any thread."""
+
+    def __init__(self, destination: str, start: float | None = None) -> None:
+        self.destination = destination
+        self.start = time.monotonic() if start is None else start
+        self.phases: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, start: float, end: float, **attrs: Any) -> None:
+        record = {
+            "phase": phase,
+            "at_ms": round((start - self.start) * 1000, 3),
+            "ms": round((end - start) * 1000, 3),
+            **{key: value for key, value in attrs.items() if value is not None},
+        }
+        with self._lock:
+            self.phases.append(record)
+
+    def line(self, **fields: Any) -> str:
+        total = round((time.monotonic() - self.start) * 1000, 3)
+        with self._lock:
+            phases = list(self.phases)
+        return json.dumps(
+            {"ts": time.time(), **fields, "total_ms": total, "phases": phases}
+        )
+
+    def write(self, **fields: Any) -> None:
+        line = self.line(**fields)
+        if self.destination == "stderr":
+            print(line, file=sys.stderr)
+            return
+        try:
+            with open(self.destination, "a") as f:
+                f.write(line + "\n")
+        except OSError as exc:
+            print(f"n8n-hooks: cannot write trace: {exc}", file=sys.stderr)
+
+
+# The invocation's trace; worker threads see it through a copied context.
+_current: contextvars.ContextVar[Trace | None] = contextvars.ContextVar(
+    "n8n_hooks_trace", default=None
+)
+# Attributes (hook, operation) added to spans in the current thread or task.
+_labels: contextvars.ContextVar[dict[str, Any]] = contextvars.ContextVar(
+    "n8n_hooks_trace_labels"
+)
+
+
+def destination(flag: bool) -> str | None:
+    """Where traces go for this invocation, or None if tracing is off."""
+    value = os.environ.get(ENV, "")
+    if flag or value in {"1", "stderr"}:
+        return "stderr"
+    if value in {"", "0"}:
+        return None
+    return value
+
+
+def begin(dest: str, start: float | None = None) -> Trace:
+    trace = Trace(dest, start)
+    _current.set(trace)
+    return trace
+
+
+def end() -> Trace | None:
+    trace = _current.get()
+    _current.set(None)
+    return trace
+
+
+@contextlib.contextmanager
+def _span(trace: Trace, phase: str, attrs: dict[str, Any]) -> Iterator[None]:
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.add(phase, start, time.monotonic(), **{**_labels.get({}), **attrs})
+
+
+@contextlib.contextmanager
+def _labelled(attrs: dict[str, Any]) -> Iterator[None]:
+    token = _labels.set({**_labels.get({}), **attrs})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+_NOOP = contextlib.nullcontext()
+
+
+def labels(**attrs: Any) -> contextlib.AbstractContextManager[Any]:
+    """Attach *attrs* to every span recorded in the enclosed block."""
+    if _current.get() is None:
+        return _NOOP
+    return _labelled(attrs)
+
+
+def span(phase: str, **attrs: Any) -> contextlib.AbstractContextManager[Any]:
+    """Time the enclosed block as *phase* if tracing is on."""
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _span(trace, phase, attrs)
+
+
+def summarize(lines: Iterable[str]) -> list[tuple[str, str, str, int, float, float]]:
+    """Return (hook, operation, phase, count, p50 ms, p95 ms) rows.
+
+    Phases without a hook are attributed to the invocation's command.
+    """
+    import statistics
+
+    samples: dict[tuple[str, str, str], list[float]] = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        command = str(record.get("command", "?"))
+        operation = str(record.get("operation") or "-")
+        key = (command, operation, "total")
+        samples.setdefault(key, []).append(float(record.get("total_ms", 0)))
+        for phase in record.get("phases", []):
+            key = (
+                str(phase.get("hook", command)),
+                str(phase.get("operation") or operation),
+                str(phase.get("phase")),
+            )
+            samples.setdefault(key, []).append(float(phase.get("ms", 0)))
+    rows = []
+    for (hook, operation, phase), values in sorted(samples.items()):
+        p95 = statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+        rows.append(
+            (hook, operation, phase, len(values), statistics.median(values), p95)
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+    import fileinput
+
+    parser = argparse.ArgumentParser(
+        prog="python -m n8n_hooks.trace",
+        description="Aggregate n8n-hooks trace lines into p50/p95 tables.",
+    )
+    parser.add_argument("files", nargs="*", help="Trace files (default: stdin)")
+    args = parser.parse_args(argv)
+
+    with fileinput.input(args.files) as lines:
+        rows = summarize(lines)
+    print(
+        f"{'hook':<20} {'operation':<18} {'phase':<10} "
+        f"{'n':>5} {'p50 ms':>9} {'p95 ms':>9}"
+    )
+    for hook, operation, phase, count, p50, p95 in rows:
+        print(
+            f"{hook:<20} {operation:<18} {phase:<10} {count:>5} {p50:>9.2f} {p95:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
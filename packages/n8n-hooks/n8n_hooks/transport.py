@@ -0,0 +1,296 @@
+"""Pooled HTTP transport with per-host persistent connections.
+
+``urllib.request.urlopen`` opens a fresh socket (and TLS session) for every
+request. Hooks invoked repeatedly in one process — batch mode, the daemon,
+multi-source fan-out — go through the shared :data:`POOL` instead, which keeps
+idle HTTP/1.1 connections per ``(scheme, host, port)`` and hands them back out.
+
+Like ``urlopen``, the pool honours ``http_proxy``/``https_proxy`` and
+``no_proxy`` (HTTPS through an HTTP proxy's ``CONNECT`` tunnel) and follows
+redirects of GET and HEAD requests. A redirected write is not followed: it
+raises :class:`RedirectError` naming the new location instead.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import os
+import select
+import ssl
+import threading
+import urllib.parse
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from n8n_hooks import trace
+
+Body = bytes | Iterable[bytes] | None
+
+# Errors raised when the server silently dropped an idle keep-alive connection.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+# Redirects followed for the methods safe to repeat elsewhere, and how many.
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+REDIRECT_METHODS = frozenset({"GET", "HEAD"})
+MAX_REDIRECTS = 5
+
+# (scheme, host, port, proxy URL or None)
+_Key = tuple[str, str, int, str | None]
+
+
+class RedirectError(Exception):
+    """A request was redirected where the pool does not follow it."""
+
+
+def _proxy_for(scheme: str, host: str) -> str | None:
+    """The proxy the environment routes *scheme* requests to *host* through."""
+    if not (
+        os.environ.get(f"{scheme}_proxy") or os.environ.get(f"{scheme.upper()}_PROXY")
+    ):
+        return None
+    # Imported here: it costs more start-up time than most invocations need.
+    import urllib.request
+
+    proxies = urllib.request.getproxies_environment()
+    proxy = proxies.get(scheme)
+    if not proxy or _bypass(host, proxies.get("no", "")):
+        return None
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    if not proxy.lower().startswith("http://"):
+        raise ValueError(f"unsupported proxy (only http:// proxies are): {proxy}")
+    return proxy
+
+
+def _bypass(host: str, no_proxy: str) -> bool:
+    """Whether ``no_proxy`` (``*`` or domain suffixes) exempts *host*."""
+    host = host.lower()
+    for entry in no_proxy.split(","):
+        name = entry.strip().lower().lstrip(".").partition(":")[0]
+        if name == "*" or (name and (host == name or host.endswith("." + name))):
+            return True
+    return False
+
+
+def _proxy_headers(proxy: str) -> dict[str, str]:
+    parts = urllib.parse.urlsplit(proxy)
+    if parts.username is None:
+        return {}
+    user = urllib.parse.unquote(parts.username)
+    password = urllib.parse.unquote(parts.password or "")
+    token = base64.b64encode(f"{user}:{password}".encode()).decode()
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+class ConnectionPool:
+    """Keep up to *max_idle* idle connections per host for reuse."""
+
+    def __init__(self, max_idle: int = 4, timeout: float | None = None) -> None:
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: dict[_Key, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def _context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _new_connection(self, key: _Key) -> http.client.HTTPConnection:
+        scheme, host, port, proxy = key
+        conn: http.client.HTTPConnection
+        if proxy is not None:
+            parts = urllib.parse.urlsplit(proxy)
+            proxy_host, proxy_port = parts.hostname or "", parts.port or 80
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy_host, proxy_port, context=self._context()
+                )
+                conn.set_tunnel(host, port, headers=_proxy_headers(proxy))
+            else:
+                conn = http.client.HTTPConnection(proxy_host, proxy_port)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, context=self._context())
+        else:
+            conn = http.client.HTTPConnection(host, port)
+        if self.timeout is not None:
+            conn.timeout = self.timeout
+        return conn
+
+    def _acquire(self, key: _Key) -> tuple[http.client.HTTPConnection, bool]:
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    return self._new_connection(key), False
+                conn = idle.pop()
+            if not _dropped(conn):
+                return conn, True
+            conn.close()
+
+    def _release(self, key: _Key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(conns) for conns in self._idle.values())
+
+    @contextmanager
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: Body = None,
+        headers: dict[str, str] | None = None,
+        replayable: bool = False,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send a request and yield the response.
+
+        Idle connections the server has already closed are skipped before
+        anything is sent. With *replayable* (the request is safe to repeat),
+        a reused connection that fails mid-request is retried once on a new
+        one; otherwise the server may have acted on it, so the error is raised.
+
+        GET and HEAD requests follow up to :data:`MAX_REDIRECTS` redirects,
+        without the ``Authorization`` header once they leave the original
+        host; other methods raise RedirectError on a redirect.
+
+        The connection returns to the pool on exit if the response was read to
+        the end and the server allows keep-alive; otherwise it is closed.
+        """
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            key, conn, resp = self._send(method, url, body, headers, replayable)
+            location = resp.getheader("Location")
+            if resp.status not in REDIRECT_STATUSES or location is None:
+                break
+            try:
+                resp.read()
+            finally:
+                self._finish(key, conn, resp)
+            target = urllib.parse.urljoin(url, location)
+            if method not in REDIRECT_METHODS:
+                raise RedirectError(
+                    f"{method} {url} was redirected ({resp.status}) to {target};"
+                    " only GET and HEAD requests follow redirects"
+                )
+            if (
+                urllib.parse.urlsplit(target).netloc
+                != urllib.parse.urlsplit(url).netloc
+            ):
+                headers.pop("Authorization", None)
+            url = target
+        else:
+            raise RedirectError(f"more than {MAX_REDIRECTS} redirects, last to {url}")
+
+        try:
+            yield resp
+        except BaseException:
+            conn.close()
+            raise
+        self._finish(key, conn, resp)
+
+    def _finish(
+        self,
+        key: _Key,
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+    ) -> None:
+        if resp.isclosed() and not resp.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: Body,
+        headers: dict[str, str],
+        replayable: bool,
+    ) -> tuple[_Key, http.client.HTTPConnection, http.client.HTTPResponse]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"}:
+            raise ValueError(f"unsupported URL scheme: {url}")
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        proxy = _proxy_for(scheme, host)
+        key = (scheme, host, port, proxy)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if proxy is not None and scheme == "http":
+            # Plain HTTP goes to the proxy with the full URL as its target.
+            target = f"http://{parts.netloc}{target}"
+            headers = {**headers, **_proxy_headers(proxy)}
+
+        conn, reused = self._acquire(key)
+        try:
+            if not reused:
+                with trace.span("connect"):
+                    conn.connect()
+            with trace.span("send", reused=reused):
+                conn.request(method, target, body=body, headers=headers)
+            with trace.span("ttfb"):
+                resp = conn.getresponse()
+        except _STALE_ERRORS:
+            conn.close()
+            # Only a reused connection may have gone stale; a replayable body
+            # is required to send the request again on a fresh socket.
+            if not (reused and replayable) or not (
+                body is None or isinstance(body, bytes)
+            ):
+                raise
+            conn = self._new_connection(key)
+            try:
+                with trace.span("connect"):
+                    conn.connect()
+                with trace.span("send", reused=False):
+                    conn.request(method, target, body=body, headers=headers)
+                with trace.span("ttfb"):
+                    resp = conn.getresponse()
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        return key, conn, resp
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """Whether the server closed idle *conn*; it sends nothing unprompted."""
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+POOL = ConnectionPool()
+"""Process-wide pool shared by every hook."""
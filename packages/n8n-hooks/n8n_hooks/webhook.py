@@ -2,38 +2,190 @@
 
 from __future__ import annotations
 
+import contextlib
+import http.client
+import itertools
 import json
 import sys
-import urllib.request
+import time
+from collections.abc import Iterator
 from typing import Any
 
-from n8n_hooks.config import HookConfig
+from n8n_hooks import trace
+from n8n_hooks.config import HookConfig, TokenError
+from n8n_hooks.hooks import HOOKS
+from n8n_hooks.retry import (
+    DOWN_STATUSES,
+    RETRY_AFTER_STATUSES,
+    RETRY_STATUSES,
+    endpoint_key,
+    parse_retry_after,
+)
+from n8n_hooks.streaming import (
+    GzipReader,
+    gzip_bytes,
+    gzip_chunks,
+    has_streams,
+    iter_json,
+)
+from n8n_hooks.transport import POOL, Body, ConnectionPool, RedirectError
 
 
-def post(hook: HookConfig, payload: dict[str, Any]) -> dict[str, Any]:
-    """POST *payload* as JSON to the webhook, return parsed response."""
-    data = json.dumps(payload).encode()
+class WebhookError(Exception):
+    """The webhook could not be reached or answered with an HTTP error."""
+
+
+@contextlib.contextmanager
+def open_response(
+    hook: HookConfig, payload: dict[str, Any], pool: ConnectionPool = POOL
+) -> Iterator[http.client.HTTPResponse | GzipReader]:
+    """POST *payload* and yield the successful, still unread response.
+
+    For hooks that consume large response bodies incrementally. Raises
+    WebhookError on connection failures and HTTP error statuses. Payloads
+    containing streaming.Base64File values are sent with chunked transfer
+    encoding without ever holding the encoded files in memory.
 
+    Request bodies are gzipped as configured by ``hook.gzip_min_bytes``;
+    gzip-encoded responses are decompressed transparently while being read.
+    Failed tries are retried per ``hook.retry``, and requests fail fast
+    while ``hook.breaker`` considers the webhook down (see :mod:`n8n_hooks.retry`).
+    """
     headers: dict[str, str] = {"Content-Type": "application/json"}
-    if hook.token:
-        headers["Authorization"] = f"Bearer {hook.token}"
+    if hook.accept_gzip:
+        headers["Accept-Encoding"] = "gzip"
+    data: Body
+    if has_streams(payload):
+        data = iter_json(payload)
+        if hook.gzip_min_bytes is not None:
+            data = gzip_chunks(data)
+            headers["Content-Encoding"] = "gzip"
+    else:
+        data = json.dumps(payload).encode()
+        if hook.gzip_min_bytes is not None and len(data) >= hook.gzip_min_bytes:
+            data = gzip_bytes(data)
+            headers["Content-Encoding"] = "gzip"
 
-    req = urllib.request.Request(hook.url, data=data, headers=headers, method="POST")
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(trace.labels(**trace_labels(hook, payload)))
+        try:
+            with trace.span("token"):
+                token = hook.bearer_token()
+        except TokenError as exc:
+            raise WebhookError(str(exc)) from exc
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
 
-    try:
-        with urllib.request.urlopen(req) as resp:
-            body = resp.read().decode()
+        # Only a fully buffered body can be sent again.
+        policy = hook.retry if isinstance(data, bytes) else None
+        # Repeating a write could apply it twice.
+        entry = HOOKS.get(hook.name)
+        read_only = entry is not None and entry.read_only
+        endpoint = endpoint_key(hook.url)
+        for attempt in itertools.count(1):
+            if hook.breaker is not None:
+                wait = hook.breaker.remaining(endpoint)
+                if wait > 0:
+                    raise WebhookError(
+                        f"{endpoint} is failing; not retrying for another {wait:.0f}s"
+                    )
+            retry_after = None
+            cause: BaseException | None = None
+            with contextlib.ExitStack() as attempt_stack:
+                try:
+                    raw = attempt_stack.enter_context(
+                        pool.open(
+                            "POST",
+                            hook.url,
+                            body=data,
+                            headers=headers,
+                            replayable=read_only,
+                        )
+                    )
+                    resp: http.client.HTTPResponse | GzipReader = raw
+                    if (raw.getheader("Content-Encoding") or "").lower() == "gzip":
+                        resp = GzipReader(raw)
+                    if resp.status < 400:
+                        if hook.breaker is not None:
+                            hook.breaker.success(endpoint)
+                        # Keep the connection open while the caller reads.
+                        stack.enter_context(attempt_stack.pop_all())
+                        break
+                    error_body = resp.read().decode(errors="replace")
+                except RedirectError as exc:
+                    # Not a failure of the host: the hook's url needs updating.
+                    raise WebhookError(str(exc)) from exc
+                except (OSError, http.client.HTTPException) as exc:
+                    error = WebhookError(f"connection error: {exc}")
+                    cause = exc
+                    down = retryable = True
+                else:
+                    error = WebhookError(
+                        f"HTTP {resp.status} from {hook.url}: {error_body}"
+                    )
+                    down = resp.status in DOWN_STATUSES
+                    retryable = resp.status in RETRY_STATUSES
+                    if resp.status in RETRY_AFTER_STATUSES:
+                        retry_after = parse_retry_after(raw.getheader("Retry-After"))
+            if down and hook.breaker is not None:
+                hook.breaker.failure(endpoint)
+            delay = None
+            if policy is not None and retryable:
+                delay = policy.delay(attempt, retry_after)
+            if delay is None:
+                raise error from cause
+            with trace.span("retry", attempt=attempt):
+                time.sleep(delay)
+        yield resp
+
+
+def trace_labels(hook: HookConfig, payload: dict[str, Any]) -> dict[str, Any]:
+    """Hook and operation attached to trace spans of one webhook call."""
+    operation = payload.get("operation")
+    return {
+        "hook": hook.name or None,
+        "operation": operation if isinstance(operation, str) else None,
+    }
+
+
+def call(
+    hook: HookConfig, payload: dict[str, Any], pool: ConnectionPool = POOL
+) -> dict[str, Any]:
+    """POST *payload* as JSON to the webhook, return parsed response.
+
+    Raises WebhookError instead of exiting, for callers that run several
+    requests and report failures per request. Responses of read-only hooks
+    are served from and stored in ``hook.cache`` when one is configured.
+    """
+    with trace.labels(**trace_labels(hook, payload)):
+        if hook.cache is not None:
+            with trace.span("cache"):
+                cached = hook.cache.get(hook.name, hook.url, payload)
+            if cached is not None:
+                return cached
+        with open_response(hook, payload, pool=pool) as resp:
             try:
-                return json.loads(body)  # type: ignore[no-any-return]
-            except json.JSONDecodeError:
-                return {"status": resp.status, "body": body}
-    except urllib.error.HTTPError as exc:
-        error_body = exc.read().decode() if exc.fp else ""
-        print(
-            f"n8n-hooks: HTTP {exc.code} from {hook.url}: {error_body}",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-    except urllib.error.URLError as exc:
-        print(f"n8n-hooks: connection error: {exc.reason}", file=sys.stderr)
+                with trace.span("download"):
+                    body = resp.read().decode()
+            except (OSError, http.client.HTTPException) as exc:
+                raise WebhookError(f"connection error: {exc}") from exc
+            status = resp.status
+        try:
+            with trace.span("decode"):
+                result: dict[str, Any] = json.loads(body)
+        except json.JSONDecodeError:
+            return {"status": status, "body": body}
+    if hook.cache is not None and isinstance(result, dict):
+        hook.cache.put(hook.name, hook.url, payload, result)
+    return result
+
+
+def post(
+    hook: HookConfig, payload: dict[str, Any], pool: ConnectionPool = POOL
+) -> dict[str, Any]:
+    """POST *payload* as JSON to the webhook, return parsed response."""
+    try:
+        return call(hook, payload, pool=pool)
+    except WebhookError as exc:
+        print(f"n8n-hooks: {exc}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,126 @@
+"""Tests for the batch subcommand."""
+
+from __future__ import annotations
+
+import io
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.batch import run_batch
+from n8n_hooks.config import HookConfig
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Replies with the payload it received, or 404 for entry 404."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        if payload.get("entry_id") == 404:
+            reply: dict[str, Any] = {"status": 404, "body": {"message": "Not Found"}}
+        else:
+            reply = {"status": 200, "body": payload}
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def config() -> Any:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    server.daemon_threads = True
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/w"
+    yield {
+        "rss": HookConfig(url=url, token=None),
+        "slack": HookConfig(url=url, token=None),
+    }
+    server.shutdown()
+    server.server_close()
+
+
+def _run(lines: list[object], config: dict[str, HookConfig]) -> tuple[bool, list[Any]]:
+    stdin = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+    out = io.StringIO()
+    ok = run_batch(stdin, out, config, jobs=3)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    return ok, sorted(records, key=lambda r: r["index"])
+
+
+def test_dispatches_every_record(config: dict[str, HookConfig]) -> None:
+    ok, records = _run(
+        [
+            {"hook": "rss", "args": ["show-entry", "12"]},
+            {"hook": "slack", "args": ["search", "deploy", "-n", "3"]},
+            {"hook": "rss", "args": ["list-categories"]},
+        ],
+        config,
+    )
+
+    assert ok is True
+    assert [r["index"] for r in records] == [0, 1, 2]
+    assert records[0]["result"]["body"] == {"operation": "show-entry", "entry_id": 12}
+    assert records[1]["result"]["body"] == {
+        "operation": "search",
+        "query": "deploy",
+        "limit": 3,
+    }
+    assert all(r["ok"] for r in records)
+
+
+def test_invalid_records_are_reported_per_index(config: dict[str, HookConfig]) -> None:
+    ok, records = _run(
+        [
+            {"hook": "rss", "args": ["show-entry", "abc"]},
+            {"hook": "nope", "args": []},
+            {"hook": "rss", "args": ["show-entry", "404"]},
+            {"hook": "rss", "args": ["show-entry", "7"]},
+        ],
+        config,
+    )
+
+    assert ok is False
+    assert records[0] == {
+        "index": 0,
+        "ok": False,
+        "error": "n8n-hooks: invalid entry id: abc",
+    }
+    assert "unknown hook" in records[1]["error"]
+    assert records[2]["ok"] is False
+    assert records[2]["result"]["status"] == 404
+    assert records[3]["ok"] is True
+
+
+def test_missing_config_section(config: dict[str, HookConfig]) -> None:
+    ok, records = _run([{"hook": "vikunja", "args": ["show-task", "1"]}], config)
+
+    assert ok is False
+    assert records[0]["error"] == "no 'vikunja' section in config"
+
+
+def test_unexpected_errors_still_produce_a_record(
+    config: dict[str, HookConfig], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broken(hook: HookConfig, payload: dict[str, Any]) -> dict[str, Any]:
+        raise RuntimeError("token command crashed")
+
+    monkeypatch.setattr("n8n_hooks.batch.call", broken)
+    ok, records = _run([{"hook": "rss", "args": ["list-categories"]}, []], config)
+
+    assert ok is False
+    assert records[0]["error"] == "RuntimeError: token command crashed"
+    assert records[1]["error"] == "record 1 must be a JSON object"
@@ -0,0 +1,176 @@
+"""Tests for the read-only response cache."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.cache import DAY, ResponseCache, cache_key, from_config
+from n8n_hooks.config import HookConfig, load_config
+from n8n_hooks.webhook import call
+
+URL = "https://n8n.example.test/w"
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Replies with the request count so cache hits are observable."""
+
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        _CountingHandler.hits += 1
+        status = 500 if payload.get("operation") == "fail" else 200
+        reply = {"status": status, "body": {"hit": _CountingHandler.hits}}
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def url() -> Iterator[str]:
+    _CountingHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    server.daemon_threads = True
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/w"
+    server.shutdown()
+    server.server_close()
+
+
+def test_key_ignores_payload_key_order() -> None:
+    key = cache_key("rss", URL, {"a": 1, "b": 2})
+    assert key == cache_key("rss", URL, {"b": 2, "a": 1})
+    assert key != cache_key("slack", URL, {"a": 1, "b": 2})
+    assert key != cache_key("rss", URL + "2", {"a": 1, "b": 2})
+
+
+def test_per_operation_ttls(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "c.sqlite", ttls={"rss": 7})
+
+    assert cache.ttl("rss", {"operation": "list-categories"}) == DAY
+    assert cache.ttl("rss", {"operation": "show-entry"}) == 7
+    assert cache.ttl("slack", {"operation": "file-download"}) == 0
+    assert cache.ttl("store-draft", {"operation": "list-categories"}) == 0
+
+
+def test_repeated_call_is_served_from_cache(tmp_path: Path, url: str) -> None:
+    hook = HookConfig(url=url, name="rss", cache=ResponseCache(tmp_path / "c.sqlite"))
+    payload = {"operation": "list-categories"}
+
+    first = call(hook, payload)
+    second = call(hook, dict(payload))
+
+    assert first == second == {"status": 200, "body": {"hit": 1}}
+    assert _CountingHandler.hits == 1
+
+
+def test_write_hooks_and_errors_are_not_cached(tmp_path: Path, url: str) -> None:
+    cache = ResponseCache(tmp_path / "c.sqlite", ttls={"rss.fail": 60})
+    draft = HookConfig(url=url, name="store-draft", cache=cache)
+    rss = HookConfig(url=url, name="rss", cache=cache)
+
+    call(draft, {"operation": "list-categories"})
+    call(draft, {"operation": "list-categories"})
+    call(rss, {"operation": "fail"})
+    call(rss, {"operation": "fail"})
+
+    assert _CountingHandler.hits == 4
+
+
+def test_refresh_skips_lookup_but_stores(tmp_path: Path, url: str) -> None:
+    path = tmp_path / "c.sqlite"
+    payload = {"operation": "list-categories"}
+    call(HookConfig(url=url, name="rss", cache=ResponseCache(path)), payload)
+
+    refreshed = call(
+        HookConfig(url=url, name="rss", cache=ResponseCache(path, refresh=True)),
+        payload,
+    )
+    cached = call(HookConfig(url=url, name="rss", cache=ResponseCache(path)), payload)
+
+    assert refreshed["body"] == {"hit": 2}
+    assert cached["body"] == {"hit": 2}
+
+
+def test_expired_entries_are_not_served(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = ResponseCache(tmp_path / "c.sqlite", ttls={"rss": 10})
+    payload = {"operation": "show-entry", "entry_id": 1}
+    now = 1_000_000.0
+    monkeypatch.setattr("n8n_hooks.cache.time.time", lambda: now)
+    cache.put("rss", URL, payload, {"status": 200})
+
+    assert cache.get("rss", URL, payload) == {"status": 200}
+    now += 11
+    assert cache.get("rss", URL, payload) is None
+
+
+def test_least_recently_used_entries_are_evicted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entry = {"body": "x" * 100}
+    size = len(json.dumps(entry))
+    cache = ResponseCache(tmp_path / "c.sqlite", max_bytes=2 * size)
+    clock = iter(range(1_000_000, 1_000_100))
+    monkeypatch.setattr("n8n_hooks.cache.time.time", lambda: float(next(clock)))
+
+    cache.put("rss", URL, {"operation": "show-entry", "entry_id": 1}, entry)
+    cache.put("rss", URL, {"operation": "show-entry", "entry_id": 2}, entry)
+    cache.get("rss", URL, {"operation": "show-entry", "entry_id": 1})
+    cache.put("rss", URL, {"operation": "show-entry", "entry_id": 3}, entry)
+
+    assert cache.get("rss", URL, {"operation": "show-entry", "entry_id": 1}) == entry
+    assert cache.get("rss", URL, {"operation": "show-entry", "entry_id": 2}) is None
+    assert cache.get("rss", URL, {"operation": "show-entry", "entry_id": 3}) == entry
+
+
+def test_cache_is_opt_in(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("N8N_HOOKS_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    config_path = tmp_path / "config.json"
+    hooks = {"rss": {"url": "https://n8n.example.test/context-rss"}}
+    config_path.write_text(json.dumps({"hooks": hooks}))
+
+    assert load_config(str(config_path))["rss"].cache is None
+
+    config_path.write_text(
+        json.dumps({"cache": {"enabled": True, "ttl": {"rss": 5}}, "hooks": hooks})
+    )
+    hook = load_config(str(config_path))["rss"]
+
+    assert hook.name == "rss"
+    assert hook.cache is not None
+    assert hook.cache.path == tmp_path / "n8n-hooks" / "responses.sqlite"
+    assert hook.cache.ttl("rss", {"operation": "show-entry"}) == 5
+
+
+def test_invalid_ttl_is_a_config_error(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit) as exc:
+        from_config({"enabled": True, "ttl": {"rss": "soon"}})
+
+    assert exc.value.code == 1
+    assert "invalid cache ttl" in capsys.readouterr().err
+
+
+def test_env_overrides_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("N8N_HOOKS_CACHE", "0")
+    assert from_config({"enabled": True}) is None
+    monkeypatch.setenv("N8N_HOOKS_CACHE", "1")
+    assert from_config(None) is not None
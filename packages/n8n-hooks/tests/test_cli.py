@@ -0,0 +1,71 @@
+"""Tests for the lazy CLI command registry."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from n8n_hooks.cli import COMMANDS, build_parser, selected_command
+
+
+def _subcommand_help(parser: argparse.ArgumentParser) -> dict[str, str | None]:
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            return {a.dest: a.help for a in action._choices_actions}
+    raise AssertionError("parser has no subcommands")
+
+
+def test_registry_help_matches_registered_subcommands() -> None:
+    lazy = _subcommand_help(build_parser([]))
+    full = _subcommand_help(build_parser())
+
+    assert lazy == full
+    assert set(lazy) == set(COMMANDS)
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["rss", "list-categories"], "rss"),
+        (["--config", "rss", "slack", "search", "x"], "slack"),
+        (["--config=/tmp/c.json", "github", "/repos"], "github"),
+        (["--help"], None),
+        (["nope"], None),
+    ],
+)
+def test_selected_command(argv: list[str], expected: str | None) -> None:
+    assert selected_command(argv) == expected
+
+
+def test_unrelated_hooks_are_not_imported() -> None:
+    code = (
+        "import sys\n"
+        "from n8n_hooks.cli import build_parser, selected_command\n"
+        "argv = ['rss', 'list-categories']\n"
+        "build_parser([selected_command(argv)]).parse_args(argv)\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout.split()
+
+    assert "n8n_hooks.hooks.rss" in out
+    for heavy in (
+        "yaml",
+        "mimetypes",
+        "n8n_hooks.templates",
+        "n8n_hooks.hooks.store_draft",
+        "n8n_hooks.batch",
+        "concurrent.futures",
+    ):
+        assert heavy not in out
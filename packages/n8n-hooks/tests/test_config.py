@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import json
+import stat
 from pathlib import Path
 
-from n8n_hooks.config import load_config
+import pytest
+
+from n8n_hooks import config as config_module
+from n8n_hooks.config import HookConfig, TokenError, load_config, resolve_token_command
 
 
 def test_hook_token_overrides_top_level_token(tmp_path: Path) -> None:
@@ -29,3 +33,57 @@ def test_hook_token_overrides_top_level_token(tmp_path: Path) -> None:
 
     assert config["github"].token == "context-token"
     assert config["store-draft"].token == "mutation-token"
+
+
+def _counting_command(tmp_path: Path, token: str) -> tuple[str, Path]:
+    counter = tmp_path / "calls"
+    return f"echo x >> {counter}; echo {token}", counter
+
+
+def test_token_command_runs_lazily_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    command, counter = _counting_command(tmp_path, "lazy-token")
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "token_command": command,
+                "hooks": {
+                    "rss": {"url": "https://n8n.example.test/context-rss"},
+                    "slack": {"url": "https://n8n.example.test/context-slack"},
+                },
+            }
+        )
+    )
+
+    config = load_config(str(config_path))
+    assert not counter.exists()
+
+    assert config["rss"].bearer_token() == "lazy-token"
+    assert config["slack"].bearer_token() == "lazy-token"
+    assert counter.read_text().count("x") == 1
+
+
+def test_token_cache_file_is_private_and_reused(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+    command, counter = _counting_command(tmp_path, "cached-token")
+
+    assert resolve_token_command(command, cache_ttl=60) == "cached-token"
+    cache_file = tmp_path / "run" / "n8n-hooks" / "tokens.json"
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+    # A fresh process has an empty memo; simulate that and hit the file cache.
+    config_module._memo.clear()
+    assert resolve_token_command(command, cache_ttl=60) == "cached-token"
+    assert counter.read_text().count("x") == 1
+
+
+def test_failing_token_command_raises_token_error() -> None:
+    hook = HookConfig(url="https://n8n.example.test/x", token_command="exit 3")
+
+    with pytest.raises(TokenError, match="exit code 3"):
+        hook.bearer_token()
@@ -0,0 +1,121 @@
+"""Tests for the asyncio transport and the context subcommand."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks import aio
+from n8n_hooks.config import HookConfig
+from n8n_hooks.context import gather_context, prepare
+from n8n_hooks.webhook import WebhookError
+
+DELAY = 0.3
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Answers after DELAY seconds; /chunked replies with chunked encoding."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        time.sleep(DELAY)
+        if self.path == "/fail":
+            self.send_response(500)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"boom")
+            return
+        body = json.dumps(
+            {"status": 200, "body": {"path": self.path, "payload": payload}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 7):
+                chunk = body[start : start + 7]
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def base_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_call_reads_chunked_responses(base_url: str) -> None:
+    hook = HookConfig(url=f"{base_url}/chunked", token="secret")
+
+    result = asyncio.run(aio.call(hook, {"operation": "list-categories"}))
+
+    assert result["body"]["payload"] == {"operation": "list-categories"}
+
+
+def test_async_call_raises_on_http_errors(base_url: str) -> None:
+    with pytest.raises(WebhookError, match="HTTP 500"):
+        asyncio.run(aio.call(HookConfig(url=f"{base_url}/fail"), {}))
+
+
+def test_sources_run_concurrently(base_url: str) -> None:
+    config = {
+        "slack": HookConfig(url=f"{base_url}/slack"),
+        "linkwarden": HookConfig(url=f"{base_url}/linkwarden"),
+        "rss": HookConfig(url=f"{base_url}/fail"),
+    }
+    sources = [
+        ["slack", "search", "nix", "-n", "5"],
+        ["linkwarden", "search-links", "--query", "nix"],
+        ["rss", "list-entries", "--starred"],
+        ["store-draft", "--to", "a@b.c"],
+    ]
+
+    start = time.monotonic()
+    merged = asyncio.run(gather_context(sources, config))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2 * DELAY
+    slack, linkwarden, rss, draft = merged["sources"]
+    assert slack["ok"] and slack["result"]["payload"] == {
+        "operation": "search",
+        "query": "nix",
+        "limit": 5,
+    }
+    assert linkwarden["result"]["path"] == "/linkwarden"
+    assert not rss["ok"] and "HTTP 500" in rss["error"]
+    assert draft == {
+        "source": "store-draft --to a@b.c",
+        "ok": False,
+        "error": "'store-draft' is not a read-only hook",
+        "elapsed_ms": draft["elapsed_ms"],
+    }
+    assert all(record["elapsed_ms"] >= DELAY * 1000 for record in (slack, rss))
+
+
+def test_rejects_operations_that_do_not_post() -> None:
+    with pytest.raises(ValueError, match="discover"):
+        prepare(["github", "discover", "pulls"])
+    with pytest.raises(ValueError, match="file-download"):
+        prepare(["slack", "file-download", "F1", "-o", "/tmp"])
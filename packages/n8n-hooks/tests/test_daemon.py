@@ -0,0 +1,206 @@
+"""Tests for the serve daemon and its thin client."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.client import forward
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CLI = "from n8n_hooks.cli import main; main()"
+
+# An entry id the webhook answers only after SLOW seconds.
+SLOW_ENTRY = 1000
+SLOW = 2.0
+
+
+class _EchoServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _EchoHandler)
+        self.peers: list[int] = []
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _EchoServer
+
+    def do_POST(self) -> None:
+        self.server.peers.append(self.client_address[1])
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        if payload.get("entry_id") == SLOW_ENTRY:
+            time.sleep(SLOW)
+        status = 404 if payload.get("entry_id") == 404 else 200
+        body = json.dumps({"status": status, "body": payload}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def webhook() -> Iterator[_EchoServer]:
+    server = _EchoServer()
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def env(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, webhook: _EchoServer
+) -> Iterator[dict[str, str]]:
+    counter = tmp_path / "token-calls"
+    config = tmp_path / "config" / "n8n-hooks" / "config.json"
+    config.parent.mkdir(parents=True)
+    config.write_text(
+        json.dumps(
+            {
+                "token_command": f"echo x >> {counter}; echo secret",
+                "hooks": {
+                    "rss": {"url": f"http://127.0.0.1:{webhook.server_address[1]}/w"}
+                },
+            }
+        )
+    )
+    runtime = tmp_path / "run"
+    (runtime / "n8n-hooks").mkdir(parents=True)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime))
+    monkeypatch.delenv("N8N_HOOKS_NO_DAEMON", raising=False)
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "XDG_CONFIG_HOME": str(tmp_path / "config"),
+        "XDG_STATE_HOME": str(tmp_path / "daemon-state"),
+        "COUNTER": str(counter),
+    }
+    env.pop("N8N_HOOKS_TOKEN_CACHE_TTL", None)
+    daemon = subprocess.Popen(
+        [sys.executable, "-c", CLI, "serve"],
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert daemon.stderr is not None
+        assert "serving on" in daemon.stderr.readline()
+        yield env
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+def _cli(
+    env: dict[str, str], *argv: str, stdin: str = ""
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, "-c", CLI, *argv],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+        check=False,
+    )
+
+
+def test_calls_are_forwarded_and_keep_tokens_warm(env: dict[str, str]) -> None:
+    first = _cli(env, "rss", "show-entry", "1")
+    second = _cli(env, "rss", "show-entry", "2")
+
+    assert first.returncode == 0, first.stderr
+    assert json.loads(second.stdout) == {"operation": "show-entry", "entry_id": 2}
+    # The daemon resolved the token once; the clients never ran the command.
+    assert Path(env["COUNTER"]).read_text() == "x\n"
+
+
+def test_exit_status_and_stderr_are_replayed(env: dict[str, str]) -> None:
+    failed = _cli(env, "rss", "show-entry", "404")
+    invalid = _cli(env, "rss", "show-entry", "nope")
+
+    assert failed.returncode == 1
+    assert invalid.returncode == 1
+    assert "invalid entry id: nope" in invalid.stderr
+
+
+def test_connections_outlive_requests(
+    env: dict[str, str], webhook: _EchoServer
+) -> None:
+    for entry in ("1", "2", "3"):
+        result = _cli(env, "rss", "show-entry", entry)
+        assert result.returncode == 0, result.stderr
+
+    # One pooled connection served all three invocations.
+    assert len(webhook.peers) == 3
+    assert len(set(webhook.peers)) == 1
+
+
+def test_stdin_is_streamed_for_batch(env: dict[str, str]) -> None:
+    lines = "".join(
+        json.dumps({"hook": "rss", "args": ["show-entry", str(n)]}) + "\n"
+        for n in range(3)
+    )
+    result = _cli(env, "batch", stdin=lines)
+
+    assert result.returncode == 0, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sorted(r["index"] for r in records) == [0, 1, 2]
+
+
+def test_requests_run_side_by_side(env: dict[str, str]) -> None:
+    slow = subprocess.Popen(
+        [sys.executable, "-c", CLI, "rss", "show-entry", str(SLOW_ENTRY)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(0.3)
+        start = time.monotonic()
+        fast = _cli(env, "rss", "show-entry", "1")
+
+        assert fast.returncode == 0, fast.stderr
+        assert time.monotonic() - start < SLOW
+        assert slow.poll() is None
+    finally:
+        assert slow.wait() == 0
+
+
+def test_requests_use_the_client_environment(
+    env: dict[str, str], tmp_path: Path
+) -> None:
+    state = tmp_path / "client-state"
+    result = _cli({**env, "XDG_STATE_HOME": str(state)}, "spool", "status")
+
+    assert result.returncode == 0, result.stderr
+    assert (state / "n8n-hooks" / "spool.sqlite").exists()
+
+
+def test_forward_falls_back_without_daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert forward(["rss", "list-categories"]) is None
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert forward(["rss", "list-categories"]) is None
@@ -0,0 +1,222 @@
+"""Tests for the local Slack channel/user directory."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks import directory
+from n8n_hooks.batch import run_batch
+from n8n_hooks.config import HookConfig
+from n8n_hooks.context import gather_context
+from n8n_hooks.directory import SlackDirectory
+from n8n_hooks.hooks.slack import resolve_names, run
+
+CHANNELS: list[dict[str, Any]] = [
+    {"id": "C1", "name": "general"},
+    {"id": "C2", "name": "dev-ops", "name_normalized": "dev-ops"},
+    {"id": "D1", "is_im": True, "user": "U1"},
+]
+USERS: list[dict[str, Any]] = [
+    {"id": "U1", "name": "ann", "profile": {"display_name": "Ann L"}},
+    {"id": "U2", "name": "bob", "real_name": "Bob Smith"},
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        operation = payload["operation"]
+        if operation == "list-channels":
+            result: Any = {"ok": True, "channels": self.server.channels}
+        elif operation == "list-users":
+            result = {"status": 200, "body": {"ok": True, "members": USERS}}
+        else:
+            result = {"ok": True, "messages": []}
+        body = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.payloads: list[dict[str, Any]] = []
+        self.channels: list[dict[str, Any]] = list(CHANNELS)
+
+    @property
+    def hook(self) -> HookConfig:
+        return HookConfig(
+            url=f"http://127.0.0.1:{self.server_address[1]}/w", token=None
+        )
+
+    def listings(self) -> list[str]:
+        return [
+            p["operation"] for p in self.payloads if p["operation"].startswith("list-")
+        ]
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("N8N_HOOKS_SLACK_DIRECTORY_TTL", raising=False)
+    monkeypatch.setattr(directory, "_pending", {})
+    srv = _Server()
+    Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def warm(server: _Server) -> _Server:
+    """The server, with both directory tables freshly fetched."""
+    SlackDirectory(server.hook, refresh=True).resolve("channels", "general")
+    SlackDirectory(server.hook, refresh=True).resolve("users", "ann")
+    server.payloads.clear()
+    return server
+
+
+def _history(channel: str) -> argparse.Namespace:
+    return argparse.Namespace(op="history", channel=channel, limit=5)
+
+
+def _channels(server: _Server) -> list[str]:
+    return [p["channel"] for p in server.payloads if p["operation"] == "history"]
+
+
+def test_cold_directory_is_fetched_for_channel_arguments(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run(_history("#general"), {"slack": server.hook})
+
+    # Slack cannot take the name, so the empty table is fetched first.
+    assert server.listings() == ["list-channels"]
+    assert not directory.pending()
+
+    run(_history("#Dev-Ops"), {"slack": server.hook})
+    assert _channels(server) == ["C1", "C2"]
+    assert server.listings() == ["list-channels"]
+
+
+def test_cold_directory_defers_search_modifiers(server: _Server) -> None:
+    payload = resolve_names(
+        server.hook, {"operation": "search", "query": "in:#general deploy"}
+    )
+
+    # Slack reads in:#name itself; the listing waits until after the answer.
+    assert payload["query"] == "in:#general deploy"
+    assert server.listings() == []
+    assert directory.pending()
+    directory.refresh_pending()
+    assert server.listings() == ["list-channels"]
+
+
+def test_user_resolves_to_dm_channel(warm: _Server) -> None:
+    payload = resolve_names(warm.hook, {"operation": "replies", "channel": "@Ann L"})
+
+    assert payload["channel"] == "D1"
+
+
+def test_search_modifiers_become_ids(warm: _Server) -> None:
+    payload = resolve_names(
+        warm.hook,
+        {"operation": "search", "query": "in:#general from:@bob to:@nobody deploy"},
+    )
+
+    assert payload["query"] == "in:<#C1> from:<@U2> to:@nobody deploy"
+
+
+def test_unknown_channel_is_passed_through(
+    warm: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run(_history("#missing"), {"slack": warm.hook})
+
+    assert _channels(warm) == ["#missing"]
+    # The miss does not queue a refetch of a table this fresh.
+    assert not directory.pending()
+
+
+def test_ambiguous_name_exits(
+    warm: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    warm.channels = [*CHANNELS, {"id": "C3", "name": "General"}]
+    SlackDirectory(warm.hook).refresh("channels")
+
+    with pytest.raises(SystemExit):
+        run(_history("#general"), {"slack": warm.hook})
+
+    assert "ambiguous Slack name 'general': C1, C3" in capsys.readouterr().err
+
+
+def test_refresh_option_fetches_before_the_lookup(server: _Server) -> None:
+    payload = resolve_names(
+        server.hook, {"operation": "history", "channel": "#general"}, refresh=True
+    )
+
+    assert payload["channel"] == "C1"
+    assert server.listings() == ["list-channels"]
+
+
+def test_batch_and_context_resolve_names(warm: _Server) -> None:
+    config = {"slack": warm.hook}
+    record = {"hook": "slack", "args": ["history", "#dev-ops"]}
+    out = io.StringIO()
+
+    assert run_batch(io.StringIO(json.dumps(record) + "\n"), out, config)
+    sources = [["slack", "search", "in:#general deploy"]]
+    merged = asyncio.run(gather_context(sources, config))
+
+    assert merged["sources"][0]["ok"] is True
+    assert [p.get("channel") or p.get("query") for p in warm.payloads] == [
+        "C2",
+        "in:<#C1> deploy",
+    ]
+
+
+def test_refresh_applies_only_changes(server: _Server, tmp_path: Path) -> None:
+    slack_dir = SlackDirectory(server.hook, path=tmp_path / "dir.sqlite")
+
+    assert slack_dir.refresh("channels") == 3
+    assert slack_dir.refresh("channels") == 0
+
+    server.channels = [{"id": "C1", "name": "announcements"}, CHANNELS[2]]
+    assert slack_dir.refresh("channels") == 1
+    assert slack_dir.resolve("channels", "announcements") == ["C1"]
+    assert slack_dir.resolve("channels", "general") == []
+    assert slack_dir.resolve("channels", "dev-ops") == []
+
+
+def test_expired_table_still_resolves_and_is_queued(
+    server: _Server, tmp_path: Path
+) -> None:
+    path = tmp_path / "dir.sqlite"
+    SlackDirectory(server.hook, path=path).refresh("users")
+    expired = SlackDirectory(server.hook, path=path, ttl=0)
+
+    assert expired.resolve("users", "bob smith") == ["U2"]
+    assert expired.resolve("users", "ann") == ["U1"]
+    assert server.listings() == ["list-users"]
+
+    directory.refresh_pending()
+    assert server.listings() == ["list-users", "list-users"]
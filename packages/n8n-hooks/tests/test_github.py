@@ -5,12 +5,14 @@ from __future__ import annotations
 import argparse
 import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
 from threading import Thread
-from typing import Any
+from typing import Any, ClassVar
 
 import pytest
 
 from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks import github
 from n8n_hooks.hooks.github import build_payload, run
 
 
@@ -118,3 +120,127 @@ def test_http_error_status_exits(capsys: pytest.CaptureFixture[str]) -> None:
 
     captured = capsys.readouterr()
     assert '"message": "Not Found"' in captured.out
+
+
+_SPEC: dict[str, Any] = {
+    "paths": {
+        "/repos/{owner}/{repo}/pulls": {
+            "get": {
+                "summary": "List pull requests",
+                "parameters": [{"$ref": "#/components/parameters/owner"}],
+            },
+            "post": {
+                "summary": "Create a pull request",
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "required": ["head"],
+                                "properties": {"head": {"type": "string"}},
+                            }
+                        }
+                    }
+                },
+            },
+        },
+        "/user": {"get": {"summary": "Get the authenticated user"}},
+    },
+    "components": {
+        "parameters": {
+            "owner": {
+                "name": "owner",
+                "in": "path",
+                "required": True,
+                "schema": {"type": "string"},
+                "description": "The account owner.",
+            }
+        }
+    },
+}
+
+
+class _SpecHandler(BaseHTTPRequestHandler):
+    """Serves the spec with an ETag and answers 304 when it matches."""
+
+    requests: ClassVar[list[str | None]] = []
+
+    def do_GET(self) -> None:
+        _SpecHandler.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(_SPEC).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def spec_server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    server = HTTPServer(("127.0.0.1", 0), _SpecHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        github, "SPEC_URL", f"http://127.0.0.1:{server.server_address[1]}/spec.json"
+    )
+    _SpecHandler.requests = []
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_discover_greps_from_index(
+    spec_server: HTTPServer, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run(_make_args(path="discover", term="PULL"), {})
+
+    out = capsys.readouterr().out
+    assert out == (
+        "/repos/{owner}/{repo}/pulls [get,post]  "
+        "List pull requests | Create a pull request\n"
+    )
+    assert (github._cache_dir() / "github-api.sqlite").exists()
+
+
+def test_discover_answers_without_parsing_spec(
+    spec_server: HTTPServer,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    run(_make_args(path="discover", term="user"), {})
+    capsys.readouterr()
+
+    def _no_json_load(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("spec JSON must not be parsed once indexed")
+
+    monkeypatch.setattr(json, "load", _no_json_load)
+    run(_make_args(path="discover", term="/repos/{owner}/{repo}/pulls"), {})
+
+    out = capsys.readouterr().out
+    assert "GET /repos/{owner}/{repo}/pulls" in out
+    assert "  * owner (path:string)  The account owner." in out
+    assert "POST /repos/{owner}/{repo}/pulls  (write" in out
+    assert "    * head: string" in out
+    assert _SpecHandler.requests == [None]
+
+
+def test_spec_revalidates_with_etag(
+    spec_server: HTTPServer, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run(_make_args(path="discover", term="user"), {})
+    # Pretend the last check was long ago so the next call revalidates.
+    meta = json.loads(github._meta_path().read_text())
+    meta["checked"] = 0
+    github._meta_path().write_text(json.dumps(meta))
+
+    run(_make_args(path="discover", term="user"), {})
+
+    assert _SpecHandler.requests == [None, '"v1"']
+    assert capsys.readouterr().out.count("/user [get]") == 2
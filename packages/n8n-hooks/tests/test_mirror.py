@@ -0,0 +1,231 @@
+"""Tests for the local Linkwarden mirror and search-links --local."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.batch import build_invocation
+from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks.linkwarden import run
+from n8n_hooks.mirror import LinkwardenMirror, UnsupportedError, fts_query
+
+PAGE_SIZE = 2
+
+
+def _link(
+    link_id: int,
+    name: str,
+    tags: list[str],
+    collection: str = "Engineering",
+    description: str = "",
+) -> dict[str, Any]:
+    return {
+        "id": link_id,
+        "name": name,
+        "url": f"https://example.com/{link_id}",
+        "description": description,
+        "collection": {"id": 1, "name": collection},
+        "tags": [{"id": i, "name": tag} for i, tag in enumerate(tags)],
+    }
+
+
+LINKS = [
+    _link(1, "Old notes", ["source:web"], description="nix flakes primer"),
+    _link(2, "Nix flakes guide", ["source:rss", "Nix"]),
+    _link(3, "Rust async book", ["source:rss"], collection="Library"),
+    _link(4, "Nix pills", ["source:web", "Nix"], collection="Library"),
+    _link(5, "C++ tips", ["kind:article"]),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves a Linkwarden-like link listing, newest first, two per page."""
+
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        operation = payload["operation"]
+        links = sorted(self.server.links, key=lambda link: -link["id"])
+        result: Any
+        if operation == "list-collections":
+            result = {"status": 200, "body": {"response": [{"id": 1, "name": "E"}]}}
+        elif operation == "list-tags":
+            result = {"response": [{"id": 1, "name": "Nix"}]}
+        elif operation == "list-links" and self.server.paged:
+            cursor = payload.get("cursor")
+            rest = [link for link in links if cursor is None or link["id"] < cursor]
+            page = rest[:PAGE_SIZE]
+            next_cursor = page[-1]["id"] if len(rest) > PAGE_SIZE else None
+            result = {"data": {"links": page, "nextCursor": next_cursor}}
+        else:
+            result = {"status": 200, "body": links}
+        body = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.payloads: list[dict[str, Any]] = []
+        self.links = list(LINKS)
+        # Whether the workflow implements list-links.
+        self.paged = True
+
+    @property
+    def hook(self) -> HookConfig:
+        return HookConfig(
+            url=f"http://127.0.0.1:{self.server_address[1]}/w", token=None
+        )
+
+    def cursors(self) -> list[Any]:
+        return [
+            p.get("cursor") for p in self.payloads if p["operation"] == "list-links"
+        ]
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv("N8N_HOOKS_LINKWARDEN_MIRROR_MAX_AGE", raising=False)
+    srv = _Server()
+    Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _search(query: str, **overrides: Any) -> argparse.Namespace:
+    defaults: dict[str, Any] = {
+        "op": "search-links",
+        "query": query,
+        "local": True,
+        "tags": [],
+        "collection": None,
+        "limit": 20,
+    }
+    defaults.update(overrides)
+    return argparse.Namespace(**defaults)
+
+
+def _ids(out: str) -> list[int]:
+    return [link["id"] for link in json.loads(out)]
+
+
+def test_sync_fetches_only_new_links(server: _Server) -> None:
+    mirror = LinkwardenMirror(server.hook)
+
+    assert mirror.sync()["links_total"] == 5
+    assert server.cursors() == [None, 4, 2]
+
+    server.links.append(_link(6, "New link", []))
+    server.payloads.clear()
+    summary = mirror.sync()
+
+    # Stops at the first page reaching link 5, the newest already mirrored.
+    assert server.cursors() == [None]
+    assert summary["links_fetched"] == 2
+    assert summary["links_total"] == 6
+
+
+def test_full_sync_drops_deleted_links(server: _Server) -> None:
+    mirror = LinkwardenMirror(server.hook)
+    mirror.sync()
+
+    server.links = [link for link in server.links if link["id"] != 3]
+    summary = mirror.sync(full=True)
+
+    assert summary["links_removed"] == 1
+    assert [link["id"] for link in mirror.search("rust")] == []
+
+
+def test_local_search_ranks_and_filters(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    LinkwardenMirror(server.hook).sync()
+    server.payloads.clear()
+    config = {"linkwarden": server.hook}
+
+    run(_search("nix flakes"), config)
+    # The name match outranks the description-only match.
+    assert _ids(capsys.readouterr().out) == [2, 1]
+
+    run(_search("nix", tags=["nix", "source:web"]), config)
+    assert _ids(capsys.readouterr().out) == [4]
+
+    run(_search("nix", collection="library"), config)
+    assert _ids(capsys.readouterr().out) == [4]
+
+    run(_search("https://example.com/3"), config)
+    assert _ids(capsys.readouterr().out)[0] == 3
+
+    run(_search('c++ "tips'), config)
+    assert _ids(capsys.readouterr().out) == [5]
+
+    assert server.payloads == []
+
+
+def test_stale_mirror_falls_back_to_webhook(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    config = {"linkwarden": server.hook}
+
+    run(_search("nix", tags=["Nix"], limit=1), config)
+
+    captured = capsys.readouterr()
+    assert "searching via n8n" in captured.err
+    assert _ids(captured.out) == [4]
+    assert server.payloads == [{"operation": "search-links", "query": "nix"}]
+
+
+def test_unfiltered_fallback_honors_limit(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    run(_search("nix", limit=2), {"linkwarden": server.hook})
+
+    assert _ids(capsys.readouterr().out) == [5, 4]
+
+
+def test_sync_without_list_links_keeps_searching_via_webhook(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    server.paged = False
+    config = {"linkwarden": server.hook}
+
+    with pytest.raises(UnsupportedError, match="nextCursor"):
+        LinkwardenMirror(server.hook).sync()
+    with pytest.raises(SystemExit):
+        run(argparse.Namespace(op="sync", full=False), config)
+    assert "keep searching via n8n" in capsys.readouterr().err
+
+    run(_search("nix", tags=["Nix"]), config)
+    assert _ids(capsys.readouterr().out) == [4, 2]
+
+
+def test_fts_query_quotes_words() -> None:
+    assert fts_query(' nix  "flakes" AND ') == '"nix" """flakes""" "AND"'
+
+
+def test_batch_rejects_local_operations() -> None:
+    with pytest.raises(ValueError, match="linkwarden sync is not supported"):
+        build_invocation("linkwarden", ["sync"])
+    with pytest.raises(ValueError, match="not supported"):
+        build_invocation("linkwarden", ["search-links", "--query", "x", "--local"])
@@ -0,0 +1,191 @@
+"""Tests for --output and --fields response formatting."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.cli import build_parser, selected_command
+from n8n_hooks.config import HookConfig
+from n8n_hooks.output import parse_fields, project, read_projected, write_response
+from n8n_hooks.streaming import JsonReader
+
+MESSAGES = [
+    {"ts": "1.0", "text": "hello", "user": {"id": "U1", "name": "ann"}, "blocks": []},
+    {"ts": "2.0", "text": "bye", "user": {"id": "U2", "name": "bob"}, "blocks": []},
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every POST with the server's canned response."""
+
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = self.server.raw or json.dumps(self.server.response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    response: Any = None
+    raw: bytes | None = None
+
+    @property
+    def hook(self) -> HookConfig:
+        return HookConfig(
+            url=f"http://127.0.0.1:{self.server_address[1]}/w", token=None
+        )
+
+
+@pytest.fixture
+def server() -> Any:
+    srv = _Server(("127.0.0.1", 0), _Handler)
+    Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _write(
+    server: _Server,
+    response: Any,
+    capsys: pytest.CaptureFixture[str],
+    unwrap: bool = True,
+    **args: Any,
+) -> str:
+    server.response = response
+    write_response(
+        argparse.Namespace(**args), server.hook, {"operation": "search"}, unwrap=unwrap
+    )
+    return capsys.readouterr().out
+
+
+def test_parse_fields() -> None:
+    assert parse_fields("id, user.name,user.id") == {
+        "id": None,
+        "user": {"name": None, "id": None},
+    }
+    # A whole value wins over paths into it, in either order.
+    assert parse_fields("user,user.name") == {"user": None}
+    assert parse_fields("user.name,user") == {"user": None}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_fields("a,,b")
+
+
+def test_read_projected_matches_project() -> None:
+    doc = {"messages": MESSAGES, "ok": True}
+    fields = parse_fields("messages.text,messages.user.name")
+    reader = JsonReader(io.BytesIO(json.dumps(doc).encode()), chunk_size=8)
+
+    assert read_projected(reader, fields) == project(doc, fields)
+    assert project(doc, fields) == {
+        "messages": [
+            {"text": "hello", "user": {"name": "ann"}},
+            {"text": "bye", "user": {"name": "bob"}},
+        ]
+    }
+
+
+def test_ndjson_streams_envelope_body(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = _write(server, {"status": 200, "body": MESSAGES}, capsys, format="ndjson")
+
+    assert [json.loads(line) for line in out.splitlines()] == MESSAGES
+
+
+def test_ndjson_streams_first_array_member(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = _write(
+        server,
+        {"ok": True, "messages": MESSAGES, "has_more": False},
+        capsys,
+        unwrap=False,
+        format="ndjson",
+        fields=parse_fields("ts,user.name"),
+    )
+
+    assert out.splitlines() == [
+        '{"ts": "1.0", "user": {"name": "ann"}}',
+        '{"ts": "2.0", "user": {"name": "bob"}}',
+    ]
+
+
+def test_ndjson_without_array_prints_one_line(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = _write(server, {"ok": False, "error": "not_authed"}, capsys, format="ndjson")
+
+    assert out == '{"ok": false, "error": "not_authed"}\n'
+
+
+def test_json_fields_keeps_structure(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    out = _write(
+        server,
+        {"ok": True, "messages": MESSAGES},
+        capsys,
+        unwrap=False,
+        format="json",
+        fields=parse_fields("text"),
+    )
+
+    assert json.loads(out) == {
+        "ok": True,
+        "messages": [{"text": "hello"}, {"text": "bye"}],
+    }
+
+
+def test_error_status_exits_after_printing(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    server.response = {"status": 404, "body": {"error": "not found", "code": 7}}
+    args = argparse.Namespace(format="ndjson", fields=parse_fields("error"))
+
+    with pytest.raises(SystemExit) as exc:
+        write_response(args, server.hook, {"operation": "search"})
+
+    assert exc.value.code == 1
+    assert json.loads(capsys.readouterr().out) == {"error": "not found"}
+
+
+def test_truncated_response_exits(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    server.raw = b'{"status": 200, "body": [{"id": 1}, {"id"'
+    args = argparse.Namespace(format="ndjson", fields=None)
+
+    with pytest.raises(SystemExit) as exc:
+        write_response(args, server.hook, {"operation": "search"})
+
+    assert exc.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.out == '{"id": 1}\n'
+    assert "invalid JSON response" in captured.err
+
+
+def test_top_level_options_do_not_hide_command() -> None:
+    argv = ["--output", "ndjson", "--fields", "id,title", "rss", "list-categories"]
+
+    assert selected_command(argv) == "rss"
+    args = build_parser(["rss"]).parse_args(argv)
+    assert args.format == "ndjson"
+    assert args.fields == {"id": None, "title": None}
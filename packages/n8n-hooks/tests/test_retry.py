@@ -0,0 +1,241 @@
+"""Tests for retries and the circuit breaker against a failure-injecting server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks import aio
+from n8n_hooks.config import HookConfig, load_config
+from n8n_hooks.retry import (
+    CircuitBreaker,
+    RetryPolicy,
+    endpoint_key,
+    parse_retry_after,
+)
+from n8n_hooks.transport import ConnectionPool
+from n8n_hooks.webhook import WebhookError, call
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FAST = RetryPolicy(attempts=3, base_delay=0.01, max_delay=2)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Plays the server's scripted faults in order, then answers 200."""
+
+    protocol_version = "HTTP/1.1"
+    server: _FaultyServer
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests += 1
+        fault = self.server.faults.pop(0) if self.server.faults else None
+        if fault == "drop":
+            # Hang up without answering, like n8n going down mid-restart.
+            self.close_connection = True
+            return
+        if isinstance(fault, float):
+            time.sleep(fault)
+            fault = None
+        status, headers = fault if isinstance(fault, tuple) else (200, {})
+        body = json.dumps({"ok": status < 400}).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _FaultyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.faults: list[Any] = []
+        self.requests = 0
+
+    def hook(self, **kwargs: Any) -> HookConfig:
+        url = f"http://127.0.0.1:{self.server_address[1]}/w"
+        return HookConfig(url=url, token=None, **kwargs)
+
+
+@pytest.fixture
+def server() -> Any:
+    srv = _FaultyServer()
+    Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_retries_through_a_restart(server: _FaultyServer) -> None:
+    server.faults = [(502, {}), "drop"]
+
+    result = call(server.hook(retry=FAST), {}, pool=ConnectionPool())
+
+    assert result == {"ok": True}
+    assert server.requests == 3
+
+
+def test_gives_up_after_the_last_attempt(server: _FaultyServer) -> None:
+    server.faults = [(503, {})] * 3
+
+    with pytest.raises(WebhookError, match="HTTP 503"):
+        call(server.hook(retry=FAST), {}, pool=ConnectionPool())
+    assert server.requests == 3
+
+
+def test_client_errors_are_not_retried(server: _FaultyServer) -> None:
+    server.faults = [(404, {})]
+
+    with pytest.raises(WebhookError, match="HTTP 404"):
+        call(server.hook(retry=FAST), {}, pool=ConnectionPool())
+    assert server.requests == 1
+
+
+def test_slow_answer_times_out_and_is_retried(server: _FaultyServer) -> None:
+    server.faults = [0.5]
+
+    result = call(server.hook(retry=FAST), {}, pool=ConnectionPool(timeout=0.1))
+
+    assert result == {"ok": True}
+    assert server.requests == 2
+
+
+def test_retry_after_is_honoured(server: _FaultyServer) -> None:
+    server.faults = [(429, {"Retry-After": "1"})]
+
+    start = time.monotonic()
+    call(server.hook(retry=FAST), {}, pool=ConnectionPool())
+
+    assert time.monotonic() - start >= 1
+    assert server.requests == 2
+
+
+def test_retry_after_beyond_max_delay_fails_at_once(server: _FaultyServer) -> None:
+    server.faults = [(503, {"Retry-After": "120"})]
+
+    with pytest.raises(WebhookError, match="HTTP 503"):
+        call(server.hook(retry=FAST), {}, pool=ConnectionPool())
+    assert server.requests == 1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+
+
+def test_breaker_opens_after_consecutive_failures(
+    server: _FaultyServer, tmp_path: Path
+) -> None:
+    path = tmp_path / "circuit.json"
+    breaker = CircuitBreaker(path, threshold=2, cooldown=60)
+    hook = server.hook(breaker=breaker)
+    server.faults = [(503, {})] * 2
+
+    for _ in range(2):
+        with pytest.raises(WebhookError, match="HTTP 503"):
+            call(hook, {}, pool=ConnectionPool())
+    # Open now, also for other processes sharing the state file.
+    other = server.hook(breaker=CircuitBreaker(path, threshold=2, cooldown=60))
+    with pytest.raises(WebhookError, match="is failing"):
+        call(other, {}, pool=ConnectionPool())
+    assert server.requests == 2
+
+
+def test_breaker_lets_one_probe_through(tmp_path: Path) -> None:
+    breaker = CircuitBreaker(tmp_path / "circuit.json", threshold=1, cooldown=0.05)
+    host = "http://n8n.example.test"
+
+    breaker.failure(host)
+    assert breaker.remaining(host) > 0
+    time.sleep(0.06)
+    assert breaker.remaining(host) == 0
+    assert breaker.remaining(host) > 0
+
+    breaker.success(host)
+    assert breaker.remaining(host) == 0
+
+
+def test_breaker_tracks_each_webhook(tmp_path: Path) -> None:
+    breaker = CircuitBreaker(tmp_path / "circuit.json", threshold=1, cooldown=60)
+
+    breaker.failure(endpoint_key("https://n8n.example.test/webhook/rss?x=1"))
+
+    assert breaker.remaining(endpoint_key("https://N8N.example.test/webhook/rss")) > 0
+    assert (
+        breaker.remaining(endpoint_key("https://n8n.example.test/webhook/draft")) == 0
+    )
+
+
+def test_breaker_processes_keep_every_failure(tmp_path: Path) -> None:
+    path = tmp_path / "circuit.json"
+    code = (
+        "import sys; from pathlib import Path\n"
+        "from n8n_hooks.retry import CircuitBreaker\n"
+        "breaker = CircuitBreaker(Path(sys.argv[1]), threshold=1000)\n"
+        "for _ in range(50):\n"
+        "    breaker.failure('http://n8n.example.test/w')\n"
+    )
+    procs = [
+        subprocess.Popen([sys.executable, "-c", code, str(path)], cwd=ROOT)
+        for _ in range(3)
+    ]
+    assert [proc.wait() for proc in procs] == [0, 0, 0]
+
+    state = json.loads(path.read_text())
+    assert state["http://n8n.example.test/w"]["failures"] == 150
+
+
+def test_async_call_retries(server: _FaultyServer) -> None:
+    server.faults = [(504, {})]
+
+    result = asyncio.run(aio.call(server.hook(retry=FAST), {}))
+
+    assert result == {"ok": True}
+    assert server.requests == 2
+
+
+def test_only_read_only_hooks_get_retries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps(
+            {
+                "retry": {"attempts": 4},
+                "hooks": {
+                    "rss": {"url": "https://n8n.example.test/rss"},
+                    "slack": {"url": "https://n8n.example.test/slack", "retry": False},
+                    "store-draft": {"url": "https://n8n.example.test/draft"},
+                },
+            }
+        )
+    )
+
+    config = load_config(str(path))
+
+    assert config["rss"].retry == RetryPolicy(attempts=4)
+    assert config["slack"].retry is None
+    assert config["store-draft"].retry is None
+    breaker = config["rss"].breaker
+    assert breaker is not None
+    assert breaker is config["store-draft"].breaker
+    assert breaker.path == tmp_path / "n8n-hooks" / "circuit.json"
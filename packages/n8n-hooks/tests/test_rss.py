@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import argparse
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from threading import Thread
-from typing import Any
+from typing import Any, ClassVar
 
 import pytest
 
+from n8n_hooks.cli import build_parser
 from n8n_hooks.config import HookConfig
 from n8n_hooks.hooks.rss import build_payload, run
 
@@ -147,3 +148,72 @@ def test_http_error_status_exits(capsys: pytest.CaptureFixture[str]) -> None:
 
     captured = capsys.readouterr()
     assert '"message": "Not Found"' in captured.out
+
+
+class _PagedRssWebhookHandler(BaseHTTPRequestHandler):
+    """Serves 7 entries in pages of the requested size."""
+
+    protocol_version = "HTTP/1.1"
+    requests: ClassVar[list[dict[str, Any]]] = []
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        _PagedRssWebhookHandler.requests.append(payload)
+        start, limit = payload["offset"], payload["limit"]
+        entries = [{"id": i} for i in range(start, min(start + limit, 7))]
+        body = json.dumps({"status": 200, "body": {"total": 7, "entries": entries}})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    ("max_entries", "expected_ids", "expected_offsets"),
+    [(None, list(range(7)), [0, 3, 6]), (4, [0, 1, 2, 3], [0, 3])],
+)
+def test_list_entries_all_streams_pages_as_jsonl(
+    capsys: pytest.CaptureFixture[str],
+    max_entries: int | None,
+    expected_ids: list[int],
+    expected_offsets: list[int],
+) -> None:
+    _PagedRssWebhookHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PagedRssWebhookHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    config = {
+        "rss": HookConfig(url=f"http://127.0.0.1:{server.server_address[1]}/w"),
+    }
+
+    try:
+        run(
+            _make_args(limit=3, all=max_entries is None, max=max_entries),
+            config,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == expected_ids
+    assert [r["offset"] for r in _PagedRssWebhookHandler.requests] == expected_offsets
+    assert all(r["limit"] == 3 for r in _PagedRssWebhookHandler.requests)
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_list_entries_max_must_be_positive(
+    capsys: pytest.CaptureFixture[str], value: str
+) -> None:
+    parser = build_parser(["rss"])
+
+    with pytest.raises(SystemExit) as exc:
+        parser.parse_args(["rss", "list-entries", "--max", value])
+
+    assert exc.value.code == 2
+    assert "expected a positive integer" in capsys.readouterr().err
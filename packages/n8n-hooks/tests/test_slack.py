@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import base64
+import io
 import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
@@ -13,7 +14,11 @@ from typing import Any
 import pytest
 
 from n8n_hooks.config import HookConfig
-from n8n_hooks.hooks.slack import _write_download, build_payload, run
+from n8n_hooks.hooks.slack import (
+    _stream_download,
+    build_payload,
+    run,
+)
 
 
 def _make_args(**overrides: Any) -> argparse.Namespace:
@@ -94,18 +99,14 @@ def test_file_download_payload() -> None:
     }
 
 
-def test_write_download(tmp_path: Path) -> None:
-    result = _write_download(
-        {
-            "ok": True,
-            "content_base64": base64.b64encode(b"hello").decode(),
-            "file": {"name": "../hello.txt", "mimetype": "text/plain"},
-        },
-        str(tmp_path),
-    )
+def test_stream_download_keeps_the_file_in_the_target_dir(tmp_path: Path) -> None:
+    response = _download_response(b"hello", name="../hello.txt")
+    result = _stream_download(io.BytesIO(response), str(tmp_path))
 
     assert result["ok"] is True
-    assert Path(str(result["path"])).read_bytes() == b"hello"
+    path = Path(str(result["path"]))
+    assert path.parent == tmp_path
+    assert path.read_bytes() == b"hello"
 
 
 class _FakeSlackWebhookHandler(BaseHTTPRequestHandler):
@@ -134,6 +135,14 @@ class _FakeSlackWebhookHandler(BaseHTTPRequestHandler):
         pass
 
 
+@pytest.fixture
+def cold_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """An empty Slack directory, so no name resolves."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr("n8n_hooks.directory._pending", {})
+
+
+@pytest.mark.usefixtures("cold_directory")
 def test_end_to_end(capsys: pytest.CaptureFixture[str]) -> None:
     server = HTTPServer(("127.0.0.1", 0), _FakeSlackWebhookHandler)
     port = server.server_address[1]
@@ -146,6 +155,8 @@ def test_end_to_end(capsys: pytest.CaptureFixture[str]) -> None:
             token="test-secret",
         ),
     }
+    # The one request the server answers is the search itself: a cold
+    # directory passes the name through instead of fetching a listing first.
     run(_make_args(), config)
 
     thread.join(timeout=5)
@@ -159,3 +170,79 @@ def test_end_to_end(capsys: pytest.CaptureFixture[str]) -> None:
 
     captured = capsys.readouterr()
     assert '"text": "deploy done"' in captured.out
+
+
+def _download_response(data: bytes, name: str = "deck.pptx") -> bytes:
+    # content_base64 deliberately precedes the metadata fields.
+    return json.dumps(
+        {
+            "content_base64": base64.b64encode(data).decode(),
+            "ok": True,
+            "file": {"id": "F0123", "name": name},
+        }
+    ).encode()
+
+
+def test_stream_download_decodes_to_disk(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 1000
+    result = _stream_download(io.BytesIO(_download_response(data)), str(tmp_path))
+
+    assert result["ok"] is True
+    assert result["bytes"] == len(data)
+    assert Path(str(result["path"])) == tmp_path / "deck.pptx"
+    assert (tmp_path / "deck.pptx").read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir()] == ["deck.pptx"]
+
+
+def test_stream_download_leaves_nothing_on_failure(tmp_path: Path) -> None:
+    failed = _stream_download(
+        io.BytesIO(b'{"ok": false, "error": "file_too_large"}'), str(tmp_path)
+    )
+    truncated = _stream_download(
+        io.BytesIO(_download_response(b"abcdef")[:30]), str(tmp_path / "out.bin")
+    )
+
+    assert failed == {"ok": False, "error": "file_too_large"}
+    assert truncated["error"] == "invalid_response"
+    assert list(tmp_path.iterdir()) == []
+
+
+class _DownloadHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(_download_response(b"%PDF-report", name="report.pdf"))
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+def test_file_download_end_to_end(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    server = HTTPServer(("127.0.0.1", 0), _DownloadHandler)
+    thread = Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    config = {
+        "slack": HookConfig(
+            url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None
+        )
+    }
+    run(
+        _make_args(
+            op="file-download",
+            query=None,
+            file="F0123",
+            output=str(tmp_path),
+            max_bytes=1024,
+            limit=None,
+        ),
+        config,
+    )
+    thread.join(timeout=5)
+    server.server_close()
+
+    assert (tmp_path / "report.pdf").read_bytes() == b"%PDF-report"
+    assert json.loads(capsys.readouterr().out)["bytes"] == len(b"%PDF-report")
@@ -0,0 +1,187 @@
+"""Tests for the --async spool of write-hook requests."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.batch import build_invocation
+from n8n_hooks.config import HookConfig
+from n8n_hooks.hooks import linkwarden_link_create
+from n8n_hooks.spool import Spool, flush
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Accepts links and bulk tasks; URLs and titles containing "bad" fail.
+
+    A bulk request with a title containing "broken" fails as a whole.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        result: Any
+        if payload["operation"] == "create_tasks_from_template":
+            results = [
+                {"error": "rejected"} if "bad" in task["title"] else {"id": i}
+                for i, task in enumerate(payload["tasks"])
+            ]
+            result = {"status": 200, "body": {"results": results}}
+            if any("broken" in task["title"] for task in payload["tasks"]):
+                result = {"status": 500, "body": {"error": "workflow failed"}}
+        elif "bad" in payload["url"]:
+            result = {"status": 422, "body": {"error": "invalid url"}}
+        else:
+            result = {"status": 200, "body": {"id": 1}}
+        body = json.dumps(result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.payloads: list[dict[str, Any]] = []
+
+    @property
+    def config(self) -> dict[str, HookConfig]:
+        url = f"http://127.0.0.1:{self.server_address[1]}/w"
+        return {
+            "linkwarden-link-create": HookConfig(url=url, token=None),
+            "vikunja-task-create": HookConfig(url=url, token=None),
+        }
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Any:
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+    srv = _Server()
+    Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _link(url: str) -> dict[str, Any]:
+    return {"operation": "create-link", "url": url, "collection": "Inbox"}
+
+
+def _task(title: str) -> dict[str, Any]:
+    return {"operation": "create_task_from_template", "title": title}
+
+
+def test_async_spools_instead_of_sending(
+    server: _Server, capsys: pytest.CaptureFixture[str]
+) -> None:
+    args = argparse.Namespace(
+        url="https://example.com",
+        name="Example",
+        description=None,
+        description_file=None,
+        collection="Inbox",
+        tags=["kind:article"],
+        spool=True,
+    )
+
+    linkwarden_link_create.run(args, server.config)
+
+    out = json.loads(capsys.readouterr().out)
+    assert out["spooled"] is True
+    assert server.payloads == []
+    status = Spool().status()
+    assert status["pending"] == 1
+    assert status["hooks"]["linkwarden-link-create"]["pending"] == 1
+
+
+def test_flush_batches_tasks_and_sends_each_once(server: _Server) -> None:
+    spool = Spool()
+    keys = [spool.enqueue("vikunja-task-create", _task(f"t{i}"))[1] for i in range(3)]
+    spool.enqueue("linkwarden-link-create", _link("https://example.com"))
+
+    assert flush(spool, server.config) == {
+        "sent": 4,
+        "retrying": 0,
+        "failed": 0,
+        "remaining": 0,
+    }
+    bulk, link = server.payloads
+    assert [task["idempotency_key"] for task in bulk["tasks"]] == keys
+    assert link["operation"] == "create-link"
+    assert flush(spool, server.config)["sent"] == 0
+
+
+def test_unreachable_webhook_is_retried_with_same_key(server: _Server) -> None:
+    spool = Spool()
+    _, key = spool.enqueue("linkwarden-link-create", _link("https://example.com"))
+    down = {
+        "linkwarden-link-create": HookConfig(url="http://127.0.0.1:9/w", token=None)
+    }
+
+    assert flush(spool, down)["retrying"] == 1
+    # Backing off: a plain flush leaves the job alone.
+    assert flush(spool, server.config)["remaining"] == 1
+    assert server.payloads == []
+
+    assert flush(spool, server.config, now=True)["sent"] == 1
+    assert server.payloads[0]["idempotency_key"] == key
+
+
+def test_rejected_jobs_are_kept_as_failed(server: _Server) -> None:
+    spool = Spool()
+    spool.enqueue("linkwarden-link-create", _link("https://bad.example"))
+    spool.enqueue("vikunja-task-create", _task("bad task"))
+    spool.enqueue("vikunja-task-create", _task("good task"))
+
+    counts = flush(spool, server.config)
+
+    assert (counts["sent"], counts["failed"]) == (1, 2)
+    status = spool.status()
+    assert (status["pending"], status["failed"]) == (0, 2)
+    assert "invalid url" in status["recent_failures"][-1]["error"]
+    assert spool.requeue_failed() == 2
+    assert spool.status()["pending"] == 2
+
+
+def test_rejected_bulk_request_fails_like_a_single_job(server: _Server) -> None:
+    spool = Spool()
+    spool.enqueue("vikunja-task-create", _task("broken task"))
+    spool.enqueue("vikunja-task-create", _task("good task"))
+    spool.enqueue("linkwarden-link-create", _link("https://bad.example"))
+
+    counts = flush(spool, server.config)
+
+    assert (counts["retrying"], counts["failed"]) == (0, 3)
+    assert "workflow failed" in spool.status()["recent_failures"][-1]["error"]
+
+
+def test_claimed_jobs_are_leased(server: _Server) -> None:
+    spool = Spool()
+    spool.enqueue("linkwarden-link-create", _link("https://example.com"))
+
+    assert len(spool.claim()) == 1
+    assert spool.claim() == []
+
+
+def test_batch_rejects_async() -> None:
+    with pytest.raises(ValueError, match="--async"):
+        build_invocation(
+            "linkwarden-link-create",
+            ["--url", "https://example.com", "--collection", "Inbox", "--async"],
+        )
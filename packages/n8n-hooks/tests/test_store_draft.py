@@ -8,7 +8,7 @@ import json
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from threading import Thread
-from typing import Any
+from typing import Any, ClassVar
 from unittest.mock import patch
 
 import pytest
@@ -120,3 +120,54 @@ def test_end_to_end(capsys: pytest.CaptureFixture[str]) -> None:
 
     captured = capsys.readouterr()
     assert '"status": "ok"' in captured.out
+
+
+def _read_chunked(handler: BaseHTTPRequestHandler) -> bytes:
+    body = b""
+    while True:
+        size = int(handler.rfile.readline().strip(), 16)
+        if size == 0:
+            handler.rfile.readline()
+            return body
+        body += handler.rfile.read(size)
+        handler.rfile.readline()
+
+
+class _ChunkedWebhookHandler(BaseHTTPRequestHandler):
+    """Decodes a chunked request body and records how it was sent."""
+
+    transfer_encoding: str | None = None
+    last_payload: ClassVar[dict[str, Any]] = {}
+
+    def do_POST(self) -> None:
+        _ChunkedWebhookHandler.transfer_encoding = self.headers.get("Transfer-Encoding")
+        _ChunkedWebhookHandler.last_payload = json.loads(_read_chunked(self))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"status":"ok"}')
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+def test_attachments_are_streamed_chunked(tmp_path: Path) -> None:
+    pdf = tmp_path / "big.pdf"
+    pdf.write_bytes(b"%PDF-" + bytes(range(256)) * 4096)
+
+    server = HTTPServer(("127.0.0.1", 0), _ChunkedWebhookHandler)
+    thread = Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    config = {
+        "store-draft": HookConfig(
+            url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None
+        )
+    }
+    run(_make_args(attach=[str(pdf)]), config)
+    thread.join(timeout=5)
+    server.server_close()
+
+    assert _ChunkedWebhookHandler.transfer_encoding == "chunked"
+    att = _ChunkedWebhookHandler.last_payload["attachments"][0]
+    assert att["filename"] == "big.pdf"
+    assert base64.b64decode(att["data"]) == pdf.read_bytes()
@@ -0,0 +1,166 @@
+"""Tests for streaming request bodies."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from n8n_hooks.streaming import (
+    Base64File,
+    Base64Sink,
+    GzipReader,
+    JsonReader,
+    JsonStreamError,
+    gzip_bytes,
+    gzip_chunks,
+    has_streams,
+    iter_json,
+)
+
+
+def test_iter_json_matches_in_memory_encoding(tmp_path: Path) -> None:
+    first = tmp_path / "a.bin"
+    second = tmp_path / "b.bin"
+    first.write_bytes(bytes(range(256)) * 10)
+    second.write_bytes(b"")
+    payload = {
+        "subject": 'quotes " and @@ markers',
+        "attachments": [
+            {"filename": "a.bin", "data": Base64File(first, chunk_size=3 * 7)},
+            {"filename": "b.bin", "data": Base64File(second)},
+        ],
+    }
+
+    streamed = json.loads(b"".join(iter_json(payload)))
+
+    assert streamed == {
+        "subject": 'quotes " and @@ markers',
+        "attachments": [
+            {
+                "filename": "a.bin",
+                "data": base64.b64encode(first.read_bytes()).decode(),
+            },
+            {"filename": "b.bin", "data": ""},
+        ],
+    }
+
+
+def test_iter_json_reads_file_lazily(tmp_path: Path) -> None:
+    path = tmp_path / "late.bin"
+    path.write_bytes(b"x")
+    chunks = iter_json({"data": Base64File(path)})
+    path.write_bytes(b"written after building the payload")
+
+    decoded = json.loads(b"".join(chunks))["data"]
+
+    assert base64.b64decode(decoded) == b"written after building the payload"
+
+
+def test_has_streams(tmp_path: Path) -> None:
+    assert has_streams({"a": [{"b": Base64File(tmp_path)}]})
+    assert not has_streams({"a": [{"b": "text"}]})
+
+
+def test_chunk_size_must_avoid_padding(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        Base64File(tmp_path, chunk_size=1000)
+
+
+class _Trickle:
+    """A byte stream that hands out at most *step* bytes per read."""
+
+    def __init__(self, data: bytes, step: int) -> None:
+        self._data = data
+        self._step = step
+
+    def read(self, size: int = -1) -> bytes:
+        return self.read1(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        chunk = self._data[: min(size, self._step)]
+        self._data = self._data[len(chunk) :]
+        return chunk
+
+
+def _walk(reader: JsonReader) -> Any:
+    """Rebuild a document through the pull API to exercise every path."""
+    char = reader.peek()
+    if char == "{":
+        return {key: _walk(reader) for key in reader.object_keys()}
+    if char == "[":
+        return [_walk(reader) for _ in reader.array_items()]
+    if char == '"':
+        return "".join(reader.string_chunks())
+    return reader.value()
+
+
+@pytest.mark.parametrize("step", [1, 3, 64])
+def test_json_reader_round_trips(step: int) -> None:
+    doc = {
+        "ok": True,
+        "n": [12345, -1.5e3, None, False, {}],
+        "text": 'esc \\ "q" \n tab\t é \U0001f600 / end',
+        "nested": [{"a": []}, {"b": {"c": "d"}}],
+    }
+    encoded = json.dumps(doc).encode()
+
+    assert _walk(JsonReader(_Trickle(encoded, step), chunk_size=5)) == doc
+    assert (
+        _walk(JsonReader(io.BytesIO(json.dumps(doc, ensure_ascii=False).encode())))
+        == doc
+    )
+
+
+def test_json_reader_skip_and_errors() -> None:
+    reader = JsonReader(io.BytesIO(b'{"big": {"x": ["y", 1]}, "keep": 2}'))
+    seen = {}
+    for key in reader.object_keys():
+        if key == "big":
+            reader.skip()
+        else:
+            seen[key] = reader.value()
+    assert seen == {"keep": 2}
+    assert reader.at_end()
+
+    with pytest.raises(JsonStreamError):
+        list(JsonReader(io.BytesIO(b'{"a" 1}')).object_keys())
+    with pytest.raises(JsonStreamError):
+        _walk(JsonReader(io.BytesIO(b'{"a": "unterminated')))
+
+
+def test_base64_sink_decodes_arbitrary_splits() -> None:
+    data = bytes(range(256)) * 3
+    text = base64.b64encode(data).decode()
+    out = io.BytesIO()
+    sink = Base64Sink(out)
+    for i in range(0, len(text), 7):
+        sink.write(text[i : i + 7])
+    sink.close()
+
+    assert out.getvalue() == data
+    assert sink.written == len(data)
+
+
+def test_gzip_reader_feeds_json_reader() -> None:
+    payload = {"items": [{"id": i, "text": "x" * 50} for i in range(500)]}
+    encoded = b"".join(gzip_chunks(iter_json(payload)))
+    assert gzip.decompress(encoded) == json.dumps(payload).encode()
+
+    reader = JsonReader(GzipReader(io.BytesIO(encoded), chunk_size=64))
+    assert reader.value() == payload
+    assert reader.at_end()
+
+
+def test_gzip_reader_rejects_truncated_body() -> None:
+    encoded = gzip_bytes(b'{"ok": true}' * 100)
+
+    with pytest.raises(OSError, match="truncated"):
+        GzipReader(io.BytesIO(encoded[:-10])).read()
+    with pytest.raises(OSError, match="invalid gzip"):
+        GzipReader(io.BytesIO(b"not gzip")).read()
@@ -0,0 +1,155 @@
+"""Tests for template loading, compiled validation, and the template index."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from n8n_hooks import templates
+from n8n_hooks.templates import (
+    TemplateError,
+    compile_schema,
+    list_templates,
+    load_template,
+    validate_context,
+)
+
+
+@pytest.fixture(autouse=True)
+def _cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(templates, "_loaded", {})
+
+
+SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["summary"],
+    "properties": {
+        "summary": {"type": "string", "minLength": 1},
+        "node": {"$ref": "#/$defs/Node"},
+    },
+    "$defs": {
+        "Kind": {"type": "string", "enum": ["a", "b"]},
+        "Node": {
+            "type": "object",
+            "required": ["kind"],
+            "properties": {
+                "kind": {"$ref": "#/$defs/Kind"},
+                "children": {"type": "array", "items": {"$ref": "#/$defs/Node"}},
+            },
+        },
+    },
+}
+
+
+def _write(
+    base: Path, name: str, description: str = "A template.", nested: bool = False
+) -> Path:
+    data = {
+        "name": name,
+        "description": description,
+        "defaults": {"priority": 1},
+        "schema": SCHEMA,
+    }
+    path = base / name / "template.md" if nested else base / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("---\n" + yaml.safe_dump(data) + "---\n")
+    return path
+
+
+def test_compiled_validator_follows_recursive_refs() -> None:
+    validate = compile_schema(SCHEMA)
+    context = {
+        "summary": "",
+        "extra": 1,
+        "node": {"kind": "a", "children": [{"kind": "c"}, {"children": []}]},
+    }
+
+    assert validate(context, []) == [
+        "summary: is required",
+        "extra: is not allowed",
+        "summary: must be at least 1 characters",
+        "node.children.0.kind: must be one of: a, b",
+        "node.children.1.kind: is required",
+    ]
+
+
+def test_unknown_ref_is_reported_at_validation() -> None:
+    validate = compile_schema({"type": "array", "items": {"$ref": "#/$defs/Nope"}})
+
+    assert validate(["x"], ["items"]) == ["items.0: unknown schema reference"]
+
+
+def test_second_load_skips_yaml(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write(tmp_path, "review")
+    first = load_template("review", str(tmp_path))
+
+    monkeypatch.setattr(templates, "_loaded", {})
+    monkeypatch.setattr(templates, "_read_template", _fail)
+    second = load_template("review", str(tmp_path))
+
+    assert second == first
+    assert validate_context(second, {"summary": "ok"}) == []
+
+
+def test_edited_template_is_reloaded(tmp_path: Path) -> None:
+    path = _write(tmp_path, "review", "Old.")
+    assert load_template("review", str(tmp_path)).description == "Old."
+
+    _write(tmp_path, "review", "New and longer.")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+
+    assert load_template("review", str(tmp_path)).description == "New and longer."
+
+
+def test_list_templates_uses_index_until_dirs_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base = tmp_path / "templates"
+    _write(base, "review")
+    _write(base, "bug", nested=True)
+    (base / "broken.md").write_text("no frontmatter")
+
+    names = [t.name for t in list_templates(str(base))]
+    assert names == ["bug", "review"]
+
+    with monkeypatch.context() as patch:
+        patch.setattr(templates, "_scan_dir", _fail)
+        assert [t.name for t in list_templates(str(base))] == names
+
+    _write(base, "plan")
+    os.utime(base, ns=(0, base.stat().st_mtime_ns + 1))
+    assert [t.name for t in list_templates(str(base))] == ["bug", "plan", "review"]
+
+
+def test_template_name_must_match_file_name(tmp_path: Path) -> None:
+    _write(tmp_path, "review")
+    (tmp_path / "review.md").rename(tmp_path / "other.md")
+
+    with pytest.raises(TemplateError, match="does not match"):
+        load_template("other", str(tmp_path))
+
+
+def test_cached_load_does_not_import_yaml(tmp_path: Path) -> None:
+    _write(tmp_path, "review")
+    load_template("review", str(tmp_path))
+    templates._loaded.clear()
+
+    saved = sys.modules.pop("yaml")
+    try:
+        load_template("review", str(tmp_path))
+        assert "yaml" not in sys.modules
+    finally:
+        sys.modules["yaml"] = saved
+
+
+def _fail(*_args: Any) -> Any:
+    raise AssertionError("cache miss")
@@ -0,0 +1,128 @@
+"""Tests for per-phase latency tracing."""
+
+from __future__ import annotations
+
+import io
+import json
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks import trace
+from n8n_hooks.cli import execute
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"status":200,"body":[]}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def config_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    monkeypatch.delenv(trace.ENV, raising=False)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    path = tmp_path / "config.json"
+    url = f"http://127.0.0.1:{server.server_address[1]}/w"
+    path.write_text(json.dumps({"token": "t", "hooks": {"rss": {"url": url}}}))
+    yield str(path)
+    server.shutdown()
+    server.server_close()
+
+
+def test_trace_flag_writes_one_json_line(
+    config_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    execute(["--config", config_path, "--trace", "rss", "list-categories"])
+
+    (line,) = capsys.readouterr().err.splitlines()
+    record = json.loads(line)
+    assert record["command"] == "rss"
+    assert record["operation"] == "list-categories"
+    assert record["exit"] == 0
+    phases = {p["phase"]: p for p in record["phases"]}
+    expected = {"parse", "config", "run", "token", "send", "ttfb", "download"}
+    assert expected | {"decode"} <= set(phases)
+    assert phases["ttfb"]["hook"] == "rss"
+    assert phases["ttfb"]["operation"] == "list-categories"
+    assert record["total_ms"] >= phases["run"]["ms"]
+
+
+def test_env_appends_to_file_and_records_exit_status(
+    config_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    out = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(trace.ENV, str(out))
+
+    execute(["--config", config_path, "rss", "list-categories"])
+    with pytest.raises(SystemExit):
+        execute(["--config", config_path, "rss", "show-entry", "nope"])
+
+    first, second = (json.loads(line) for line in out.read_text().splitlines())
+    assert first["exit"] == 0
+    assert second["exit"] == 1
+
+
+def test_batch_workers_record_into_the_invocation_trace(
+    config_path: str,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    lines = [
+        json.dumps({"hook": "rss", "args": ["show-entry", str(n)]}) for n in range(2)
+    ]
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(lines) + "\n"))
+
+    execute(["--config", config_path, "--trace", "batch", "--jobs", "2"])
+
+    record = json.loads(capsys.readouterr().err.splitlines()[-1])
+    ttfb = [p for p in record["phases"] if p["phase"] == "ttfb"]
+    assert [p["operation"] for p in ttfb] == ["show-entry", "show-entry"]
+
+
+def test_tracing_is_off_by_default(
+    config_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    execute(["--config", config_path, "rss", "list-categories"])
+
+    assert capsys.readouterr().err == ""
+    assert trace.span("x") is trace.span("y")
+
+
+def test_summarize_groups_by_hook_and_operation() -> None:
+    lines = [
+        json.dumps(
+            {
+                "command": "rss",
+                "operation": "list-categories",
+                "total_ms": total,
+                "phases": [
+                    {"phase": "ttfb", "ms": total / 2, "hook": "rss"},
+                    {"phase": "parse", "ms": 1.0},
+                ],
+            }
+        )
+        for total in (10.0, 20.0, 30.0)
+    ]
+
+    rows = {row[:3]: row[3:] for row in trace.summarize([*lines, "not json"])}
+
+    assert rows[("rss", "list-categories", "total")][:2] == (3, 20.0)
+    assert rows[("rss", "list-categories", "ttfb")][:2] == (3, 10.0)
+    assert rows[("rss", "list-categories", "parse")][:2] == (3, 1.0)
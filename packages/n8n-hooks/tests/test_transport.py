@@ -0,0 +1,274 @@
+"""Tests for the pooled HTTP transport."""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import socket
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from typing import Any
+
+import pytest
+
+from n8n_hooks.config import HookConfig
+from n8n_hooks.retry import RetryPolicy
+from n8n_hooks.streaming import Base64File
+from n8n_hooks.transport import ConnectionPool, RedirectError
+from n8n_hooks.webhook import WebhookError, call, open_response, post
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Echoes the POST body back over an HTTP/1.1 keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    server: _CountingServer
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        chunks = []
+        while size := int(self.rfile.readline().split(b";")[0], 16):
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        self.rfile.readline()
+        return b"".join(chunks)
+
+    def _redirect(self, status: int, location: str) -> None:
+        self.send_response(status)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.server.paths.append(self.path)
+        if self.path.endswith("/old"):
+            self._redirect(302, "/new")
+            return
+        body = b"moved here"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        raw = self._read_body()
+        if self.path.endswith("/moved"):
+            self.server.paths.append(self.path)
+            self._redirect(301, "/w")
+            return
+        self.server.request_encodings.append(self.headers.get("Content-Encoding"))
+        if self.server.drop_after > 0:
+            self.server.drop_after -= 1
+        elif self.server.drop_after == 0:
+            # Hang up without answering, like a proxy timing out mid-request.
+            self.server.drop_after = -1
+            self.close_connection = True
+            return
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        payload = json.loads(raw)
+        body = json.dumps({"echo": payload}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+    # Requests answered before one is dropped unanswered (-1: none).
+    drop_after = -1
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.request_encodings: list[str | None] = []
+        self.paths: list[str] = []
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        self.connections += 1
+        return super().get_request()
+
+
+@pytest.fixture
+def server() -> Any:
+    srv = _CountingServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_repeated_posts_reuse_one_connection(server: _CountingServer) -> None:
+    pool = ConnectionPool()
+    hook = HookConfig(url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None)
+
+    for i in range(5):
+        assert post(hook, {"n": i}, pool=pool) == {"echo": {"n": i}}
+
+    assert server.connections == 1
+    assert pool.idle_count() == 1
+    pool.close()
+
+
+def test_stale_connection_is_replaced(server: _CountingServer) -> None:
+    pool = ConnectionPool()
+    hook = HookConfig(url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None)
+
+    post(hook, {"n": 1}, pool=pool)
+    # Simulate the server dropping the idle keep-alive socket.
+    for conns in pool._idle.values():
+        for conn in conns:
+            assert conn.sock is not None
+            conn.sock.shutdown(socket.SHUT_RDWR)
+
+    assert post(hook, {"n": 2}, pool=pool) == {"echo": {"n": 2}}
+    assert server.connections == 2
+    pool.close()
+
+
+def test_dropped_reads_are_resent_but_writes_are_not(
+    server: _CountingServer,
+) -> None:
+    pool = ConnectionPool()
+    url = f"http://127.0.0.1:{server.server_address[1]}/w"
+    read = HookConfig(url=url, token=None, name="rss")
+    write = HookConfig(url=url, token=None, name="store-draft")
+
+    server.drop_after = 1
+    post(read, {"n": 1}, pool=pool)
+    assert post(read, {"n": 2}, pool=pool) == {"echo": {"n": 2}}
+    assert len(server.request_encodings) == 3
+
+    server.drop_after = 1
+    post(write, {"n": 3}, pool=pool)
+    with pytest.raises(WebhookError), open_response(write, {"n": 4}, pool=pool):
+        pass
+    assert len(server.request_encodings) == 5
+    pool.close()
+
+
+def test_connection_refused_exits(capsys: pytest.CaptureFixture[str]) -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    hook = HookConfig(url=f"http://127.0.0.1:{port}/w", token=None)
+    with pytest.raises(SystemExit):
+        post(hook, {}, pool=ConnectionPool())
+
+    assert "connection error" in capsys.readouterr().err
+
+
+def test_small_bodies_are_sent_uncompressed(server: _CountingServer) -> None:
+    pool = ConnectionPool()
+    url = f"http://127.0.0.1:{server.server_address[1]}/w"
+    hook = HookConfig(url=url, token=None, gzip_min_bytes=1024)
+
+    assert post(hook, {"n": 1}, pool=pool) == {"echo": {"n": 1}}
+    assert post(hook, {"text": "x" * 2048}, pool=pool) == {"echo": {"text": "x" * 2048}}
+
+    assert server.request_encodings == [None, "gzip"]
+    # Gzipped responses were read to the end, so the connection was reused.
+    assert server.connections == 1
+    pool.close()
+
+
+def test_streamed_bodies_are_gzipped(server: _CountingServer, tmp_path: Path) -> None:
+    attachment = tmp_path / "a.bin"
+    data = bytes(range(256)) * 100
+    attachment.write_bytes(data)
+    hook = HookConfig(
+        url=f"http://127.0.0.1:{server.server_address[1]}/w",
+        token=None,
+        gzip_min_bytes=0,
+    )
+
+    result = post(hook, {"file": Base64File(attachment)}, pool=ConnectionPool())
+
+    assert server.request_encodings == ["gzip"]
+    assert result == {"echo": {"file": base64.b64encode(data).decode()}}
+
+
+def test_gzip_response_streams(server: _CountingServer) -> None:
+    hook = HookConfig(url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None)
+
+    with open_response(hook, {"n": 1}, pool=ConnectionPool()) as resp:
+        assert resp.getheader("Content-Encoding") == "gzip"
+        assert json.loads(resp.read1(4) + resp.read()) == {"echo": {"n": 1}}
+
+
+def test_accept_gzip_can_be_disabled(server: _CountingServer) -> None:
+    hook = HookConfig(
+        url=f"http://127.0.0.1:{server.server_address[1]}/w",
+        token=None,
+        accept_gzip=False,
+    )
+
+    with open_response(hook, {"n": 1}, pool=ConnectionPool()) as resp:
+        assert resp.getheader("Content-Encoding") is None
+        assert json.loads(resp.read()) == {"echo": {"n": 1}}
+
+
+def test_gets_follow_redirects_on_the_pooled_connection(
+    server: _CountingServer,
+) -> None:
+    pool = ConnectionPool()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with pool.open("GET", f"{base}/old") as resp:
+        assert (resp.status, resp.read()) == (200, b"moved here")
+
+    assert server.paths == ["/old", "/new"]
+    assert server.connections == 1
+    pool.close()
+
+
+def test_redirected_posts_fail_naming_the_new_location(
+    server: _CountingServer,
+) -> None:
+    pool = ConnectionPool()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    retry = RetryPolicy(attempts=3, base_delay=0.01)
+    hook = HookConfig(url=f"{base}/moved", token=None, name="rss", retry=retry)
+
+    moved = f"redirected \\(301\\) to {base}/w"
+    with (
+        pytest.raises(RedirectError, match=moved),
+        pool.open("POST", hook.url, body=b"{}"),
+    ):
+        pass
+    # Reported as the hook's error, not retried as if the host were down.
+    with pytest.raises(WebhookError, match="only GET and HEAD"):
+        call(hook, {"n": 1}, pool=pool)
+    assert server.paths == ["/moved", "/moved"]
+    pool.close()
+
+
+def test_requests_go_through_the_environment_proxy(
+    server: _CountingServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pool = ConnectionPool()
+    monkeypatch.setenv("http_proxy", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("no_proxy", "internal.test")
+
+    with pool.open("GET", "http://n8n.example.test/data") as resp:
+        assert resp.read() == b"moved here"
+    # The proxy gets the absolute URL; no_proxy hosts are reached directly.
+    assert server.paths == ["http://n8n.example.test/data"]
+    with pytest.raises(OSError), pool.open("GET", "http://n8n.internal.test/data"):
+        pass
+    pool.close()
@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import argparse
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from pathlib import Path
 from threading import Thread
-from typing import Any
+from typing import Any, ClassVar
 
 import pytest
 import yaml
@@ -16,6 +16,11 @@ from n8n_hooks.config import HookConfig
 from n8n_hooks.hooks.vikunja_task_create import build_payload, run
 
 
+@pytest.fixture(autouse=True)
+def _cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
 def _schema(name: str, *, checklist_min: int = 1) -> dict[str, Any]:
     return {
         "type": "object",
@@ -221,3 +226,144 @@ def test_end_to_end(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
 
     captured = capsys.readouterr()
     assert '"id": 987' in captured.out
+
+
+class _BulkHandler(BaseHTTPRequestHandler):
+    """Answers bulk requests with a result per task; titles "fail*" fail."""
+
+    protocol_version = "HTTP/1.1"
+    payloads: ClassVar[list[dict[str, Any]]] = []
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _BulkHandler.payloads.append(payload)
+        results = [
+            {"error": "duplicate"}
+            if task["title"].startswith("fail")
+            else {"id": 100 + i, "title": task["title"]}
+            for i, task in enumerate(payload["tasks"])
+        ]
+        body = json.dumps({"status": 200, "body": {"results": results}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args: Any) -> None:
+        pass
+
+
+def _bulk_args(tmp_path: Path, records: list[Any], **overrides: Any) -> Any:
+    path = tmp_path / "tasks.jsonl"
+    path.write_text(
+        "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n"
+    )
+    return _make_args(
+        tmp_path,
+        bulk=str(path),
+        bulk_size=2,
+        title=None,
+        relations=[],
+        **overrides,
+    )
+
+
+def test_bulk_reports_every_invalid_record(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    records = [
+        {"title": "fine"},
+        {"title": "bad", "context": {"summary": "x", "checklist": []}},
+        "",
+        {"title": "bad", "relations": ["waits:1"]},
+        {"title": "bad", "colour": "#fff"},
+        "[]",
+    ]
+    config = {
+        "vikunja-task-create": HookConfig(url="http://127.0.0.1:9/unused", token=None)
+    }
+
+    with pytest.raises(SystemExit):
+        run(_bulk_args(tmp_path, records), config)
+
+    err = capsys.readouterr().err.splitlines()
+    assert [line.split(":")[1] for line in err] == [
+        " record 1",
+        " record 3",
+        " record 4",
+        " record 5",
+    ]
+    assert "invalid relation kind 'waits'" in err[1]
+    assert "unknown keys: colour" in err[2]
+
+
+def test_bulk_batches_requests_with_per_task_results(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BulkHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    _BulkHandler.payloads = []
+    records = [
+        {"title": "one"},
+        {"title": "two", "project": "Ops", "priority": 5},
+        {"title": "fail three", "relations": ["blocked:7"]},
+    ]
+    config = {
+        "vikunja-task-create": HookConfig(
+            url=f"http://127.0.0.1:{server.server_address[1]}/w", token=None
+        )
+    }
+
+    try:
+        with pytest.raises(SystemExit):
+            run(_bulk_args(tmp_path, records), config)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [len(p["tasks"]) for p in _BulkHandler.payloads] == [2, 1]
+    assert {p["operation"] for p in _BulkHandler.payloads} == {
+        "create_tasks_from_template"
+    }
+    second = _BulkHandler.payloads[0]["tasks"][1]
+    assert (second["project"], second["priority"]) == ("Ops", 5)
+    assert _BulkHandler.payloads[1]["tasks"][0]["relations"] == [
+        {"kind": "blocked", "other": "7"}
+    ]
+    out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["index"], r["ok"]) for r in out] == [(0, True), (1, True), (2, False)]
+    assert out[1]["result"] == {"id": 101, "title": "two"}
+
+
+def test_bulk_and_context_cannot_both_read_stdin(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    args = _make_args(tmp_path, bulk="-", context="-", bulk_size=2, title=None)
+    config = {
+        "vikunja-task-create": HookConfig(url="http://127.0.0.1:9/unused", token=None)
+    }
+
+    with pytest.raises(SystemExit) as exc:
+        run(args, config)
+
+    assert exc.value.code == 1
+    assert "cannot both read stdin" in capsys.readouterr().err
+
+
+def test_bulk_async_reports_spool_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # A directory where the spool database should be cannot be opened.
+    state = tmp_path / "state"
+    (state / "n8n-hooks" / "spool.sqlite").mkdir(parents=True)
+    monkeypatch.setenv("XDG_STATE_HOME", str(state))
+    config = {
+        "vikunja-task-create": HookConfig(url="http://127.0.0.1:9/unused", token=None)
+    }
+
+    with pytest.raises(SystemExit) as exc:
+        run(_bulk_args(tmp_path, [{"title": "one"}], spool=True), config)
+
+    assert exc.value.code == 1
+    assert capsys.readouterr().err.startswith("n8n-hooks: could not spool request")
@@ -6,7 +6,11 @@ import os
 import subprocess
 import tempfile
 import urllib.request
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
+
+from updater import get_nix_hash
 
 LATEST_JSON_URL = (
     "https://files.radicle.xyz/releases/radicle-desktop/latest/latest.json"
@@ -37,16 +41,9 @@ def get_latest_version() -> dict[str, str]:
         return result
 
 
-def get_nix_hash(url: str) -> str:
-    """Get SRI hash for a URL with Nix."""
-    result = subprocess.run(
-        ["nix", "store", "prefetch-file", "--json", url],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    data = json.loads(result.stdout)
-    return data["hash"]
+def latest_version(fetch_json: Callable[[str], Any]) -> str:
+    """Probe hook for `updater --check`."""
+    return str(fetch_json(LATEST_JSON_URL)["version"])
 
 
 def run_gh(args: list[str], check: bool = True) -> subprocess.CompletedProcess[str]:
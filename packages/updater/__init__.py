@@ -1,29 +1,133 @@
 """Shared utilities for package update scripts."""
 
+import base64
+import fcntl
+import hashlib
 import json
-import subprocess
+import os
+import urllib.error
+import urllib.request
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO
 
-__all__ = ["get_nix_hash", "read_srcs", "update_srcs", "write_srcs"]
+__all__ = [
+    "get_nix_hash",
+    "prefetch_hashes",
+    "prefetch_platforms",
+    "read_srcs",
+    "update_srcs",
+    "write_srcs",
+]
+
+CHUNK_SIZE = 1 << 20
+PREFETCH_JOBS = 4
+TIMEOUT = 60
+
+
+def cache_dir() -> Path:
+    """The updater's directory under $XDG_CACHE_HOME."""
+    cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return cache / "updater"
+
+
+@contextmanager
+def locked_cache(path: Path, operation: int) -> Iterator[IO[str]]:
+    """Open the JSON cache file at *path* under flock(*operation*).
+
+    Update scripts and probes run in parallel child processes; holding the
+    lock across read-modify-write keeps them from dropping each other's
+    entries.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+") as f:
+        fcntl.flock(f, operation)
+        f.seek(0)
+        yield f
+
+
+def read_cache(f: IO[str]) -> dict:
+    try:
+        entries = json.loads(f.read())
+    except ValueError:
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _cached_hash(path: Path, url: str) -> dict | None:
+    try:
+        with locked_cache(path, fcntl.LOCK_SH) as f:
+            return read_cache(f).get(url)
+    except OSError:
+        return None
+
+
+def _remember_hash(path: Path, url: str, etag: str, hash_value: str) -> None:
+    try:
+        with locked_cache(path, fcntl.LOCK_EX) as f:
+            entries = read_cache(f)
+            entries[url] = {"etag": etag, "hash": hash_value}
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(entries, indent=2) + "\n")
+    except OSError:
+        pass
 
 
 def get_nix_hash(url: str) -> str:
-    """Get SRI hash for a URL using nix-prefetch-url."""
-    result = subprocess.run(
-        ["nix-prefetch-url", url],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    hash_value = result.stdout.strip()
-
-    sri_result = subprocess.run(
-        ["nix", "hash", "to-sri", "--type", "sha256", hash_value],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    return sri_result.stdout.strip()
+    """Get the SRI sha256 hash fetchurl expects for a URL.
+
+    The download is streamed and hashed in-process. Hashes are cached by URL
+    together with the server's ETag; while the server answers If-None-Match
+    with 304 Not Modified, the file is not downloaded again.
+    """
+    cache_file = cache_dir() / "hashes.json"
+    cached = _cached_hash(cache_file, url)
+
+    headers = {"User-Agent": "updater"}
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    request = urllib.request.Request(url, headers=headers)
+
+    digest = hashlib.sha256()
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            etag = response.headers.get("ETag")
+            while chunk := response.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached:
+            return cached["hash"]
+        raise
+
+    hash_value = "sha256-" + base64.b64encode(digest.digest()).decode()
+    if etag:
+        _remember_hash(cache_file, url, etag, hash_value)
+    return hash_value
+
+
+def prefetch_hashes(urls: Iterable[str]) -> dict[str, str]:
+    """Hash several URLs concurrently, returning {url: hash}.
+
+    Each download goes through get_nix_hash, so the threads share the
+    flock'd hash cache with every other update script.
+    """
+    unique = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=PREFETCH_JOBS) as pool:
+        return dict(zip(unique, pool.map(get_nix_hash, unique), strict=True))
+
+
+def prefetch_platforms(urls: dict[str, str]) -> dict[str, dict[str, str]]:
+    """Turn {platform: url} into a srcs map {platform: {"url", "hash"}}.
+
+    All platforms' downloads are hashed concurrently.
+    """
+    hashes = prefetch_hashes(urls.values())
+    return {
+        platform: {"url": url, "hash": hashes[url]} for platform, url in urls.items()
+    }
 
 
 def read_srcs(pkg_dir: Path) -> dict:
@@ -46,7 +150,7 @@ def update_srcs(
     """
     Update srcs.json if version changed.
 
-    If hash_value is None, it will be fetched using nix-prefetch-url.
+    If hash_value is None, it will be computed with get_nix_hash.
     Returns True if updated, False if already up to date.
     """
     current = read_srcs(pkg_dir)
@@ -4,26 +4,65 @@ Update third-party packages in ./packages directory.
 
 This script auto-discovers updatable packages:
 1. Packages with `nix-update-args` file -> run nix-update with those args
-2. Packages with `update.py` file -> import and call main()
+2. Packages with `update.py` file -> call its main() in a child process
 
 Usage:
-    python3 -m updater [--dry-run] [--package NAME] [--list] [--pr]
+    python3 -m updater [--dry-run] [--package NAME] [--list] [--pr] [--jobs N]
+                       [--check | --outdated]
+
+With --jobs N, up to N packages are updated at once. nix commands that
+evaluate the flake (nix-update, and the build that fixes a placeholder hash)
+may rewrite flake.lock, so they never run at the same time in one flake root,
+and nix-update packages are not scheduled side by side. A package that writes
+other files outside its own directory which other updates also write lists
+them, relative to the flake root, in an `update-shared-files` file; updates
+sharing a file never run at the same time.
+
+--pr updates and commits each package in a git worktree of its own; as each
+update is done, its branch is pushed and its PR opened on a publisher thread,
+one at a time, while the other packages go on updating.
+
+--check asks each package's upstream for its latest version (see probe.py)
+and prints a JSON report of outdated packages without updating anything;
+--outdated runs the same probe first and then updates only the packages not
+known to be current.
 """
 
 import argparse
-import importlib.util
+import contextlib
+import functools
 import json
+import os
 import re
-import ssl
+import signal
 import subprocess
 import sys
 import tempfile
-import urllib.error
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
 
+from updater import worker
+from updater.parallel import background, capturing, run_parallel
+from updater.probe import check_packages, report
+
 PLACEHOLDER_HASH = "sha256-AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA="
 
+# Seconds a custom update.py may run before it is killed.
+UPDATE_TIMEOUT = 30 * 60
+
+# Serialises worktree and branch bookkeeping in the main checkout, which
+# concurrent PR updates share.
+_git_lock = threading.Lock()
+
+# One lock per flake root for nix commands that evaluate the flake there and
+# so may write its flake.lock; PR worktrees each have their own.
+_flake_locks: dict[Path, threading.Lock] = {}
+_flake_locks_lock = threading.Lock()
+
 
 @dataclass
 class Package:
@@ -53,6 +92,12 @@ def run_cmd(
     return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, check=check)
 
 
+def flake_lock(flake_root: Path) -> threading.Lock:
+    """The lock serialising nix commands run in *flake_root*."""
+    with _flake_locks_lock:
+        return _flake_locks.setdefault(flake_root.resolve(), threading.Lock())
+
+
 def git_has_changes(flake_root: Path) -> bool:
     """Check if there are uncommitted changes."""
     result = run_cmd(["git", "status", "--porcelain"], cwd=flake_root, check=False)
@@ -117,6 +162,33 @@ def discover_packages(pkgs_dir: Path) -> list[Package]:
     return sorted(packages, key=lambda p: p.name)
 
 
+def update_locks(pkg: Package, flake_root: Path) -> frozenset[str]:
+    """Resources an update of *pkg* writes, which no other update may share."""
+    locks = {str(pkg.path.resolve())}
+
+    shared_files = pkg.path / "update-shared-files"
+    if shared_files.exists():
+        for name in shared_files.read_text().split():
+            locks.add(str((flake_root / name).resolve()))
+
+    if pkg.method == "nix-update":
+        # nix-update evaluates the flake, which may rewrite flake.lock.
+        locks.add(str((flake_root / "flake.lock").resolve()))
+        args = pkg.extra_args or []
+        for i, arg in enumerate(args):
+            if arg.startswith("--override-filename="):
+                name = arg.partition("=")[2]
+            elif arg == "--override-filename" and i + 1 < len(args):
+                name = args[i + 1]
+            else:
+                continue
+            locks.add(str((flake_root / name).resolve()))
+        if "--commit" in args:
+            locks.add("git-index")
+
+    return frozenset(locks)
+
+
 def run_nix_update(pkg: Package, flake_root: Path, dry_run: bool = False) -> bool:
     """Run nix-update for a package."""
     cmd = [
@@ -134,9 +206,10 @@ def run_nix_update(pkg: Package, flake_root: Path, dry_run: bool = False) -> boo
         print("  (dry-run, skipping)")
         return True
 
-    result = subprocess.run(
-        cmd, check=False, cwd=flake_root, capture_output=True, text=True
-    )
+    with flake_lock(flake_root):
+        result = subprocess.run(
+            cmd, check=False, cwd=flake_root, capture_output=True, text=True
+        )
 
     if result.returncode != 0:
         print(f"  Error: {result.stderr}")
@@ -148,8 +221,103 @@ def run_nix_update(pkg: Package, flake_root: Path, dry_run: bool = False) -> boo
     return True
 
 
-def run_custom_update(pkg: Package, dry_run: bool = False) -> bool:
-    """Import and run main() from update.py."""
+@dataclass
+class ScriptResult:
+    status: str  # "ok", "skipped", "failed" or "timeout"
+    detail: str | None
+    output: str
+    duration: float
+
+
+def run_update_script(
+    pkg: Package, timeout: float = UPDATE_TIMEOUT, live: bool = False
+) -> ScriptResult:
+    """Run main() from a package's update.py in a child process.
+
+    The child's stdout and stderr are captured together, or with *live* go
+    straight to ours as it runs (and the result's output is empty). After
+    *timeout* seconds it is killed, along with any commands it started.
+    """
+    return _run_worker(pkg, [], timeout, live)
+
+
+def probe_latest_version(
+    pkg: Package, http_cache: Path, timeout: float = UPDATE_TIMEOUT
+) -> str:
+    """Run latest_version() from a package's update.py in a child process.
+
+    Like run_update_script, but the child runs the probe hook against the
+    HTTP cache file *http_cache*. Raises LookupError unless it reports a
+    version.
+    """
+    result = _run_worker(pkg, ["--probe", str(http_cache)], timeout, live=False)
+    if result.status != "ok" or result.detail is None:
+        raise LookupError(result.detail or f"probe hook {result.status}")
+    return result.detail
+
+
+def _run_worker(
+    pkg: Package, worker_args: list[str], timeout: float, live: bool
+) -> ScriptResult:
+    update_script = pkg.path / "update.py"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(Path(worker.__file__).parent.parent), env.get("PYTHONPATH")])
+    )
+    start = time.monotonic()
+
+    if live:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        result_file = Path(tmpdir) / "result.json"
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "updater.worker",
+                *worker_args,
+                str(update_script),
+                str(result_file),
+            ],
+            stdout=None if live else subprocess.PIPE,
+            stderr=None if live else subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            env=env,
+            start_new_session=True,
+        )
+        try:
+            output, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # The whole group may have exited since the timeout fired.
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(proc.pid, signal.SIGKILL)
+            output, _ = proc.communicate()
+            return ScriptResult(
+                "timeout",
+                f"update.py timed out after {timeout:g}s",
+                output or "",
+                time.monotonic() - start,
+            )
+
+        try:
+            result = json.loads(result_file.read_text())
+        except (OSError, ValueError):
+            result = {
+                "status": "failed",
+                "detail": f"update.py exited with code {proc.returncode} "
+                "without reporting a result",
+            }
+    return ScriptResult(
+        result["status"], result["detail"], output or "", time.monotonic() - start
+    )
+
+
+def run_custom_update(
+    pkg: Package, dry_run: bool = False, timeout: float = UPDATE_TIMEOUT
+) -> bool:
+    """Run main() from update.py in a child process."""
     update_script = pkg.path / "update.py"
 
     print(f"  Running: {update_script}")
@@ -158,46 +326,21 @@ def run_custom_update(pkg: Package, dry_run: bool = False) -> bool:
         print("  (dry-run, skipping)")
         return True
 
-    spec = importlib.util.spec_from_file_location(f"update_{pkg.name}", update_script)
-    if spec is None or spec.loader is None:
-        print(f"  Error: Could not load {update_script}")
-        return False
-
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[f"update_{pkg.name}"] = module
-    spec.loader.exec_module(module)
-
-    if not hasattr(module, "main"):
-        print(f"  Error: {update_script} has no main() function")
-        return False
-
-    # Isolate per-package failures: one update.py crashing must not abort the
-    # whole run. Transient upstream problems (network, expired TLS certs) are
-    # not our bug, so skip them instead of failing the scheduled job.
-    #
-    # An update.py is imported into this process, so it inherits our sys.argv.
-    # Scripts that argparse their own flags (e.g. rsshub's --check) would parse
-    # the updater's argv ("--pr") and argparse.exit(2) on the unknown flag.
-    # Hide our argv behind the script path so each main() parses no extra args,
-    # and catch SystemExit so such an exit() is a per-package failure rather
-    # than a BaseException that escapes and aborts the scheduled job.
-    saved_argv = sys.argv
-    sys.argv = [str(update_script)]
-    try:
-        module.main()
-    except (urllib.error.URLError, ssl.SSLError) as e:
-        print(f"  Skipped: upstream fetch failed (network/TLS): {e}")
+    # Isolate per-package failures: one update.py crashing, exiting or
+    # hanging must not abort the whole run (see worker.py for how its end
+    # is classified). With --jobs 1 its output is shown as it runs; under
+    # run_parallel the package's log is printed in one piece once it is done.
+    result = run_update_script(pkg, timeout, live=not capturing())
+    if result.output:
+        print(result.output, end="" if result.output.endswith("\n") else "\n")
+    print(f"  update.py {result.status} after {result.duration:.1f}s")
+
+    if result.status == "skipped":
+        print(f"  Skipped: upstream fetch failed (network/TLS): {result.detail}")
         return True
-    except SystemExit as e:
-        if e.code in (None, 0):
-            return True
-        print(f"  Error: update.py exited with code {e.code}")
+    if result.status != "ok":
+        print(f"  Error: {result.detail}")
         return False
-    except Exception as e:
-        print(f"  Error: update.py raised {type(e).__name__}: {e}")
-        return False
-    finally:
-        sys.argv = saved_argv
     return True
 
 
@@ -215,11 +358,12 @@ def fix_placeholder_hash(pkg: Package, flake_root: Path) -> bool:
 
     print(f"  Fixing npmDepsHash in {target_file.name}...")
 
-    result = run_cmd(
-        ["nix", "build", f".#packages.x86_64-linux.{pkg.name}", "--no-link"],
-        cwd=flake_root,
-        check=False,
-    )
+    with flake_lock(flake_root):
+        result = run_cmd(
+            ["nix", "build", f".#packages.x86_64-linux.{pkg.name}", "--no-link"],
+            cwd=flake_root,
+            check=False,
+        )
 
     match = re.search(r"got:\s+(sha256-\S+)", result.stderr)
     if not match:
@@ -236,14 +380,19 @@ def fix_placeholder_hash(pkg: Package, flake_root: Path) -> bool:
     return True
 
 
-def update_package(pkg: Package, flake_root: Path, dry_run: bool = False) -> bool:
+def update_package(
+    pkg: Package,
+    flake_root: Path,
+    dry_run: bool = False,
+    timeout: float = UPDATE_TIMEOUT,
+) -> bool:
     """Update a single package in place. Returns True on success."""
     print(f"\nUpdating {pkg.name} (method: {pkg.method})...")
 
     if pkg.method == "nix-update":
         return run_nix_update(pkg, flake_root, dry_run)
     elif pkg.method == "custom":
-        if not run_custom_update(pkg, dry_run):
+        if not run_custom_update(pkg, dry_run, timeout):
             return False
         if not dry_run:
             return fix_placeholder_hash(pkg, flake_root)
@@ -253,10 +402,28 @@ def update_package(pkg: Package, flake_root: Path, dry_run: bool = False) -> boo
         return False
 
 
+@dataclass
+class PullRequest:
+    """An update committed on a branch of its own, waiting to be published."""
+
+    name: str
+    branch: str
+    title: str
+    body: str
+
+
 def create_pr_for_package(
-    pkg: Package, flake_root: Path, dry_run: bool = False
+    pkg: Package,
+    flake_root: Path,
+    dry_run: bool = False,
+    timeout: float = UPDATE_TIMEOUT,
+    publish: Callable[[PullRequest], bool] | None = None,
 ) -> bool:
-    """Create a PR for a package update using a git worktree."""
+    """Update a package in a git worktree and commit it on a branch.
+
+    The branch is handed to *publish* to be pushed and opened as a PR; by
+    default that is publish_pr, right away.
+    """
     branch_name = f"update/{pkg.name}"
 
     print(f"\nCreating PR for {pkg.name}...")
@@ -275,42 +442,58 @@ def create_pr_for_package(
         print("  (dry-run, skipping)")
         return True
 
-    return _create_pr_in_worktree(pkg, flake_root, branch_name)
+    if publish is None:
+        publish = functools.partial(publish_pr, flake_root=flake_root)
+    return _create_pr_in_worktree(pkg, flake_root, branch_name, timeout, publish)
 
 
-def _create_pr_in_worktree(pkg: Package, flake_root: Path, branch_name: str) -> bool:
-    """Create PR using a temporary worktree."""
+def _create_pr_in_worktree(
+    pkg: Package,
+    flake_root: Path,
+    branch_name: str,
+    timeout: float,
+    publish: Callable[[PullRequest], bool],
+) -> bool:
+    """Commit the update using a temporary worktree, then publish it."""
     with tempfile.TemporaryDirectory() as tmpdir:
         worktree_path = Path(tmpdir) / "worktree"
 
         # Create worktree with new branch
-        result = run_cmd(
-            ["git", "worktree", "add", "-b", branch_name, str(worktree_path)],
-            cwd=flake_root,
-            check=False,
-        )
+        with _git_lock:
+            result = run_cmd(
+                ["git", "worktree", "add", "-b", branch_name, str(worktree_path)],
+                cwd=flake_root,
+                check=False,
+            )
         if result.returncode != 0:
             print(f"  Error creating worktree: {result.stderr}")
             return False
 
+        pr = None
         try:
-            return _run_update_and_create_pr(
-                pkg, flake_root, worktree_path, branch_name
-            )
+            ok, pr = _commit_update(pkg, worktree_path, branch_name, timeout)
         finally:
-            # Clean up worktree and branch
-            run_cmd(
-                ["git", "worktree", "remove", "--force", str(worktree_path)],
-                cwd=flake_root,
-                check=False,
-            )
-            run_cmd(["git", "branch", "-D", branch_name], cwd=flake_root, check=False)
+            # Clean up the worktree; the branch stays until it is published.
+            with _git_lock:
+                run_cmd(
+                    ["git", "worktree", "remove", "--force", str(worktree_path)],
+                    cwd=flake_root,
+                    check=False,
+                )
+                if pr is None:
+                    run_cmd(
+                        ["git", "branch", "-D", branch_name],
+                        cwd=flake_root,
+                        check=False,
+                    )
 
+    return publish(pr) if pr is not None else ok
 
-def _run_update_and_create_pr(
-    pkg: Package, flake_root: Path, worktree_path: Path, branch_name: str
-) -> bool:
-    """Run update in worktree and create PR."""
+
+def _commit_update(
+    pkg: Package, worktree_path: Path, branch_name: str, timeout: float
+) -> tuple[bool, PullRequest | None]:
+    """Run the update in the worktree and commit it; return (ok, PR to open)."""
     old_version = get_current_version(pkg)
 
     # Run the update in the worktree
@@ -324,7 +507,7 @@ def _run_update_and_create_pr(
     if pkg.method == "nix-update":
         success = run_nix_update(worktree_pkg, worktree_path, dry_run=False)
     elif pkg.method == "custom":
-        success = run_custom_update(worktree_pkg, dry_run=False)
+        success = run_custom_update(worktree_pkg, dry_run=False, timeout=timeout)
         if success:
             success = fix_placeholder_hash(worktree_pkg, worktree_path)
     else:
@@ -332,62 +515,78 @@ def _run_update_and_create_pr(
 
     if not success:
         print("  Update failed")
-        return False
+        return False, None
 
     if not git_has_changes(worktree_path):
         print("  No changes, already up to date")
-        return True  # Not a failure, just nothing to do
+        return True, None  # Not a failure, just nothing to do
 
     new_version = get_current_version(worktree_pkg)
     old_ver = old_version or "unknown"
     new_ver = new_version or "unknown"
 
-    # Commit and push
     run_cmd(["git", "add", "-A"], cwd=worktree_path)
     commit_msg = f"{pkg.name}: {old_ver} -> {new_ver}"
 
-    # Ensure git identity is configured (worktrees may not inherit CI config)
+    # Ensure git identity is configured (worktrees may not inherit CI config).
+    # Passed per command rather than written to the config file, which
+    # concurrent PR updates share.
+    identity: list[str] = []
     for key, val in [
         ("user.name", "github-actions[bot]"),
         ("user.email", "41898282+github-actions[bot]@users.noreply.github.com"),
     ]:
         check = run_cmd(["git", "config", key], cwd=worktree_path, check=False)
         if check.returncode != 0:
-            run_cmd(["git", "config", key, val], cwd=worktree_path)
-
-    run_cmd(["git", "commit", "-m", commit_msg], cwd=worktree_path)
+            identity += ["-c", f"{key}={val}"]
 
-    push_result = run_cmd(
-        ["git", "push", "-u", "origin", branch_name], cwd=worktree_path, check=False
-    )
-    if push_result.returncode != 0:
-        print(f"  Error pushing: {push_result.stderr}")
-        return False
+    run_cmd(["git", *identity, "commit", "-m", commit_msg], cwd=worktree_path)
+    print(f"  Committed {commit_msg} on {branch_name}")
 
-    # Create PR
     pr_body = f"Automated update of {pkg.name} from {old_ver} to {new_ver}."
-    pr_result = run_cmd(
-        [
-            "gh",
-            "pr",
-            "create",
-            "--title",
-            commit_msg,
-            "--body",
-            pr_body,
-            "--label",
-            "dependencies",
-        ],
-        cwd=worktree_path,
-        check=False,
-    )
+    return True, PullRequest(pkg.name, branch_name, commit_msg, pr_body)
 
-    if pr_result.returncode != 0:
-        print(f"  Error creating PR: {pr_result.stderr}")
-        return False
 
-    print(f"  Created PR: {pr_result.stdout.strip()}")
-    return True
+def publish_pr(pr: PullRequest, flake_root: Path) -> bool:
+    """Push a committed update branch and open its PR, then delete it locally."""
+    print(f"\nPublishing {pr.name}...")
+    try:
+        # No -u: setting the upstream would write the shared config file too,
+        # and the branch is deleted locally once the PR is open.
+        push_result = run_cmd(
+            ["git", "push", "origin", pr.branch], cwd=flake_root, check=False
+        )
+        if push_result.returncode != 0:
+            print(f"  Error pushing: {push_result.stderr}")
+            return False
+
+        pr_result = run_cmd(
+            [
+                "gh",
+                "pr",
+                "create",
+                "--title",
+                pr.title,
+                "--body",
+                pr.body,
+                "--label",
+                "dependencies",
+                "--head",
+                pr.branch,
+            ],
+            cwd=flake_root,
+            check=False,
+        )
+
+        if pr_result.returncode != 0:
+            print(f"  Error creating PR: {pr_result.stderr}")
+            return False
+
+        print(f"  Created PR: {pr_result.stdout.strip()}")
+        return True
+    finally:
+        with _git_lock:
+            run_cmd(["git", "branch", "-D", pr.branch], cwd=flake_root, check=False)
 
 
 def list_packages(packages: list[Package]) -> None:
@@ -429,8 +628,39 @@ def main() -> int:
         action="store_true",
         help="Create a PR for each updated package (uses git worktrees)",
     )
+    check = parser.add_mutually_exclusive_group()
+    check.add_argument(
+        "--check",
+        action="store_true",
+        help="Print a JSON report of outdated packages without updating",
+    )
+    check.add_argument(
+        "--outdated",
+        action="store_true",
+        help="Probe upstream versions first and update only outdated packages",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Update up to N packages at once (default: 1)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=UPDATE_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Kill a custom update.py after this long (default: {UPDATE_TIMEOUT})",
+    )
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
 
     flake_root = get_flake_root()
     pkgs_dir = flake_root / "packages"
@@ -447,25 +677,90 @@ def main() -> int:
             print(f"Error: Package '{args.package}' not found")
             return 1
 
-    success_count = 0
-    failure_count = 0
+    if args.check or args.outdated:
+        probes = check_packages(
+            packages,
+            get_current_version,
+            functools.partial(probe_latest_version, timeout=args.timeout),
+        )
+        if args.check:
+            print(json.dumps(report(probes), indent=2))
+            return 0
+        current = {r.name for r in probes if r.status == "current"}
+        for r in probes:
+            if r.status == "unknown":
+                print(f"{r.name}: could not probe upstream ({r.error}), updating")
+        print(
+            f"Probed {len(probes)} packages: "
+            f"{len(probes) - len(current)} to update, {len(current)} current"
+        )
+        packages = [p for p in packages if p.name not in current]
 
-    for pkg in packages:
+    durations: dict[str, float] = {}
+    outcomes: dict[str, bool] = {}
+    publishing: dict[str, Future[tuple[bool, str]]] = {}
+
+    with contextlib.ExitStack() as stack:
         if args.pr:
-            # PR mode: use worktree to create PR without touching current checkout
-            if create_pr_for_package(pkg, flake_root, args.dry_run):
-                success_count += 1
-            else:
-                failure_count += 1
+            # PR mode: each update commits in a worktree of its own, so none
+            # conflict. Its branch is pushed and its PR opened on a publisher
+            # thread, one at a time, while the remaining packages update.
+            submit = stack.enter_context(
+                background(functools.partial(publish_pr, flake_root=flake_root))
+            )
+
+            def stage(pr: PullRequest) -> bool:
+                publishing[pr.name] = submit(pr)
+                return True
+
+            def update(pkg: Package) -> bool:
+                return create_pr_for_package(
+                    pkg, flake_root, args.dry_run, args.timeout, publish=stage
+                )
+
+            def locks(pkg: Package) -> frozenset[str]:
+                return frozenset()
         else:
             # Normal mode: update in place
-            if update_package(pkg, flake_root, args.dry_run):
-                success_count += 1
-            else:
-                failure_count += 1
+            def update(pkg: Package) -> bool:
+                return update_package(pkg, flake_root, args.dry_run, args.timeout)
+
+            def locks(pkg: Package) -> frozenset[str]:
+                return update_locks(pkg, flake_root)
+
+        def timed_update(pkg: Package) -> bool:
+            start = time.monotonic()
+            try:
+                return update(pkg)
+            finally:
+                durations[pkg.name] = time.monotonic() - start
+
+        if args.jobs > 1:
+            # Print each package's log in one piece once it is done
+            for pkg, ok, output in run_parallel(
+                packages, timed_update, args.jobs, locks
+            ):
+                print(output, end="", flush=True)
+                outcomes[pkg.name] = ok
+        else:
+            for pkg in packages:
+                outcomes[pkg.name] = timed_update(pkg)
+
+    # Leaving the block waited for the publisher; print its logs in order.
+    for name, future in publishing.items():
+        ok, output = future.result()
+        print(output, end="", flush=True)
+        outcomes[name] = outcomes[name] and ok
+
+    results = list(outcomes.values())
+    success_count = results.count(True)
+    failure_count = results.count(False)
 
     print(f"\n{'=' * 40}")
     print(f"Results: {success_count} succeeded, {failure_count} failed")
+    for name, ok in outcomes.items():
+        status = "ok" if ok else "FAILED"
+        print(f"  {status:<6} {durations.get(name, 0.0):7.1f}s  {name}")
 
     return 0 if failure_count == 0 else 1
 
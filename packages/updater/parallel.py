@@ -0,0 +1,126 @@
+"""Run package updates on a bounded worker pool.
+
+Each update runs in a worker thread with its stdout and stderr captured into
+a buffer of its own, so the caller can print every package's log in one piece
+instead of interleaved line by line. Updates that share a resource (a file
+both write, or process-wide state) are never run at the same time. Follow-up
+work, like opening a PR for an update, can be handed to a background thread
+that runs it one item at a time while the remaining updates go on.
+"""
+
+import io
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, TextIO, TypeVar
+
+T = TypeVar("T")
+
+_local = threading.local()
+
+
+class _ThreadOutput:
+    """Stand-in for sys.stdout/sys.stderr that writes to the thread's buffer.
+
+    Threads without a buffer (the main thread) write to the real stream.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        buffer = getattr(_local, "buffer", None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self) -> None:
+        if getattr(_local, "buffer", None) is None:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+def capturing() -> bool:
+    """Whether the calling thread's output is being buffered by run_parallel."""
+    return getattr(_local, "buffer", None) is not None
+
+
+@contextmanager
+def _captured_output() -> Iterator[None]:
+    saved = sys.stdout, sys.stderr
+    sys.stdout = _ThreadOutput(saved[0])
+    sys.stderr = _ThreadOutput(saved[1])
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = saved
+
+
+def _buffered(func: Callable[[T], bool], item: T) -> tuple[bool, str]:
+    """Run func(item) with its output captured; exceptions count as failure."""
+    _local.buffer = output = io.StringIO()
+    try:
+        ok = func(item)
+    except Exception as e:  # noqa: BLE001 - one package's crash must not stop the rest
+        print(f"  Error: {type(e).__name__}: {e}")
+        ok = False
+    finally:
+        del _local.buffer
+    return ok, output.getvalue()
+
+
+def run_parallel(
+    items: Iterable[T],
+    func: Callable[[T], bool],
+    jobs: int,
+    locks: Callable[[T], frozenset[str]],
+) -> Iterator[tuple[T, bool, str]]:
+    """Run func on up to *jobs* items at once, yielding (item, ok, output).
+
+    Items start in the given order, except that one whose *locks* overlap
+    those of a running item waits until that item finishes; later items
+    without a conflict go ahead meanwhile. Results are yielded as items
+    finish.
+    """
+    pending = list(items)
+    held: set[str] = set()
+    running: dict[Future[tuple[bool, str]], T] = {}
+
+    with _captured_output(), ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for item in list(pending):
+                if len(running) >= jobs:
+                    break
+                item_locks = locks(item)
+                if item_locks & held:
+                    continue
+                pending.remove(item)
+                held |= item_locks
+                running[pool.submit(_buffered, func, item)] = item
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                held -= locks(item)
+                ok, output = future.result()
+                yield item, ok, output
+
+
+@contextmanager
+def background(
+    func: Callable[[T], bool],
+) -> Iterator[Callable[[T], Future[tuple[bool, str]]]]:
+    """Yield a submit(item) that runs func(item) on a thread of its own.
+
+    Items run one at a time in submission order, with their output captured
+    like run_parallel's; each future holds (ok, output). Leaving the block
+    waits for every submitted item.
+    """
+    with _captured_output(), ThreadPoolExecutor(max_workers=1) as pool:
+
+        def submit(item: T) -> Future[tuple[bool, str]]:
+            return pool.submit(_buffered, func, item)
+
+        yield submit
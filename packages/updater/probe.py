@@ -0,0 +1,234 @@
+"""Cheap upstream version probes, run before the expensive updates.
+
+A package's latest upstream version comes from, in order:
+1. a `latest_version(fetch_json)` function in its update.py (probe hook),
+   which is handed a caching JSON fetcher for its upstream requests; it runs
+   in a worker process like the update itself (see worker.py), with the same
+   timeout
+2. for nix-update packages fetched with fetchFromGitHub, the GitHub API:
+   the latest release (or highest version tag, if the repo has no releases),
+   or with `--version=branch` the newest commit, compared against `rev`
+
+Responses are cached in $XDG_CACHE_HOME/updater/http.json with their ETag and
+revalidated with If-None-Match, so unchanged upstreams cost a 304 (which also
+does not count against GitHub's rate limit). Probe workers merge their
+entries into the file under a lock.
+"""
+
+import fcntl
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from updater import cache_dir, locked_cache, read_cache
+
+if TYPE_CHECKING:
+    from updater.__main__ import Package
+
+GITHUB_API = "https://api.github.com"
+PROBE_JOBS = 8
+TIMEOUT = 30
+
+
+@dataclass
+class ProbeResult:
+    name: str
+    status: str  # "outdated", "current" or "unknown"
+    current: str | None = None
+    latest: str | None = None
+    error: str | None = None
+
+
+def default_cache_path() -> Path:
+    return cache_dir() / "http.json"
+
+
+class HttpCache:
+    """JSON GETs revalidated against cached responses by ETag."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        # Entries revalidated or fetched by this instance, merged on save().
+        self._fetched: dict[str, Any] = {}
+        try:
+            with locked_cache(self.path, fcntl.LOCK_SH) as f:
+                self._entries: dict[str, Any] = read_cache(f)
+        except OSError:
+            self._entries = {}
+
+    def fetch_json(self, url: str) -> Any:
+        headers = {"Accept": "application/json", "User-Agent": "updater"}
+        token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+        if token and url.startswith(GITHUB_API):
+            headers["Authorization"] = f"Bearer {token}"
+        with self._lock:
+            cached = self._entries.get(url)
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                body = json.loads(response.read())
+                etag = response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached:
+                return cached["body"]
+            raise
+
+        if etag:
+            with self._lock:
+                self._entries[url] = self._fetched[url] = {"etag": etag, "body": body}
+        return body
+
+    def save(self) -> None:
+        """Merge this instance's new entries into the cache file."""
+        with locked_cache(self.path, fcntl.LOCK_EX) as f:
+            entries = read_cache(f)
+            with self._lock:
+                entries.update(self._fetched)
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(entries))
+
+
+def github_source(pkg: "Package") -> tuple[str, str] | None:
+    """The (owner, repo) of a package's fetchFromGitHub src, if literal."""
+    nix_file = pkg.path / "default.nix"
+    if not nix_file.exists():
+        return None
+    match = re.search(
+        r'fetchFromGitHub\s*\{[^}]*?owner = "([^"]+)";[^}]*?repo = "([^"]+)";',
+        nix_file.read_text(),
+    )
+    return (match.group(1), match.group(2)) if match else None
+
+
+def nix_update_version_mode(pkg: "Package") -> str:
+    """The value of nix-update's --version flag ("stable" when unset)."""
+    args = pkg.extra_args or []
+    for i, arg in enumerate(args):
+        if arg.startswith("--version="):
+            return arg.partition("=")[2]
+        if arg == "--version" and i + 1 < len(args):
+            return args[i + 1]
+    return "stable"
+
+
+def _tag_version(tag: str) -> tuple[tuple[int, ...], bool] | None:
+    """Sort key for a version tag: its numbers, then final over pre-release."""
+    match = re.fullmatch(r"\D*?(\d+(?:\.\d+)*)(.*)", tag)
+    if match is None:
+        return None
+    numbers = tuple(int(part) for part in match.group(1).split("."))
+    return numbers, not match.group(2)
+
+
+def github_latest(owner: str, repo: str, fetch_json: Callable[[str], Any]) -> str:
+    """Latest release tag of a GitHub repo, or its highest version tag.
+
+    The tags API lists tags by name, not by version or date, so without
+    releases the highest of a page of tags is taken, final releases over
+    pre-releases of the same version.
+    """
+    base = f"{GITHUB_API}/repos/{owner}/{repo}"
+    try:
+        tag = fetch_json(f"{base}/releases/latest")["tag_name"]
+    except urllib.error.HTTPError as e:
+        if e.code != 404:
+            raise
+        versions = {}
+        for entry in fetch_json(f"{base}/tags?per_page=100"):
+            key = _tag_version(entry["name"])
+            if key is not None:
+                versions[entry["name"]] = key
+        if not versions:
+            raise LookupError(f"{owner}/{repo} has no releases or tags") from None
+        tag = max(versions, key=versions.__getitem__)
+    return str(tag)
+
+
+def _normalize(version: str) -> str:
+    return version.removeprefix("v")
+
+
+def probe_package(
+    pkg: "Package",
+    cache: HttpCache,
+    get_current_version: Callable[["Package"], str | None],
+    probe_hook: Callable[["Package", Path], str],
+) -> ProbeResult:
+    """Compare a package's current version against its upstream's latest.
+
+    *probe_hook* runs a custom package's `latest_version` against the cache
+    file at the given path, raising LookupError if it cannot.
+    """
+    try:
+        if pkg.method == "custom":
+            current = get_current_version(pkg)
+            latest = probe_hook(pkg, cache.path)
+        else:
+            source = github_source(pkg)
+            mode = nix_update_version_mode(pkg)
+            if source is None:
+                return ProbeResult(pkg.name, "unknown", error="not a GitHub source")
+            if mode == "branch":
+                match = re.search(
+                    r'rev = "([0-9a-f]{40})";', (pkg.path / "default.nix").read_text()
+                )
+                current = match.group(1) if match else None
+                url = f"{GITHUB_API}/repos/{source[0]}/{source[1]}/commits?per_page=1"
+                latest = cache.fetch_json(url)[0]["sha"]
+            elif mode == "stable":
+                current = get_current_version(pkg)
+                latest = github_latest(*source, cache.fetch_json)
+            else:
+                return ProbeResult(
+                    pkg.name, "unknown", error=f"unsupported --version={mode}"
+                )
+    except (OSError, LookupError, ValueError, TypeError) as e:
+        return ProbeResult(pkg.name, "unknown", error=f"{type(e).__name__}: {e}")
+
+    if current is None:
+        return ProbeResult(pkg.name, "unknown", latest=latest, error="no version")
+    status = "current" if _normalize(current) == _normalize(latest) else "outdated"
+    return ProbeResult(pkg.name, status, current, latest)
+
+
+def check_packages(
+    packages: list["Package"],
+    get_current_version: Callable[["Package"], str | None],
+    probe_hook: Callable[["Package", Path], str],
+    cache: HttpCache | None = None,
+) -> list[ProbeResult]:
+    """Probe every package concurrently, results in the order given."""
+    http = cache or HttpCache()
+
+    def probe(pkg: "Package") -> ProbeResult:
+        return probe_package(pkg, http, get_current_version, probe_hook)
+
+    with ThreadPoolExecutor(max_workers=PROBE_JOBS) as pool:
+        results = list(pool.map(probe, packages))
+    try:
+        http.save()
+    except OSError:
+        pass
+    return results
+
+
+def report(results: list[ProbeResult]) -> dict[str, Any]:
+    """Machine-readable summary of a probe run."""
+    return {
+        "outdated": [r.name for r in results if r.status == "outdated"],
+        "unknown": [r.name for r in results if r.status == "unknown"],
+        "packages": [asdict(r) for r in results],
+    }
@@ -1,22 +1,40 @@
 """Regression tests for updater."""
 
+import base64
+import functools
+import hashlib
 import importlib.util
 import json
+import os
 import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Thread
 from unittest.mock import Mock, patch
 
 import pytest
 
+from updater import get_nix_hash, prefetch_platforms, probe
 from updater.__main__ import (
     PLACEHOLDER_HASH,
     Package,
     create_pr_for_package,
     discover_packages,
     fix_placeholder_hash,
+    get_current_version,
+    main,
+    probe_latest_version,
+    publish_pr,
     run_custom_update,
     run_nix_update,
+    run_update_script,
+    update_locks,
+    update_package,
 )
+from updater.parallel import run_parallel
 
 
 @pytest.fixture
@@ -275,3 +293,579 @@ class TestRunCustomUpdateArgvIsolation:
         )
         # Must return False (failure) rather than raising out of the loop.
         assert run_custom_update(make_package(pkg_dir)) is False
+
+
+# -- Custom updates run in a child process: timeouts, output, classification --
+
+
+class TestRunUpdateScript:
+    def test_network_errors_are_skipped(self, pkg_dir: Path):
+        (pkg_dir / "update.py").write_text(
+            "import urllib.error\n"
+            "def main():\n"
+            "    print('fetching')\n"
+            "    raise urllib.error.URLError('connection refused')\n"
+        )
+
+        result = run_update_script(make_package(pkg_dir))
+
+        assert (result.status, result.output) == ("skipped", "fetching\n")
+        assert "connection refused" in (result.detail or "")
+        assert run_custom_update(make_package(pkg_dir)) is True
+
+    def test_hanging_script_is_killed(self, pkg_dir: Path):
+        (pkg_dir / "update.py").write_text(
+            "import subprocess, sys, time\n"
+            "def main():\n"
+            "    print('waiting', flush=True)\n"
+            "    subprocess.Popen(['sleep', '60'])\n"
+            "    time.sleep(60)\n"
+        )
+
+        result = run_update_script(make_package(pkg_dir), timeout=1)
+
+        assert result.status == "timeout"
+        assert result.output == "waiting\n"
+        assert result.duration < 10
+
+    def test_killed_group_may_already_be_gone(self, pkg_dir: Path, monkeypatch):
+        (pkg_dir / "update.py").write_text(
+            "import time\ndef main():\n    time.sleep(60)\n"
+        )
+        killpg = os.killpg
+
+        def kill_then_miss(pgid: int, sig: int) -> None:
+            killpg(pgid, sig)
+            raise ProcessLookupError
+
+        monkeypatch.setattr("updater.__main__.os.killpg", kill_then_miss)
+
+        result = run_update_script(make_package(pkg_dir), timeout=1)
+
+        assert result.status == "timeout"
+
+    def test_live_output_is_not_captured(self, pkg_dir: Path, capfd):
+        (pkg_dir / "update.py").write_text("def main():\n    print('live')\n")
+
+        result = run_update_script(make_package(pkg_dir), live=True)
+
+        assert (result.status, result.output) == ("ok", "")
+        assert capfd.readouterr().out == "live\n"
+
+    def test_module_state_does_not_leak(self, pkg_dir: Path, monkeypatch):
+        (pkg_dir / "update.py").write_text(
+            "import sys\n"
+            "def main():\n"
+            "    sys.leaked = True\n"
+            "    print(sys.argv[1:], file=sys.stderr)\n"
+        )
+        monkeypatch.setattr("sys.argv", ["updater", "--pr"])
+
+        result = run_update_script(make_package(pkg_dir))
+
+        assert (result.status, result.output) == ("ok", "[]\n")
+        assert not hasattr(sys, "leaked")
+
+
+# -- Parallel updates: buffered output, isolated failures, conflicting locks --
+
+
+class TestRunParallel:
+    def test_output_is_buffered_per_item(self):
+        def update(name: str) -> bool:
+            for i in range(50):
+                print(f"{name} {i}")
+            return True
+
+        results = list(
+            run_parallel(["a", "b", "c"], update, 3, lambda name: frozenset())
+        )
+
+        assert sorted(name for name, _, _ in results) == ["a", "b", "c"]
+        for name, ok, output in results:
+            assert ok is True
+            assert output == "".join(f"{name} {i}\n" for i in range(50))
+
+    def test_failures_are_isolated(self):
+        def update(name: str) -> bool:
+            if name == "broken":
+                raise RuntimeError("upstream moved")
+            return name != "failed"
+
+        results = {
+            name: (ok, output)
+            for name, ok, output in run_parallel(
+                ["ok", "broken", "failed"], update, 2, lambda name: frozenset()
+            )
+        }
+
+        assert results["ok"] == (True, "")
+        assert results["failed"] == (False, "")
+        assert results["broken"] == (False, "  Error: RuntimeError: upstream moved\n")
+
+    def test_conflicting_items_never_overlap(self):
+        lock = threading.Lock()
+        running: set[str] = set()
+        overlaps: list[set[str]] = []
+
+        def update(name: str) -> bool:
+            with lock:
+                running.add(name)
+                overlaps.append(set(running))
+            time.sleep(0.05)
+            with lock:
+                running.discard(name)
+            return True
+
+        locks = {
+            "a": frozenset({"flake.lock"}),
+            "b": frozenset({"flake.lock"}),
+            "c": frozenset({"c"}),
+        }
+        names = [name for name, _, _ in run_parallel("abc", update, 3, locks.get)]
+
+        assert sorted(names) == ["a", "b", "c"]
+        assert not any({"a", "b"} <= seen for seen in overlaps)
+        # c does not wait behind b.
+        assert any({"a", "c"} <= seen for seen in overlaps)
+
+
+class TestUpdateLocks:
+    def test_shared_files_and_override_filename(self, tmp_path: Path):
+        pkg_dir = tmp_path / "packages" / "example-pkg"
+        pkg_dir.mkdir(parents=True)
+        (pkg_dir / "update-shared-files").write_text("flake.lock\n")
+        pkg = Package(
+            name="example-pkg",
+            method="nix-update",
+            path=pkg_dir,
+            extra_args=["--override-filename", "packages/common.nix"],
+        )
+
+        assert update_locks(pkg, tmp_path) == {
+            str(pkg_dir.resolve()),
+            str((tmp_path / "flake.lock").resolve()),
+            str((tmp_path / "packages" / "common.nix").resolve()),
+        }
+
+    def test_nix_update_packages_share_flake_lock(self, tmp_path: Path):
+        a = update_locks(Package("a", "nix-update", tmp_path / "a"), tmp_path)
+        b = update_locks(Package("b", "nix-update", tmp_path / "b"), tmp_path)
+
+        assert a & b == {str((tmp_path / "flake.lock").resolve())}
+
+    def test_flake_root_commands_never_overlap(self, tmp_path: Path, monkeypatch):
+        lock = threading.Lock()
+        running: list[str] = []
+        seen: list[int] = []
+
+        def nix(cmd: list[str], **kwargs) -> subprocess.CompletedProcess[str]:
+            with lock:
+                running.append(cmd[0])
+                seen.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(cmd[0])
+            return subprocess.CompletedProcess(cmd, 0, "", f"got: {fixed}")
+
+        fixed = "sha256-" + "B" * 43 + "="
+        monkeypatch.setattr(subprocess, "run", nix)
+        monkeypatch.setattr(
+            "updater.__main__.run_custom_update", lambda *args, **kwargs: True
+        )
+        packages = [
+            Package("a", "nix-update", tmp_path / "a"),
+            Package("b", "nix-update", tmp_path / "b"),
+            Package("c", "custom", tmp_path / "c"),
+            Package("d", "custom", tmp_path / "d"),
+        ]
+        for pkg in packages[2:]:
+            pkg.path.mkdir()
+            (pkg.path / "srcs.json").write_text(json.dumps({"hash": PLACEHOLDER_HASH}))
+
+        results = run_parallel(
+            packages,
+            lambda pkg: update_package(pkg, tmp_path),
+            4,
+            lambda pkg: update_locks(pkg, tmp_path),
+        )
+
+        assert all(ok for _, ok, _ in results)
+        assert len(seen) == 4
+        assert max(seen) == 1
+        assert fixed in (tmp_path / "d" / "srcs.json").read_text()
+
+    def test_custom_updates_run_side_by_side(self, tmp_path: Path):
+        a = update_locks(Package("a", "custom", tmp_path / "a"), tmp_path)
+        b = update_locks(Package("b", "custom", tmp_path / "b"), tmp_path)
+
+        assert not a & b
+
+
+# -- PR mode end to end: local bare remote, stub gh, concurrent worktrees --
+
+
+BUMP_UPDATE_PY = """\
+import json
+from pathlib import Path
+
+def main():
+    srcs = Path(__file__).parent / "srcs.json"
+    srcs.write_text(json.dumps({"version": "2.0"}) + "\\n")
+"""
+
+STUB_GH = """\
+#!/bin/sh
+echo "$@" >> "$GH_LOG"
+echo "https://github.com/example/dots/pull/1"
+"""
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+class TestConcurrentPrs:
+    @pytest.fixture
+    def checkout(self, tmp_path: Path, monkeypatch) -> Path:
+        remote = tmp_path / "remote.git"
+        checkout = tmp_path / "checkout"
+        git(tmp_path, "init", "--quiet", "--bare", "-b", "main", str(remote))
+        git(tmp_path, "clone", "--quiet", str(remote), str(checkout))
+
+        packages = {
+            "bumped-a": BUMP_UPDATE_PY,
+            "bumped-b": BUMP_UPDATE_PY,
+            "current": "def main():\n    print('Already up to date')\n",
+            "existing": BUMP_UPDATE_PY,
+            "broken": "def main():\n    raise RuntimeError('no release')\n",
+        }
+        for name, update_py in packages.items():
+            pkg_dir = checkout / "packages" / name
+            pkg_dir.mkdir(parents=True)
+            (pkg_dir / "srcs.json").write_text('{"version": "1.0"}\n')
+            (pkg_dir / "update.py").write_text(update_py)
+        git(checkout, "add", "-A")
+        git(checkout, "commit", "--quiet", "-m", "init")
+        git(checkout, "push", "--quiet", "origin", "HEAD:main")
+        git(checkout, "push", "--quiet", "origin", "HEAD:update/existing")
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "gh").write_text(STUB_GH)
+        (bin_dir / "gh").chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+        monkeypatch.setenv("GH_LOG", str(tmp_path / "gh.log"))
+        monkeypatch.chdir(checkout)
+        return checkout
+
+    def test_pr_jobs_pushes_only_changed_packages(self, checkout: Path, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["updater", "--pr", "--jobs", "3"])
+
+        # broken fails, and only that one.
+        assert main() == 1
+
+        remote = checkout.parent / "remote.git"
+        heads = git(remote, "for-each-ref", "--format=%(refname:short)", "refs/heads")
+        assert sorted(heads.split()) == [
+            "main",
+            "update/bumped-a",
+            "update/bumped-b",
+            "update/existing",
+        ]
+        assert git(remote, "log", "-1", "--format=%s", "update/bumped-a") == (
+            "bumped-a: 1.0 -> 2.0\n"
+        )
+
+        gh_calls = (checkout.parent / "gh.log").read_text().splitlines()
+        assert sorted(call.split()[-1] for call in gh_calls) == [
+            "update/bumped-a",
+            "update/bumped-b",
+        ]
+
+        # Worktrees and local branches are cleaned up; the checkout is untouched.
+        assert len(git(checkout, "worktree", "list").splitlines()) == 1
+        assert git(checkout, "branch", "--list", "update/*") == ""
+        assert git(checkout, "status", "--porcelain") == ""
+
+    def test_update_stage_leaves_a_branch_to_publish(self, checkout: Path):
+        remote = checkout.parent / "remote.git"
+        pkg = Package("bumped-a", "custom", checkout / "packages" / "bumped-a")
+        staged = []
+
+        def stage(pr) -> bool:
+            staged.append(pr)
+            return True
+
+        assert create_pr_for_package(pkg, checkout, publish=stage)
+
+        # Committed on its branch, not pushed yet; the worktree is gone.
+        [pr] = staged
+        assert (pr.branch, pr.title) == ("update/bumped-a", "bumped-a: 1.0 -> 2.0")
+        assert "update/bumped-a" not in git(remote, "branch", "--list")
+        assert git(checkout, "branch", "--list", "update/*").split() == [
+            "update/bumped-a"
+        ]
+        assert len(git(checkout, "worktree", "list").splitlines()) == 1
+
+        assert publish_pr(pr, checkout)
+
+        assert git(remote, "log", "-1", "--format=%s", "update/bumped-a") == (
+            "bumped-a: 1.0 -> 2.0\n"
+        )
+        assert git(checkout, "branch", "--list", "update/*") == ""
+
+
+# -- Upstream probes: GitHub and hook versions, ETag revalidation --
+
+
+class _GitHubHandler(BaseHTTPRequestHandler):
+    """Serves canned JSON or bytes by path with an ETag, 304 on a match."""
+
+    def do_GET(self) -> None:
+        self.server.requests.append(  # type: ignore[attr-defined]
+            (self.path, self.headers.get("If-None-Match"))
+        )
+        body = self.server.routes.get(self.path)  # type: ignore[attr-defined]
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        etag = f'"{hash(data)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture
+def github(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GitHubHandler)
+    server.routes = {}  # type: ignore[attr-defined]
+    server.requests = []  # type: ignore[attr-defined]
+    Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr("updater.probe.GITHUB_API", base)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_github_package(pkg_dir: Path, version: str, rev: str = "0" * 40) -> None:
+    pkg_dir.mkdir(parents=True)
+    (pkg_dir / "default.nix").write_text(
+        f'{{\n  version = "{version}";\n'
+        "  src = fetchFromGitHub {\n"
+        '    owner = "example";\n'
+        f'    repo = "{pkg_dir.name}";\n'
+        f'    rev = "{rev}";\n'
+        "  };\n}\n"
+    )
+
+
+class TestProbe:
+    def test_revalidates_with_etag(self, github, tmp_path: Path):
+        github.routes["/data"] = {"version": "1.0"}
+        url = probe.GITHUB_API + "/data"
+
+        cache = probe.HttpCache(tmp_path / "http.json")
+        assert cache.fetch_json(url) == {"version": "1.0"}
+        assert cache.fetch_json(url) == {"version": "1.0"}
+        cache.save()
+        assert probe.HttpCache(tmp_path / "http.json").fetch_json(url) == {
+            "version": "1.0"
+        }
+
+        revalidated = [etag is not None for _, etag in github.requests]
+        assert revalidated == [False, True, True]
+
+    def test_check_packages(self, github, tmp_path: Path):
+        pkgs = tmp_path / "packages"
+        write_github_package(pkgs / "released", "1.0")
+        write_github_package(pkgs / "tagged", "10.0")
+        write_github_package(pkgs / "branch", "0-unstable", rev="a" * 40)
+        hooked = pkgs / "hooked"
+        hooked.mkdir()
+        (hooked / "srcs.json").write_text('{"version": "3.0"}')
+        (hooked / "update.py").write_text(
+            "def latest_version(fetch_json):\n"
+            "    return fetch_json(f'{API}/hooked.json')['version']\n"
+            "def main():\n    pass\n".replace("{API}", probe.GITHUB_API)
+        )
+        no_hook = pkgs / "no-hook"
+        no_hook.mkdir()
+        (no_hook / "update.py").write_text("def main():\n    pass\n")
+        github.routes.update(
+            {
+                "/repos/example/released/releases/latest": {"tag_name": "v1.1"},
+                # Listed by name, so the newest tag is not the first.
+                "/repos/example/tagged/tags?per_page=100": [
+                    {"name": "v10.0-rc1"},
+                    {"name": "v2.0"},
+                    {"name": "v10.0"},
+                    {"name": "nightly"},
+                ],
+                "/repos/example/branch/commits?per_page=1": [{"sha": "a" * 40}],
+                "/hooked.json": {"version": "3.0"},
+            }
+        )
+        packages = [
+            Package("released", "nix-update", pkgs / "released", []),
+            Package("tagged", "nix-update", pkgs / "tagged", []),
+            Package("branch", "nix-update", pkgs / "branch", ["--version=branch"]),
+            Package("hooked", "custom", hooked),
+            Package("no-hook", "custom", no_hook),
+        ]
+
+        results = probe.check_packages(
+            packages,
+            get_current_version,
+            probe_latest_version,
+            probe.HttpCache(tmp_path / "http.json"),
+        )
+
+        assert [(r.name, r.status) for r in results] == [
+            ("released", "outdated"),
+            ("tagged", "current"),
+            ("branch", "current"),
+            ("hooked", "current"),
+            ("no-hook", "unknown"),
+        ]
+        assert probe.report(results)["outdated"] == ["released"]
+        assert probe.report(results)["packages"][0] == {
+            "name": "released",
+            "status": "outdated",
+            "current": "1.0",
+            "latest": "v1.1",
+            "error": None,
+        }
+
+    def test_probe_hooks_run_isolated_with_a_timeout(self, tmp_path: Path):
+        hanging = tmp_path / "packages" / "hanging"
+        hanging.mkdir(parents=True)
+        (hanging / "srcs.json").write_text('{"version": "1.0"}')
+        (hanging / "update.py").write_text(
+            "import time\n"
+            "def latest_version(fetch_json):\n    time.sleep(60)\n"
+            "def main():\n    pass\n"
+        )
+
+        start = time.monotonic()
+        results = probe.check_packages(
+            [Package("hanging", "custom", hanging)],
+            get_current_version,
+            functools.partial(probe_latest_version, timeout=1),
+            probe.HttpCache(tmp_path / "http.json"),
+        )
+
+        assert results[0].status == "unknown"
+        assert "timed out" in (results[0].error or "")
+        assert time.monotonic() - start < 10
+        assert "update_hanging" not in sys.modules
+
+    def test_outdated_updates_only_stale_packages(self, tmp_path: Path, monkeypatch):
+        pkgs = tmp_path / "packages"
+        for name in ("stale", "fresh", "unprobed"):
+            (pkgs / name).mkdir(parents=True)
+            (pkgs / name / "update.py").write_text("def main():\n    pass\n")
+        results = [
+            probe.ProbeResult("fresh", "current", "1.0", "1.0"),
+            probe.ProbeResult("stale", "outdated", "1.0", "1.1"),
+            probe.ProbeResult("unprobed", "unknown", error="no probe hook"),
+        ]
+        updated: list[str] = []
+        monkeypatch.setattr("updater.__main__.get_flake_root", lambda: tmp_path)
+        monkeypatch.setattr(
+            "updater.__main__.check_packages", lambda *args, **kwargs: results
+        )
+        monkeypatch.setattr(
+            "updater.__main__.update_package",
+            lambda pkg, *args: updated.append(pkg.name) or True,
+        )
+        monkeypatch.setattr("sys.argv", ["updater", "--outdated"])
+
+        assert main() == 0
+        assert updated == ["stale", "unprobed"]
+
+
+# -- In-process SRI hashing with the URL+ETag hash cache --
+
+
+class TestGetNixHash:
+    def test_streams_hash_and_revalidates(self, github, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        monkeypatch.setattr("updater.CHUNK_SIZE", 7)
+        data = b"not really a dmg" * 100
+        github.routes["/a.dmg"] = data
+        url = probe.GITHUB_API + "/a.dmg"
+        expected = "sha256-" + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+        assert get_nix_hash(url) == expected
+        assert get_nix_hash(url) == expected
+
+        revalidated = [etag is not None for _, etag in github.requests]
+        assert revalidated == [False, True]
+        cached = json.loads((tmp_path / "updater" / "hashes.json").read_text())
+        assert cached[url]["hash"] == expected
+
+    def test_prefetch_platforms_hashes_each_url_once(
+        self, github, tmp_path: Path, monkeypatch
+    ):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        github.routes["/arm.tar.gz"] = b"arm" * 100
+        github.routes["/x86.tar.gz"] = b"x86" * 100
+        arm = probe.GITHUB_API + "/arm.tar.gz"
+        x86 = probe.GITHUB_API + "/x86.tar.gz"
+
+        srcs = prefetch_platforms(
+            {"aarch64-darwin": arm, "aarch64-linux": arm, "x86_64-linux": x86}
+        )
+
+        def sri(data: bytes) -> str:
+            return "sha256-" + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+        assert srcs == {
+            "aarch64-darwin": {"url": arm, "hash": sri(b"arm" * 100)},
+            "aarch64-linux": {"url": arm, "hash": sri(b"arm" * 100)},
+            "x86_64-linux": {"url": x86, "hash": sri(b"x86" * 100)},
+        }
+        assert sorted(path for path, _ in github.requests) == [
+            "/arm.tar.gz",
+            "/x86.tar.gz",
+        ]
+        cached = json.loads((tmp_path / "updater" / "hashes.json").read_text())
+        assert set(cached) == {arm, x86}
+
+    def test_parallel_processes_keep_every_entry(self, tmp_path: Path):
+        cache = tmp_path / "hashes.json"
+        code = (
+            "import sys; from pathlib import Path; import updater\n"
+            "for i in range(50):\n"
+            "    updater._remember_hash("
+            "Path(sys.argv[1]), f'{sys.argv[2]}{i}', 'etag', 'hash')\n"
+        )
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-c", code, str(cache), prefix],
+                cwd=Path(__file__).parent.parent,
+            )
+            for prefix in ("a", "b", "c")
+        ]
+        assert [proc.wait() for proc in procs] == [0, 0, 0]
+
+        assert len(json.loads(cache.read_text())) == 150
@@ -0,0 +1,98 @@
+"""Child process that runs one package's update.py.
+
+Usage (by the updater, not by hand):
+    python3 -m updater.worker [--probe HTTP_CACHE] UPDATE_PY RESULT_JSON
+
+Runs main() from UPDATE_PY, or with --probe its latest_version() hook against
+the HTTP cache file HTTP_CACHE (see probe.py), and writes the outcome to
+RESULT_JSON as {"status": "ok" | "skipped" | "failed", "detail": ...}; a
+probe's detail is the version it found. Running each script in a process of
+its own lets the updater kill one that hangs and keeps module state from
+leaking between packages.
+"""
+
+import importlib.util
+import json
+import ssl
+import sys
+import urllib.error
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+
+def load_update_module(path: Path, name: str) -> ModuleType | None:
+    """Import an update.py as module *name*, or return None if it cannot be."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        return None
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_script(update_script: Path, probe_cache: Path | None = None) -> dict[str, Any]:
+    """Run *update_script*'s main(), or its probe hook, and classify the end.
+
+    With *probe_cache*, latest_version() runs against that HTTP cache file.
+    """
+    # Transient upstream problems (network, expired TLS certs) are not our
+    # bug, so they are reported as skipped rather than failed. Scripts that
+    # argparse their own flags (e.g. rsshub's --check) see only their own
+    # path in sys.argv, and a non-zero exit() is a failure like any other.
+    sys.argv = [str(update_script)]
+    try:
+        return _run(update_script, probe_cache)
+    except (urllib.error.URLError, ssl.SSLError) as e:
+        return {"status": "skipped", "detail": str(e)}
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return {"status": "ok", "detail": None}
+        return {"status": "failed", "detail": f"update.py exited with code {e.code}"}
+    except Exception as e:  # noqa: BLE001 - fails only this package
+        return {
+            "status": "failed",
+            "detail": f"update.py raised {type(e).__name__}: {e}",
+        }
+
+
+def _run(update_script: Path, probe_cache: Path | None) -> dict[str, Any]:
+    module = load_update_module(update_script, f"update_{update_script.parent.name}")
+    if module is None:
+        return {"status": "failed", "detail": f"Could not load {update_script}"}
+
+    if probe_cache is not None:
+        if not hasattr(module, "latest_version"):
+            return {"status": "failed", "detail": "no probe hook"}
+        from updater.probe import HttpCache
+
+        cache = HttpCache(probe_cache)
+        latest = str(module.latest_version(cache.fetch_json))
+        try:
+            cache.save()
+        except OSError:
+            pass
+        return {"status": "ok", "detail": latest}
+
+    if not hasattr(module, "main"):
+        return {"status": "failed", "detail": f"{update_script} has no main() function"}
+    module.main()
+    return {"status": "ok", "detail": None}
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    probe_cache = None
+    if args[0] == "--probe":
+        probe_cache, args = Path(args[1]), args[2:]
+    update_script, result_file = Path(args[0]), Path(args[1])
+    result = run_script(update_script, probe_cache)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    result_file.write_text(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()